@@ -0,0 +1,93 @@
+"""Benchmark anthropic_trim_messages as used by state_modifier.
+
+Builds a tool-heavy conversation of 200, 1k and 5k messages and trims it to
+half its size with the litellm-backed token counters, reporting wall time and
+tokenizer invocations for a cold and a warm per-message cache.
+
+Usage:
+    python benchmarks/bench_anthropic_trim.py [--model MODEL]
+"""
+
+import argparse
+import time
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from ra_aid import anthropic_token_limiter
+from ra_aid.anthropic_message_utils import anthropic_trim_messages
+from ra_aid.anthropic_token_limiter import (
+    create_message_token_counter,
+    create_token_counter_wrapper,
+    get_list_overhead_tokens,
+)
+from ra_aid.utils.token_cache import get_token_count_cache
+
+SIZES = (200, 1000, 5000)
+
+
+def build_messages(count: int):
+    """Build a conversation of roughly `count` messages with tool use pairs."""
+    messages = [
+        SystemMessage(content="You are a helpful coding assistant."),
+        HumanMessage(content="Please fix the failing tests in the project."),
+    ]
+    i = 0
+    while len(messages) < count:
+        messages.append(
+            AIMessage(
+                content=f"Running step {i}: reading file src/module_{i}.py",
+                additional_kwargs={
+                    "tool_calls": [{"name": "read_file_tool", "input": {"i": i}}]
+                },
+            )
+        )
+        messages.append(
+            ToolMessage(
+                content=f"def function_{i}(x):\n    return x * {i}\n" * 20,
+                tool_call_id=f"call_{i}",
+            )
+        )
+        i += 1
+    return messages
+
+
+def run(model: str) -> None:
+    wrapper = create_token_counter_wrapper(model)
+    print(f"model={model}")
+    print(f"{'messages':>8} {'cache':>5} {'seconds':>9} {'tokenizer calls':>16}")
+
+    for size in SIZES:
+        messages = build_messages(size)
+        max_tokens = wrapper(messages) // 2
+        get_token_count_cache().clear()
+
+        for label in ("cold", "warm"):
+            calls = 0
+            real_counter = anthropic_token_limiter.token_counter
+
+            def counting_token_counter(*args, **kwargs):
+                nonlocal calls
+                calls += 1
+                return real_counter(*args, **kwargs)
+
+            with patch.object(
+                anthropic_token_limiter, "token_counter", counting_token_counter
+            ):
+                start = time.perf_counter()
+                anthropic_trim_messages(
+                    messages,
+                    token_counter=wrapper,
+                    message_token_counter=create_message_token_counter(model),
+                    max_tokens=max_tokens - get_list_overhead_tokens(model),
+                    num_messages_to_keep=2,
+                )
+                elapsed = time.perf_counter() - start
+
+            print(f"{len(messages):>8} {label:>5} {elapsed:>9.3f} {calls:>16}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="claude-3-7-sonnet-20250219")
+    run(parser.parse_args().model)
@@ -0,0 +1,77 @@
+"""Benchmark the fuzzy path matcher against fuzzywuzzy on synthetic path lists.
+
+Generates 100k and 1M monorepo-like paths and times a handful of searches with
+the previous fuzzywuzzy scorer (100k only, it is too slow for 1M, and only if
+fuzzywuzzy is installed; it is no longer a dependency), a fresh FuzzyMatcher,
+and a reused FuzzyMatcher whose trigram index is already built.
+
+Usage:
+    python benchmarks/bench_fuzzy_match.py [--sizes 100000 1000000]
+"""
+
+import argparse
+import random
+import time
+
+from ra_aid.fuzzy_match import FuzzyMatcher
+
+try:
+    from fuzzywuzzy import process as fuzzywuzzy_process
+except ImportError:
+    fuzzywuzzy_process = None
+
+QUERIES = ["fuzzy_find.py", "agent utils", "test_server", "cfg/loader"]
+FUZZYWUZZY_MAX_SIZE = 100000
+
+
+def build_paths(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    dirs = [
+        "src", "lib", "tests", "services", "packages", "internal", "cmd", "web",
+        "api", "models", "handlers", "utils", "config", "agents", "tools", "db",
+    ]
+    names = ["main", "index", "server", "client", "loader", "fuzzy_find", "schema",
+             "router", "worker", "cache", "types", "helpers", "views", "store"]
+    exts = [".py", ".ts", ".go", ".md", ".json", ".tsx"]
+    paths = set()
+    while len(paths) < count:
+        depth = rng.randint(1, 6)
+        parts = [f"{rng.choice(dirs)}{rng.randint(0, 300)}" for _ in range(depth)]
+        parts.append(f"{rng.choice(names)}_{rng.randint(0, 999)}{rng.choice(exts)}")
+        paths.add("/".join(parts))
+    return sorted(paths)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run(sizes):
+    for size in sizes:
+        paths = build_paths(size)
+        print(f"\n{size} paths")
+
+        if fuzzywuzzy_process is not None and size <= FUZZYWUZZY_MAX_SIZE:
+            elapsed, _ = timed(
+                lambda: [fuzzywuzzy_process.extract(q, paths, limit=10) for q in QUERIES]
+            )
+            print(f"  fuzzywuzzy process.extract: {elapsed / len(QUERIES):8.3f}s/query")
+
+        elapsed, matcher = timed(lambda: FuzzyMatcher(paths))
+        print(f"  FuzzyMatcher preprocessing: {elapsed:8.3f}s")
+
+        elapsed, _ = timed(lambda: matcher.extract(QUERIES[0], limit=10, threshold=60))
+        print(f"  first query (builds index): {elapsed:8.3f}s")
+
+        elapsed, _ = timed(
+            lambda: [matcher.extract(q, limit=10, threshold=60) for q in QUERIES]
+        )
+        print(f"  reused matcher:             {elapsed / len(QUERIES):8.3f}s/query")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    run(parser.parse_args().sizes)
@@ -0,0 +1,74 @@
+"""Import-time regression check for the ra-aid entry points.
+
+Imports each entry point in a fresh interpreter under `python -X importtime`,
+takes the best cumulative time over --runs runs and compares it to the entry
+point's budget. Each entry point also lists packages it must not load: the CLI
+module is all that --help and --version need, so it must not pull in litellm,
+langgraph or the server stack. Exits non-zero if any budget is exceeded or a
+forbidden package is loaded.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 5] [--scale 1.0]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ["litellm", "langgraph", "langchain_core", "uvicorn", "fastapi", "openai"]
+
+# (module, budget in milliseconds, packages it must not load)
+ENTRY_POINTS = [
+    ("ra_aid", 50, HEAVY + ["ra_aid.agent_utils", "ra_aid.database"]),
+    ("ra_aid.__main__", 250, HEAVY + ["ra_aid.agent_utils", "ra_aid.database"]),
+    ("ra_aid.scripts.cli", 1500, HEAVY + ["ra_aid.agent_utils"]),
+]
+
+
+def measure(module: str, forbidden: list) -> tuple:
+    code = (
+        f"import sys, {module}; "
+        f"print(' '.join(m for m in {forbidden!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <indented module name>"
+        fields = line.split("|")
+        if line.startswith("import time:") and len(fields) == 3 and fields[2].strip() == module:
+            cumulative_us = int(fields[1])
+    if cumulative_us is None:
+        raise RuntimeError(f"No importtime entry for {module}:\n{result.stderr[-2000:]}")
+    return cumulative_us / 1000, result.stdout.split()
+
+
+def run(runs: int, scale: float) -> int:
+    failures = 0
+    for module, budget_ms, forbidden in ENTRY_POINTS:
+        budget_ms *= scale
+        results = [measure(module, forbidden) for _ in range(runs)]
+        best = min(ms for ms, _ in results)
+        loaded = sorted({name for _, names in results for name in names})
+        ok = best <= budget_ms and not loaded
+        failures += not ok
+        print(f"  {module:22s} {best:8.1f}ms (budget {budget_ms:6.0f}ms)  {'ok' if ok else 'FAIL'}")
+        if loaded:
+            print(f"    loaded forbidden modules: {', '.join(loaded)}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget, for slow machines")
+    args = parser.parse_args()
+    sys.exit(run(args.runs, args.scale))
@@ -0,0 +1,88 @@
+"""Benchmark project info for many implementation agents against a large git repository.
+
+Creates a temporary git repository with --files committed files, then builds
+the project info prompt section the way each run_task_implementation_agent call
+does (get_project_info(".") followed by format_project_info) --agents times:
+once with the file index and project info snapshot dropped before every agent,
+which is what each agent paid before they were shared, and once reusing them.
+Between the two halves of the cached run a file write is recorded, so one
+refresh is included in the timing.
+
+Usage:
+    python benchmarks/bench_project_info.py [--files 200000] [--agents 50]
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+
+from ra_aid.file_index import get_file_index
+from ra_aid.project_info import clear_project_info_cache, format_project_info, get_project_info
+
+GIT_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_NAME": "bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.com",
+}
+
+
+def build_repo(directory: str, count: int) -> None:
+    subprocess.run(["git", "init", "-q"], cwd=directory, check=True)
+    for i in range(count):
+        package = os.path.join(directory, f"pkg{i // 1000:04d}")
+        if i % 1000 == 0:
+            os.makedirs(package)
+        with open(os.path.join(package, f"module_{i}.py"), "w") as f:
+            f.write("")
+    subprocess.run(["git", "add", "-A"], cwd=directory, check=True, env=GIT_ENV)
+    subprocess.run(["git", "commit", "-q", "-m", "fixture"], cwd=directory, check=True, env=GIT_ENV)
+
+
+def spawn_agent() -> str:
+    return format_project_info(get_project_info("."))
+
+
+def run(files: int, agents: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        build_repo(directory, files)
+        print(f"Built fixture repository with {files} files in {time.perf_counter() - start:.1f}s")
+
+        previous = os.getcwd()
+        os.chdir(directory)
+        try:
+            start = time.perf_counter()
+            for _ in range(agents):
+                get_file_index().invalidate()
+                clear_project_info_cache()
+                spawn_agent()
+            uncached = time.perf_counter() - start
+            print(f"  listing per agent: {uncached:8.3f}s total, {uncached / agents * 1000:8.1f}ms/agent")
+
+            get_file_index().invalidate()
+            clear_project_info_cache()
+            start = time.perf_counter()
+            for i in range(agents):
+                if i == agents // 2:
+                    new_file = os.path.join(directory, "pkg0000", "written_by_agent.py")
+                    with open(new_file, "w") as f:
+                        f.write("")
+                    get_file_index().record_file_written(new_file)
+                spawn_agent()
+            cached = time.perf_counter() - start
+            print(f"  shared snapshot:   {cached:8.3f}s total, {cached / agents * 1000:8.1f}ms/agent")
+            print(f"  file index: {get_file_index().stats()}")
+        finally:
+            os.chdir(previous)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200_000)
+    parser.add_argument("--agents", type=int, default=50)
+    args = parser.parse_args()
+    run(args.files, args.agents)
@@ -0,0 +1,126 @@
+"""Benchmark session listing against a database with 10k sessions.
+
+Fills a temporary SQLite database with sessions, one human input each and a few
+model usage trajectories, then times listing pages of 100 sessions with the
+previous per-session display name lookups and with SessionRepository.get_all,
+with and without usage totals. Query counts are reported alongside wall time.
+
+Usage:
+    python benchmarks/bench_session_listing.py [--sessions 10000] [--page-size 100]
+"""
+
+import argparse
+import datetime
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+import peewee
+
+from ra_aid.database.models import HumanInput, Session, Trajectory
+from ra_aid.database.repositories.session_repository import SessionRepository
+
+MODELS = [Session, HumanInput, Trajectory]
+PAGES = 5
+
+
+def populate(session_count: int):
+    now = datetime.datetime.now()
+    sessions = [
+        {
+            "created_at": now + datetime.timedelta(seconds=i),
+            "updated_at": now,
+            "start_time": now,
+            "command_line": f"ra-aid -m 'task number {i}'",
+            "program_version": "bench",
+        }
+        for i in range(session_count)
+    ]
+    for start in range(0, session_count, 500):
+        Session.insert_many(sessions[start : start + 500]).execute()
+
+    ids = [session.id for session in Session.select(Session.id)]
+    inputs = [
+        {"session": session_id, "content": f"Please refactor module {session_id} " * 8, "source": "cli"}
+        for session_id in ids
+    ]
+    usage = [
+        {
+            "session": session_id,
+            "record_type": "model_usage",
+            "tool_name": "",
+            "current_cost": 0.001,
+            "input_tokens": 100,
+            "output_tokens": 20,
+        }
+        for session_id in ids
+        for _ in range(3)
+    ]
+    for start in range(0, len(inputs), 500):
+        HumanInput.insert_many(inputs[start : start + 500]).execute()
+    for start in range(0, len(usage), 500):
+        Trajectory.insert_many(usage[start : start + 500]).execute()
+
+
+def list_per_session(repo: SessionRepository, offset: int, limit: int):
+    """The previous listing: one page query plus two display name queries per session."""
+    total = Session.select().count()
+    result = []
+    for session in Session.select().order_by(Session.created_at.desc()).offset(offset).limit(limit):
+        model = repo._to_model(session)
+        Session.get_by_id(session.id)
+        oldest = (
+            HumanInput.select()
+            .where(HumanInput.session == session.id)
+            .order_by(HumanInput.id)
+            .first()
+        )
+        model.display_name = (oldest.content if oldest else model.command_line)[:80]
+        result.append(model)
+    return result, total
+
+
+def measure(label: str, fn, page_size: int):
+    with patch.object(
+        peewee.SqliteDatabase,
+        "execute_sql",
+        autospec=True,
+        side_effect=peewee.SqliteDatabase.execute_sql,
+    ) as execute_sql:
+        start = time.perf_counter()
+        for page in range(PAGES):
+            fn(page * page_size, page_size)
+        elapsed = time.perf_counter() - start
+    print(
+        f"  {label:<28} {elapsed / PAGES * 1000:8.2f}ms/page "
+        f"{execute_sql.call_count / PAGES:6.0f} queries/page"
+    )
+
+
+def run(session_count: int, page_size: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = peewee.SqliteDatabase(
+            os.path.join(tmp, "pk.db"), pragmas={"journal_mode": "wal", "foreign_keys": 1}
+        )
+        with db.bind_ctx(MODELS):
+            db.create_tables(MODELS)
+            populate(session_count)
+            repo = SessionRepository(db)
+            print(f"{session_count} sessions, pages of {page_size}")
+            measure("per-session lookups", lambda o, l: list_per_session(repo, o, l), page_size)
+            measure("get_all", lambda o, l: repo.get_all(offset=o, limit=l), page_size)
+            measure(
+                "get_all(include_usage)",
+                lambda o, l: repo.get_all(offset=o, limit=l, include_usage=True),
+                page_size,
+            )
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+    run(args.sessions, args.page_size)
@@ -0,0 +1,139 @@
+"""Benchmark hot trajectory queries against a database seeded with 1M trajectory rows.
+
+Builds a temporary database with the application schema and every migration
+applied, seeds it with trajectories spread over many sessions and human inputs,
+then times the hot TrajectoryRepository queries with the trajectory indexes in
+place and again after dropping the indexes added for them.
+
+Usage:
+    python benchmarks/bench_trajectory_queries.py [--rows 1000000] [--sessions 2000]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import time
+
+from ra_aid.database.connection import DatabaseManager, db_var
+from ra_aid.database.migrations import MigrationManager
+from ra_aid.database.models import (
+    HumanInput,
+    KeyFact,
+    KeySnippet,
+    ResearchNote,
+    Session,
+    Trajectory,
+)
+from ra_aid.database.repositories.trajectory_repository import TrajectoryRepository
+
+MODELS = [Session, HumanInput, KeyFact, KeySnippet, ResearchNote, Trajectory]
+INPUTS_PER_SESSION = 5
+BATCH_SIZE = 5000
+REPEAT = 20
+# Indexes added by migrations 016 and 017
+TRAJECTORY_INDEXES = ["trajectory_usage_idx", "trajectory_session_id_created_at"]
+
+
+def seed(db, row_count: int, session_count: int):
+    now = datetime.datetime.now()
+    with db.atomic():
+        Session.insert_many(
+            [{"start_time": now, "command_line": "ra-aid", "program_version": "bench"}] * session_count
+        ).execute()
+        HumanInput.insert_many(
+            [
+                {"content": "task", "source": "cli", "session": session_id}
+                for session_id in range(1, session_count + 1)
+                for _ in range(INPUTS_PER_SESSION)
+            ]
+        ).execute()
+
+    rng = random.Random(0)
+    input_count = session_count * INPUTS_PER_SESSION
+    insert = (
+        "INSERT INTO trajectory (created_at, updated_at, session_id, human_input_id, record_type, "
+        "tool_name, tool_parameters, current_cost, input_tokens, output_tokens, is_error) "
+        "VALUES (?, ?, ?, ?, ?, 'run_shell_command', '{\"command\": \"ls\"}', 0.001, 100, 20, 0)"
+    )
+    for start in range(0, row_count, BATCH_SIZE):
+        rows = []
+        for i in range(start, min(start + BATCH_SIZE, row_count)):
+            human_input_id = rng.randint(1, input_count)
+            rows.append(
+                (
+                    now + datetime.timedelta(milliseconds=i),
+                    now,
+                    (human_input_id - 1) // INPUTS_PER_SESSION + 1,
+                    human_input_id,
+                    "model_usage" if i % 4 == 0 else "tool_execution",
+                )
+            )
+        with db.atomic():
+            db.cursor().executemany(insert, rows)
+    return session_count, input_count
+
+
+def measure(repo: TrajectoryRepository, session_count: int, input_count: int):
+    rng = random.Random(1)
+    since = datetime.datetime.now() - datetime.timedelta(days=1)
+    queries = {
+        "by session (created_at)": lambda: repo.get_trajectories_by_session(
+            rng.randint(1, session_count)
+        ),
+        "by session (keyset page)": lambda: repo.get_trajectories_by_session(
+            rng.randint(1, session_count), after_id=0, limit=200, include_payload=False
+        ),
+        "by human input": lambda: repo.get_trajectories_by_human_input(
+            rng.randint(1, input_count)
+        ),
+        "session usage totals": lambda: repo.get_session_usage_totals(
+            rng.randint(1, session_count)
+        ),
+        "usage totals, all sessions": lambda: repo.get_usage_totals_by_session(since=since),
+    }
+    results = {}
+    for label, query in queries.items():
+        repeat = 1 if label.endswith("all sessions") else REPEAT
+        start = time.perf_counter()
+        for _ in range(repeat):
+            query()
+        results[label] = (time.perf_counter() - start) / repeat * 1000
+    return results
+
+
+def run(row_count: int, session_count: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_var.set(None)
+        with DatabaseManager(base_dir=tmp) as db:
+            with db.bind_ctx(MODELS):
+                db.create_tables(MODELS, safe=True)
+                MigrationManager(db_path=os.path.join(tmp, ".ra-aid", "pk.db")).apply_migrations()
+
+                start = time.perf_counter()
+                session_count, input_count = seed(db, row_count, session_count)
+                print(
+                    f"seeded {row_count} trajectories over {session_count} sessions "
+                    f"in {time.perf_counter() - start:.1f}s"
+                )
+                db.execute_sql("ANALYZE")
+
+                repo = TrajectoryRepository(db, write_behind=False)
+                indexed = measure(repo, session_count, input_count)
+                for name in TRAJECTORY_INDEXES:
+                    db.execute_sql(f"DROP INDEX {name}")
+                db.execute_sql("ANALYZE")
+                unindexed = measure(repo, session_count, input_count)
+
+        print(f"  {'query':<28} {'indexed':>12} {'without':>12}")
+        for label, elapsed in indexed.items():
+            print(f"  {label:<28} {elapsed:10.2f}ms {unindexed[label]:10.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sessions", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.rows, args.sessions)
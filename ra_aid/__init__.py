@@ -1,15 +1,20 @@
+import importlib
+
 from .__version__ import __version__
-from .agent_utils import run_agent_with_retry
-from .console.formatting import (
-    print_error,
-    print_interrupt,
-    print_stage_header,
-    print_task_header,
-)
-from .console.output import print_agent_output
-from .text.processing import truncate_output
-from .scripts.last_session_usage import get_latest_session_usage
-from .scripts.all_sessions_usage import get_all_sessions_usage
+
+# Re-exports are imported on first access so that importing any ra_aid module,
+# including the CLI entry point, does not load the agent stack.
+_EXPORTS = {
+    "print_error": ".console.formatting",
+    "print_interrupt": ".console.formatting",
+    "print_stage_header": ".console.formatting",
+    "print_task_header": ".console.formatting",
+    "print_agent_output": ".console.output",
+    "truncate_output": ".text.processing",
+    "run_agent_with_retry": ".agent_utils",
+    "get_latest_session_usage": ".scripts.last_session_usage",
+    "get_all_sessions_usage": ".scripts.all_sessions_usage",
+}
 
 __all__ = [
     "print_stage_header",
@@ -23,3 +28,15 @@ __all__ = [
     "get_latest_session_usage",
     "get_all_sessions_usage",
 ]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
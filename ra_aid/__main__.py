@@ -4,105 +4,38 @@ import os
 import sys
 import uuid
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-import litellm
-import uvicorn
-
-from langgraph.checkpoint.memory import MemorySaver
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
-from rich.prompt import Confirm
-
-from ra_aid import print_error, print_stage_header
 from ra_aid.__version__ import __version__
-from ra_aid.version_check import check_for_newer_version
-from ra_aid.agent_utils import (
-    create_agent,
-    run_agent_with_retry,
-)
-from ra_aid.agents.research_agent import run_research_agent
 from ra_aid.config import (
+    DB_PROFILES,
+    DEFAULT_DB_PROFILE,
     DEFAULT_MAX_TEST_CMD_RETRIES,
     DEFAULT_MODEL,
     DEFAULT_RECURSION_LIMIT,
+    DEFAULT_SERVER_AGENT_MODE,
+    DEFAULT_SERVER_MAX_AGENTS,
     DEFAULT_TEST_CMD_TIMEOUT,
+    SERVER_AGENT_MODES,
     VALID_PROVIDERS,
 )
-from ra_aid.database.repositories.key_fact_repository import (
-    KeyFactRepositoryManager,
-    get_key_fact_repository,
-)
-from ra_aid.database.repositories.key_snippet_repository import (
-    KeySnippetRepositoryManager,
-    get_key_snippet_repository,
-)
-from ra_aid.database.repositories.human_input_repository import (
-    HumanInputRepositoryManager,
-    get_human_input_repository,
-)
-from ra_aid.database.repositories.research_note_repository import (
-    ResearchNoteRepositoryManager,
-    get_research_note_repository,
-)
-from ra_aid.database.repositories.trajectory_repository import (
-    TrajectoryRepositoryManager,
-    get_trajectory_repository,
-)
-from ra_aid.database.repositories.session_repository import SessionRepositoryManager
-from ra_aid.database.repositories.related_files_repository import (
-    RelatedFilesRepositoryManager,
-)
 
-from ra_aid.database.repositories.work_log_repository import WorkLogRepositoryManager
-from ra_aid.database.repositories.config_repository import (
-    ConfigRepositoryManager,
-    get_config_repository,
-)
-from ra_aid.env_inv import EnvDiscovery
-from ra_aid.env_inv_context import EnvInvManager, get_env_inv
-from ra_aid.model_formatters import format_key_facts_dict
-from ra_aid.model_formatters.key_snippets_formatter import format_key_snippets_dict
-from ra_aid.console.formatting import cpm
-from ra_aid.database import (
-    DatabaseManager,
-    ensure_migrations_applied,
-)
-from ra_aid.dependencies import check_dependencies
-from ra_aid.env import validate_environment
-from ra_aid.exceptions import AgentInterrupt
-from ra_aid.fallback_handler import FallbackHandler
-from ra_aid.llm import initialize_llm, get_model_default_temperature
-from ra_aid.logging_config import get_logger, setup_logging
-from ra_aid.models_params import models_params
-from ra_aid.project_info import format_project_info, get_project_info
-from ra_aid.prompts.chat_prompts import CHAT_PROMPT
-from ra_aid.prompts.web_research_prompts import WEB_RESEARCH_PROMPT_SECTION_CHAT
-from ra_aid.prompts.custom_tools_prompts import DEFAULT_CUSTOM_TOOLS_PROMPT
-from ra_aid.server.server import app as fastapi_app
-from ra_aid.tool_configs import get_chat_tools, set_modification_tools, get_custom_tools
-from ra_aid.tools.human import ask_human
-
-logger = get_logger(__name__)
-
-# Configure litellm to suppress debug logs
-os.environ["LITELLM_LOG"] = "ERROR"
-litellm.suppress_debug_info = True
-litellm.set_verbose = False
-
-# Explicitly configure LiteLLM's loggers
-for logger_name in ["litellm", "LiteLLM"]:
-    litellm_logger = logging.getLogger(logger_name)
-    litellm_logger.setLevel(logging.WARNING)
-    litellm_logger.propagate = True
-
-# Use litellm's internal method to disable debugging
-if hasattr(litellm, "_logging") and hasattr(litellm._logging, "_disable_debugging"):
-    litellm._logging._disable_debugging()
+if TYPE_CHECKING:
+    from rich.text import Text
+
+# The agent, database and server stacks are imported inside the functions that
+# use them, so that --help, --version and the usage scripts only pay for
+# argparse and the config constants.
+
+# Same logger name get_logger(__name__) gives, without importing logging_config
+logger = logging.getLogger(f"ra_aid.{__name__}")
 
 
 def launch_server(host: str, port: int, args):
     """Launch the RA.Aid web interface."""
+    import uvicorn
+
+    from ra_aid.server.server import app as fastapi_app
     from ra_aid.database.connection import DatabaseManager
     from ra_aid.database.repositories.session_repository import SessionRepositoryManager
     from ra_aid.database.repositories.key_fact_repository import (
@@ -129,6 +62,11 @@ def launch_server(host: str, port: int, args):
     from ra_aid.database.repositories.config_repository import ConfigRepositoryManager
     from ra_aid.env_inv_context import EnvInvManager
     from ra_aid.env_inv import EnvDiscovery
+    from ra_aid.console.formatting import cpm
+    from ra_aid.dependencies import check_dependencies
+    from ra_aid.env import validate_environment
+    from ra_aid.llm import get_model_default_temperature
+    from ra_aid.models_params import models_params
 
     # Set the console handler level to INFO for server mode
     # Get the root logger and modify the console handler
@@ -193,7 +131,7 @@ def launch_server(host: str, port: int, args):
         )
 
     # Initialize environment discovery
-    env_discovery = EnvDiscovery()
+    env_discovery = EnvDiscovery(cache_dir=args.project_state_dir)
     env_discovery.discover()
     env_data = env_discovery.format_markdown()
 
@@ -201,7 +139,7 @@ def launch_server(host: str, port: int, args):
 
     # Initialize database connection and repositories
     with (
-        DatabaseManager(base_dir=args.project_state_dir) as db,
+        DatabaseManager(base_dir=args.project_state_dir, profile=args.db_profile) as db,
         SessionRepositoryManager(db) as session_repo,
         KeyFactRepositoryManager(db) as key_fact_repo,
         KeySnippetRepositoryManager(db) as key_snippet_repo,
@@ -243,6 +181,9 @@ def launch_server(host: str, port: int, args):
                 "force_reasoning_assistance": args.reasoning_assistance,
                 "disable_reasoning_assistance": args.no_reasoning_assistance,
                 "cowboy_mode": args.cowboy_mode,
+                "server_max_agents": args.server_max_agents,
+                "project_state_dir": args.project_state_dir,
+                "server_agent_mode": args.server_agent_mode,
             }
         )
 
@@ -450,6 +391,20 @@ Examples:
         default=1818,
         help="Port to listen on for web interface (default: 1818)",
     )
+    parser.add_argument(
+        "--server-max-agents",
+        type=int,
+        default=DEFAULT_SERVER_MAX_AGENTS,
+        help="Maximum number of agents the web interface runs at once; further spawns are queued "
+        f"(default: {DEFAULT_SERVER_MAX_AGENTS})",
+    )
+    parser.add_argument(
+        "--server-agent-mode",
+        choices=SERVER_AGENT_MODES,
+        default=DEFAULT_SERVER_AGENT_MODE,
+        help="Run web interface agents as threads of the server process or in their own "
+        f"worker processes (default: {DEFAULT_SERVER_AGENT_MODE})",
+    )
     parser.add_argument(
         "--wipe-project-memory",
         action="store_true",
@@ -459,6 +414,17 @@ Examples:
         "--project-state-dir",
         help="Directory to store project state (database and logs). By default, a .ra-aid directory is created in the current working directory.",
     )
+    parser.add_argument(
+        "--db-profile",
+        choices=list(DB_PROFILES),
+        default=DEFAULT_DB_PROFILE,
+        help=f"SQLite performance profile for the project database: safe fsyncs every commit, fast never fsyncs (default: {DEFAULT_DB_PROFILE})",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Skip the check for a newer RA.Aid version, which otherwise contacts docs.ra-aid.ai at most once a day",
+    )
     parser.add_argument(
         "--show-thoughts",
         action="store_true",
@@ -591,17 +557,10 @@ Examples:
     return parsed_args
 
 
-# Create console instance
-console = Console()
-
-# Create individual memory objects for each agent
-research_memory = MemorySaver()
-planning_memory = MemorySaver()
-implementation_memory = MemorySaver()
-
-
 def is_informational_query() -> bool:
     """Determine if the current query is informational based on config settings."""
+    from ra_aid.database.repositories.config_repository import get_config_repository
+
     return get_config_repository().get("research_only", False)
 
 
@@ -643,11 +602,26 @@ def wipe_project_memory(custom_dir=None):
         return f"Error: Failed to wipe project memory: {str(e)}"
 
 
-def build_status():
+def build_status() -> "Text":
     """Build status panel with model and feature information.
 
     Includes memory statistics at the bottom with counts of key facts, snippets, and research notes.
     """
+    from rich.text import Text
+
+    from ra_aid.database.repositories.config_repository import get_config_repository
+    from ra_aid.database.repositories.key_fact_repository import (
+        get_key_fact_repository,
+    )
+    from ra_aid.database.repositories.key_snippet_repository import (
+        get_key_snippet_repository,
+    )
+    from ra_aid.database.repositories.research_note_repository import (
+        get_research_note_repository,
+    )
+    from ra_aid.fallback_handler import FallbackHandler
+    from ra_aid.version_check import get_version_message
+
     status = Text()
 
     # Get the config repository to get model/provider information
@@ -716,17 +690,17 @@ def build_status():
     note_count = 0
 
     try:
-        fact_count = len(get_key_fact_repository().get_all())
+        fact_count = get_key_fact_repository().count()
     except RuntimeError as e:
         logger.debug(f"Failed to get key facts count: {e}")
 
     try:
-        snippet_count = len(get_key_snippet_repository().get_all())
+        snippet_count = get_key_snippet_repository().count()
     except RuntimeError as e:
         logger.debug(f"Failed to get key snippets count: {e}")
 
     try:
-        note_count = len(get_research_note_repository().get_all())
+        note_count = get_research_note_repository().count()
     except RuntimeError as e:
         logger.debug(f"Failed to get research notes count: {e}")
 
@@ -737,8 +711,8 @@ def build_status():
     if fact_count > 0 or snippet_count > 0 or note_count > 0:
         status.append(" (use --wipe-project-memory to reset)")
 
-    # Check for newer version
-    version_message = check_for_newer_version()
+    # Report a newer version if the background check has already finished
+    version_message = get_version_message()
     if version_message:
         status.append("\n\n")
         status.append(version_message, style="yellow")
@@ -749,6 +723,63 @@ def build_status():
 def main():
     """Main entry point for the ra-aid command line tool."""
     args = parse_arguments()
+
+    from langgraph.checkpoint.memory import MemorySaver
+    from rich.panel import Panel
+    from rich.prompt import Confirm
+
+    from ra_aid.agent_utils import create_agent, run_agent_with_retry
+    from ra_aid.agents.research_agent import run_research_agent
+    from ra_aid.console.common import console
+    from ra_aid.console.formatting import cpm, print_error, print_stage_header
+    from ra_aid.database import DatabaseManager, ensure_migrations_applied
+    from ra_aid.database.repositories.config_repository import ConfigRepositoryManager
+    from ra_aid.database.repositories.human_input_repository import (
+        HumanInputRepositoryManager,
+        get_human_input_repository,
+    )
+    from ra_aid.database.repositories.key_fact_repository import (
+        KeyFactRepositoryManager,
+        get_key_fact_repository,
+    )
+    from ra_aid.database.repositories.key_snippet_repository import (
+        KeySnippetRepositoryManager,
+        get_key_snippet_repository,
+    )
+    from ra_aid.database.repositories.related_files_repository import (
+        RelatedFilesRepositoryManager,
+    )
+    from ra_aid.database.repositories.research_note_repository import (
+        ResearchNoteRepositoryManager,
+    )
+    from ra_aid.database.repositories.session_repository import SessionRepositoryManager
+    from ra_aid.database.repositories.trajectory_repository import (
+        TrajectoryRepositoryManager,
+        get_trajectory_repository,
+    )
+    from ra_aid.database.repositories.work_log_repository import (
+        WorkLogRepositoryManager,
+    )
+    from ra_aid.dependencies import check_dependencies
+    from ra_aid.env import validate_environment
+    from ra_aid.env_inv import EnvDiscovery
+    from ra_aid.env_inv_context import EnvInvManager, get_env_inv
+    from ra_aid.exceptions import AgentInterrupt
+    from ra_aid.llm import get_model_default_temperature, initialize_llm
+    from ra_aid.logging_config import setup_logging
+    from ra_aid.models_params import models_params
+    from ra_aid.project_info import format_project_info, get_project_info
+    from ra_aid.prompts.chat_prompts import CHAT_PROMPT
+    from ra_aid.prompts.custom_tools_prompts import DEFAULT_CUSTOM_TOOLS_PROMPT
+    from ra_aid.prompts.web_research_prompts import WEB_RESEARCH_PROMPT_SECTION_CHAT
+    from ra_aid.tool_configs import (
+        get_chat_tools,
+        get_custom_tools,
+        set_modification_tools,
+    )
+    from ra_aid.tools.human import ask_human
+    from ra_aid.version_check import start_version_check
+
     setup_logging(
         args.log_mode,
         args.pretty_logger,
@@ -776,8 +807,11 @@ def main():
         launch_server(args.server_host, args.server_port, args)
         return
 
+    # Runs in the background; build_status shows the result if it is ready by then
+    start_version_check(args.project_state_dir, offline=args.offline)
+
     try:
-        with DatabaseManager(base_dir=args.project_state_dir) as db:
+        with DatabaseManager(base_dir=args.project_state_dir, profile=args.db_profile) as db:
             # Apply any pending database migrations
             try:
                 migration_result = ensure_migrations_applied()
@@ -793,7 +827,7 @@ def main():
 
             # Initialize repositories with database connection
             # Create environment inventory data
-            env_discovery = EnvDiscovery()
+            env_discovery = EnvDiscovery(cache_dir=args.project_state_dir)
             env_discovery.discover()
             env_data = env_discovery.format_markdown()
 
@@ -1048,12 +1082,8 @@ def main():
                             ),
                             working_directory=working_directory,
                             current_date=current_date,
-                            key_facts=format_key_facts_dict(
-                                get_key_fact_repository().get_facts_dict()
-                            ),
-                            key_snippets=format_key_snippets_dict(
-                                get_key_snippet_repository().get_snippets_dict()
-                            ),
+                            key_facts=get_key_fact_repository().get_formatted_facts(),
+                            key_snippets=get_key_snippet_repository().get_formatted_snippets(),
                             project_info=formatted_project_info,
                             env_inv=get_env_inv(),
                         ),
@@ -1188,7 +1218,7 @@ def main():
                     expert_enabled=expert_enabled,
                     research_only=args.research_only,
                     hil=args.hil,
-                    memory=research_memory,
+                    memory=MemorySaver(),
                 )
 
                 # for how long have we had a second planning agent triggered here?
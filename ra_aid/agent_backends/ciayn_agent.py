@@ -31,6 +31,7 @@ import ra_aid.console.formatting
 from ra_aid.agent_context import should_exit
 from ra_aid.text.processing import process_thinking_content
 from ra_aid.text import fix_triple_quote_contents
+from ra_aid.utils.token_cache import BYTE_ESTIMATE_TOKENIZER, get_token_count_cache
 
 logger = get_logger(__name__)
 
@@ -889,19 +890,26 @@ class CiaynAgent:
             return initial_messages + chat_history
 
         # Calculate initial messages token count
-        initial_tokens = sum(self._estimate_tokens(msg) for msg in initial_messages)
+        initial_tokens = sum(self._cached_estimate_tokens(msg) for msg in initial_messages)
+        history_tokens = [self._cached_estimate_tokens(msg) for msg in chat_history]
+        total_tokens = initial_tokens + sum(history_tokens)
 
         # Remove messages from start of chat_history until under token limit
-        while chat_history:
-            total_tokens = initial_tokens + sum(
-                self._estimate_tokens(msg) for msg in chat_history
-            )
-            if total_tokens <= self.max_tokens:
-                break
-            chat_history.pop(0)
+        remove_count = 0
+        while remove_count < len(chat_history) and total_tokens > self.max_tokens:
+            total_tokens -= history_tokens[remove_count]
+            remove_count += 1
+        del chat_history[:remove_count]
 
         return initial_messages + chat_history
 
+    @classmethod
+    def _cached_estimate_tokens(cls, content: Optional[Union[str, BaseMessage]]) -> int:
+        """Estimate token count for a message or string using the shared token count cache."""
+        return get_token_count_cache().get_or_count(
+            content, BYTE_ESTIMATE_TOKENIZER, cls._estimate_tokens
+        )
+
     @staticmethod
     def _estimate_tokens(content: Optional[Union[str, BaseMessage]]) -> int:
         """Estimate token count for a message or string."""
@@ -19,7 +19,6 @@ from ra_aid.model_detection import (
 
 from anthropic import APIError, APITimeoutError, InternalServerError, RateLimitError
 from openai import RateLimitError as OpenAIRateLimitError
-from litellm.exceptions import RateLimitError as LiteLLMRateLimitError
 from google.api_core.exceptions import ResourceExhausted
 from fireworks.client.error import (
     ServiceUnavailableError,
@@ -58,6 +57,7 @@ from ra_aid.models_params import (
     DEFAULT_TOKEN_LIMIT,
 )
 from ra_aid.tools.handle_user_defined_test_cmd_execution import execute_test_command
+from ra_aid.utils.litellm_loader import litellm_rate_limit_error
 from ra_aid.database.repositories.human_input_repository import (
     get_human_input_repository,
 )
@@ -289,7 +289,7 @@ def _handle_api_error(e, attempt, max_retries, base_delay):
         (
             RateLimitError,
             OpenAIRateLimitError,
-            LiteLLMRateLimitError,
+            litellm_rate_limit_error(),
             ResourceExhausted,
             FireworksRateLimitError,
         ),
@@ -627,7 +627,7 @@ def run_agent_with_retry(
                     APITimeoutError,
                     RateLimitError,
                     OpenAIRateLimitError,
-                    LiteLLMRateLimitError,
+                    litellm_rate_limit_error(),
                     ResourceExhausted,
                     APIError,
                     ValueError,
@@ -29,9 +29,6 @@ from ra_aid.env_inv_context import get_env_inv
 from ra_aid.exceptions import AgentInterrupt
 from ra_aid.llm import initialize_expert_llm
 from ra_aid.logging_config import get_logger
-from ra_aid.model_formatters import format_key_facts_dict
-from ra_aid.model_formatters.key_snippets_formatter import format_key_snippets_dict
-from ra_aid.model_formatters.research_notes_formatter import format_research_notes_dict
 from ra_aid.models_params import models_params, DEFAULT_TOKEN_LIMIT
 from ra_aid.project_info import format_project_info, get_project_info
 from ra_aid.prompts.expert_prompts import EXPERT_PROMPT_SECTION_IMPLEMENTATION
@@ -107,16 +104,14 @@ def run_task_implementation_agent(
 
     # Make sure key_facts is defined before using it
     try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
+        key_facts = get_key_fact_repository().get_formatted_facts()
     except RuntimeError as e:
         logger.error(f"Failed to access key fact repository: {str(e)}")
         key_facts = ""
 
     # Get formatted research notes using repository
     try:
-        repository = get_research_note_repository()
-        notes_dict = repository.get_notes_dict()
-        formatted_research_notes = format_research_notes_dict(notes_dict)
+        formatted_research_notes = get_research_note_repository().get_formatted_notes()
     except RuntimeError as e:
         logger.error(f"Failed to access research note repository: {str(e)}")
         formatted_research_notes = ""
@@ -196,9 +191,7 @@ def run_task_implementation_agent(
                 working_directory=working_directory,
                 task=task,
                 key_facts=key_facts,
-                key_snippets=format_key_snippets_dict(
-                    get_key_snippet_repository().get_snippets_dict()
-                ),
+                key_snippets=get_key_snippet_repository().get_formatted_snippets(),
                 research_notes=formatted_research_notes,
                 related_files="\n".join(related_files),
                 env_inv=env_inv,
@@ -272,9 +265,7 @@ def run_task_implementation_agent(
         plan=plan,
         related_files=related_files,
         key_facts=key_facts,
-        key_snippets=format_key_snippets_dict(
-            get_key_snippet_repository().get_snippets_dict()
-        ),
+        key_snippets=get_key_snippet_repository().get_formatted_snippets(),
         research_notes=formatted_research_notes,
         work_log=get_work_log_repository().format_work_log(),
         expert_section=EXPERT_PROMPT_SECTION_IMPLEMENTATION if expert_enabled else "",
@@ -21,6 +21,7 @@ from ra_aid import agent_utils
 from ra_aid.console.formatting import console_panel
 from ra_aid.database.repositories.key_fact_repository import get_key_fact_repository
 from ra_aid.database.repositories.human_input_repository import get_human_input_repository
+from ra_aid.config import MEMORY_GC_WINDOW
 from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.llm import initialize_llm
@@ -149,8 +150,8 @@ def run_key_facts_gc_agent() -> None:
     """
     # Get the count of key facts
     try:
-        facts = get_key_fact_repository().get_all()
-        fact_count = len(facts)
+        fact_count = get_key_fact_repository().count()
+        facts = get_key_fact_repository().get_all(limit=MEMORY_GC_WINDOW, oldest=True)
     except RuntimeError as e:
         logger.error(f"Failed to access key fact repository: {str(e)}")
         # Record GC error in trajectory
@@ -240,8 +241,7 @@ def run_key_facts_gc_agent() -> None:
             
             # Get updated count
             try:
-                updated_facts = get_key_fact_repository().get_all()
-                updated_count = len(updated_facts)
+                updated_count = get_key_fact_repository().count()
             except RuntimeError as e:
                 logger.error(f"Failed to access key fact repository for update count: {str(e)}")
                 updated_count = "unknown"
@@ -18,6 +18,7 @@ from ra_aid import agent_utils
 from ra_aid.console.formatting import console_panel
 from ra_aid.database.repositories.key_snippet_repository import get_key_snippet_repository
 from ra_aid.database.repositories.human_input_repository import get_human_input_repository
+from ra_aid.config import MEMORY_GC_WINDOW
 from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.llm import initialize_llm
@@ -147,8 +148,8 @@ def run_key_snippets_gc_agent() -> None:
     Snippets associated with the current human input are excluded from deletion.
     """
     # Get the count of key snippets
-    snippets = get_key_snippet_repository().get_all()
-    snippet_count = len(snippets)
+    snippet_count = get_key_snippet_repository().count()
+    snippets = get_key_snippet_repository().get_all(limit=MEMORY_GC_WINDOW, oldest=True)
     
     # Display status panel with snippet count included
     try:
@@ -226,8 +227,7 @@ def run_key_snippets_gc_agent() -> None:
             agent_utils.run_agent_with_retry(agent, prompt, agent_config)
             
             # Get updated count
-            updated_snippets = get_key_snippet_repository().get_all()
-            updated_count = len(updated_snippets)
+            updated_count = get_key_snippet_repository().count()
             
             # Show info panel with updated count and protected snippets count
             protected_count = len(protected_snippets)
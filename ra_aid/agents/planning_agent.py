@@ -30,9 +30,6 @@ from ra_aid.env_inv_context import get_env_inv
 from ra_aid.exceptions import AgentInterrupt
 from ra_aid.llm import initialize_expert_llm
 from ra_aid.logging_config import get_logger
-from ra_aid.model_formatters import format_key_facts_dict
-from ra_aid.model_formatters.key_snippets_formatter import format_key_snippets_dict
-from ra_aid.model_formatters.research_notes_formatter import format_research_notes_dict
 from ra_aid.text.processing import process_thinking_content
 from ra_aid.models_params import models_params
 from ra_aid.project_info import format_project_info, get_project_info
@@ -128,25 +125,21 @@ def run_planning_agent(
 
     # Make sure key_facts is defined before using it
     try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
+        key_facts = get_key_fact_repository().get_formatted_facts()
     except RuntimeError as e:
         logger.error(f"Failed to access key fact repository: {str(e)}")
         key_facts = ""
 
     # Make sure key_snippets is defined before using it
     try:
-        key_snippets = format_key_snippets_dict(
-            get_key_snippet_repository().get_snippets_dict()
-        )
+        key_snippets = get_key_snippet_repository().get_formatted_snippets()
     except RuntimeError as e:
         logger.error(f"Failed to access key snippet repository: {str(e)}")
         key_snippets = ""
 
     # Get formatted research notes using repository
     try:
-        repository = get_research_note_repository()
-        notes_dict = repository.get_notes_dict()
-        formatted_research_notes = format_research_notes_dict(notes_dict)
+        formatted_research_notes = get_research_note_repository().get_formatted_notes()
     except RuntimeError as e:
         logger.error(f"Failed to access research note repository: {str(e)}")
         formatted_research_notes = ""
@@ -34,9 +34,6 @@ from ra_aid.env_inv_context import get_env_inv
 from ra_aid.exceptions import AgentInterrupt
 from ra_aid.llm import initialize_expert_llm
 from ra_aid.logging_config import get_logger
-from ra_aid.model_formatters import format_key_facts_dict
-from ra_aid.model_formatters.key_snippets_formatter import format_key_snippets_dict
-from ra_aid.model_formatters.research_notes_formatter import format_research_notes_dict
 from ra_aid.text.processing import process_thinking_content
 from ra_aid.models_params import models_params
 from ra_aid.project_info import (
@@ -130,16 +127,14 @@ def run_research_agent(
         # Continue without appending last human input
 
     try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
+        key_facts = get_key_fact_repository().get_formatted_facts()
         logger.debug(f"[{thread_id}] Retrieved {len(key_facts)} chars of key facts.")
     except RuntimeError as e:
         logger.error(f"[{thread_id}] Failed to access key fact repository: {str(e)}")
         key_facts = ""
 
     try:
-        key_snippets = format_key_snippets_dict(
-            get_key_snippet_repository().get_snippets_dict()
-        )
+        key_snippets = get_key_snippet_repository().get_formatted_snippets()
         logger.debug(
             f"[{thread_id}] Retrieved {len(key_snippets)} chars of key snippets."
         )
@@ -204,9 +199,7 @@ def run_research_agent(
 
     # Get research note information for reasoning assistance
     try:
-        research_notes = format_research_notes_dict(
-            get_research_note_repository().get_notes_dict()
-        )
+        research_notes = get_research_note_repository().get_formatted_notes()
         logger.debug(
             f"[{thread_id}] Retrieved {len(research_notes)} chars of research notes."
         )
@@ -520,14 +513,12 @@ def run_web_research_agent(
     human_section = HUMAN_PROMPT_SECTION_RESEARCH if hil else ""
 
     try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
+        key_facts = get_key_fact_repository().get_formatted_facts()
     except RuntimeError as e:
         logger.error(f"[{thread_id}] Failed to access key fact repository: {str(e)}")
         key_facts = ""
     try:
-        key_snippets = format_key_snippets_dict(
-            get_key_snippet_repository().get_snippets_dict()
-        )
+        key_snippets = get_key_snippet_repository().get_formatted_snippets()
     except RuntimeError as e:
         logger.error(f"[{thread_id}] Failed to access key snippet repository: {str(e)}")
         key_snippets = ""
@@ -21,6 +21,7 @@ from ra_aid.agent_context import mark_should_exit
 from ra_aid.agent_utils import create_agent, run_agent_with_retry
 from ra_aid.database.repositories.research_note_repository import get_research_note_repository
 from ra_aid.database.repositories.human_input_repository import get_human_input_repository
+from ra_aid.config import MEMORY_GC_WINDOW
 from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.llm import initialize_llm
@@ -155,8 +156,8 @@ def run_research_notes_gc_agent(threshold: int = 30) -> None:
     """
     # Get the count of research notes
     try:
-        notes = get_research_note_repository().get_all()
-        note_count = len(notes)
+        note_count = get_research_note_repository().count()
+        notes = get_research_note_repository().get_all(limit=MEMORY_GC_WINDOW, oldest=True)
     except RuntimeError as e:
         logger.error(f"Failed to access research note repository: {str(e)}")
         # Record GC error in trajectory
@@ -291,8 +292,7 @@ Remember: Your goal is to maintain a concise, high-value collection of research
             
             # Get updated count
             try:
-                updated_notes = get_research_note_repository().get_all()
-                updated_count = len(updated_notes)
+                updated_count = get_research_note_repository().count()
             except RuntimeError as e:
                 logger.error(f"Failed to access research note repository for update count: {str(e)}")
                 updated_count = "unknown"
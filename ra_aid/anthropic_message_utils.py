@@ -1,6 +1,6 @@
 """Utilities for handling Anthropic-specific message formats and trimming."""
 
-from typing import Callable, List, Literal, Optional, Sequence, Union, cast
+from typing import Callable, Dict, List, Literal, Optional, Sequence, Union, cast
 
 from langchain_core.messages import (
     AIMessage,
@@ -83,6 +83,34 @@ def is_tool_pair(message1: BaseMessage, message2: BaseMessage) -> bool:
 
 
 
+def _count_message_tokens(
+    messages: Sequence[BaseMessage],
+    token_counter: Callable[[List[BaseMessage]], int],
+    message_token_counter: Optional[Callable[[BaseMessage], int]] = None,
+) -> Dict[int, int]:
+    """Count tokens for each message exactly once.
+
+    Args:
+        messages: Messages to count
+        token_counter: Function to count tokens in a list of messages, used one
+            message at a time when no per-message counter is given
+        message_token_counter: Optional function to count tokens in a single message
+
+    Returns:
+        Dict[int, int]: Token count keyed by ``id()`` of each message object
+    """
+    counts: Dict[int, int] = {}
+    for msg in messages:
+        key = id(msg)
+        if key in counts:
+            continue
+        if message_token_counter is not None:
+            counts[key] = message_token_counter(msg)
+        else:
+            counts[key] = token_counter([msg])
+    return counts
+
+
 def anthropic_trim_messages(
     messages: Sequence[BaseMessage],
     *,
@@ -93,6 +121,7 @@ def anthropic_trim_messages(
     allow_partial: bool = False,
     include_system: bool = True,
     start_on: Optional[Union[str, type, List[Union[str, type]]]] = None,
+    message_token_counter: Optional[Callable[[BaseMessage], int]] = None,
 ) -> List[BaseMessage]:
     """Trim messages to fit within a token limit, with Anthropic-specific handling.
 
@@ -103,6 +132,10 @@ def anthropic_trim_messages(
 
     It always keeps the first num_messages_to_keep messages.
 
+    Each message is counted once up front and candidates are accepted using a
+    running total, so the token count of a list is taken to be the sum of the
+    token counts of its messages.
+
     Args:
         messages: Sequence of messages to trim
         max_tokens: Maximum number of tokens allowed
@@ -111,6 +144,8 @@ def anthropic_trim_messages(
         allow_partial: Whether to allow partial messages
         include_system: Whether to always include the system message
         start_on: Message type to start on (only for "last" strategy)
+        message_token_counter: Optional function to count tokens in a single
+            message. Defaults to calling token_counter with a one-element list.
 
     Returns:
         List[BaseMessage]: Trimmed messages that fit within token limit
@@ -120,6 +155,13 @@ def anthropic_trim_messages(
 
     messages = list(messages)
 
+    token_counts = _count_message_tokens(
+        messages, token_counter, message_token_counter
+    )
+
+    def count_tokens(msgs: Sequence[BaseMessage]) -> int:
+        return sum(token_counts[id(msg)] for msg in msgs)
+
     # Always keep the first num_messages_to_keep messages
     kept_messages = messages[:num_messages_to_keep]
     remaining_msgs = messages[num_messages_to_keep:]
@@ -135,7 +177,7 @@ def anthropic_trim_messages(
     # If we have tool_use anywhere, we need to be very careful about trimming
     if has_tool_use_anywhere:
         # For safety, just keep all messages if we're under the token limit
-        if token_counter(messages) <= max_tokens:
+        if count_tokens(messages) <= max_tokens:
             return messages
 
         # We need to identify all tool_use/tool_result relationships
@@ -190,22 +232,17 @@ def anthropic_trim_messages(
         if strategy == "last":
             # First collect all pairs we can include within the token limit
             pairs_to_include = []
+            total_tokens = count_tokens(result)
 
             # Process pairs from the end (newest first)
             for pair_idx, (ai_idx, tool_idx) in enumerate(reversed(complete_pairs)):
-                # Try adding this pair
-                test_msgs = result.copy()
-
-                # Add all previously selected pairs
-                for prev_ai_idx, prev_tool_idx in pairs_to_include:
-                    test_msgs.extend([messages[prev_ai_idx], messages[prev_tool_idx]])
+                # Try adding this pair on top of the result and previously selected pairs
+                pair_tokens = count_tokens([messages[ai_idx], messages[tool_idx]])
 
-                # Add this pair
-                test_msgs.extend([messages[ai_idx], messages[tool_idx]])
-
-                if token_counter(test_msgs) <= max_tokens:
+                if total_tokens + pair_tokens <= max_tokens:
                     # This pair fits, add it to our list
                     pairs_to_include.append((ai_idx, tool_idx))
+                    total_tokens += pair_tokens
                 else:
                     # This pair would exceed the token limit
                     break
@@ -238,19 +275,22 @@ def anthropic_trim_messages(
         if not segments:
             return kept_messages
 
-        result = []
+        selected_segments = []
+        total_tokens = count_tokens(kept_messages)
 
         # Process segments from the end
         for i, segment in enumerate(reversed(segments)):
             # Try adding this segment
-            test_msgs = segment + result
+            segment_tokens = count_tokens(segment)
 
-            if token_counter(kept_messages + test_msgs) <= max_tokens:
-                result = segment + result
+            if total_tokens + segment_tokens <= max_tokens:
+                selected_segments.append(segment)
+                total_tokens += segment_tokens
             else:
                 # This segment would exceed the token limit
                 break
 
+        result = [msg for segment in reversed(selected_segments) for msg in segment]
         final_result = kept_messages + result
 
         # For Anthropic, we need to ensure the conversation follows a valid structure
@@ -296,13 +336,15 @@ def anthropic_trim_messages(
 
     elif strategy == "first":
         result = []
+        total_tokens = count_tokens(kept_messages)
 
         # Process segments from the beginning
         for i, segment in enumerate(segments):
             # Try adding this segment
-            test_msgs = result + segment
-            if token_counter(kept_messages + test_msgs) <= max_tokens:
-                result = result + segment
+            segment_tokens = count_tokens(segment)
+            if total_tokens + segment_tokens <= max_tokens:
+                result.extend(segment)
+                total_tokens += segment_tokens
             else:
                 # This segment would exceed the token limit
                 break
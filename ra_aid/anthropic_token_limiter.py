@@ -1,7 +1,7 @@
 """Utilities for handling token limits with Anthropic models."""
 
 from functools import partial
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 from langchain.chat_models.base import BaseChatModel
 from typing import Tuple
@@ -18,15 +18,28 @@ from ra_aid.anthropic_message_utils import (
     anthropic_trim_messages,
 )
 from langgraph.prebuilt.chat_agent_executor import AgentState
-from litellm import token_counter, get_model_info
 
 from ra_aid.agent_backends.ciayn_agent import CiaynAgent
 from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.logging_config import get_logger
 from ra_aid.models_params import DEFAULT_TOKEN_LIMIT, models_params
+from ra_aid.utils.litellm_loader import get_litellm
+from ra_aid.utils.token_cache import BYTE_ESTIMATE_TOKENIZER, get_token_count_cache
 
 logger = get_logger(__name__)
 
+_list_overhead_tokens: Dict[str, int] = {}
+
+
+def token_counter(*args: Any, **kwargs: Any) -> int:
+    """litellm.token_counter, importing litellm on first use."""
+    return get_litellm().token_counter(*args, **kwargs)
+
+
+def get_model_info(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+    """litellm.get_model_info, importing litellm on first use."""
+    return get_litellm().get_model_info(*args, **kwargs)
+
 
 def estimate_messages_tokens(messages: Sequence[BaseMessage]) -> int:
     """Helper function to estimate total tokens in a sequence of messages.
@@ -41,7 +54,11 @@ def estimate_messages_tokens(messages: Sequence[BaseMessage]) -> int:
         return 0
 
     estimate_tokens = CiaynAgent._estimate_tokens
-    return sum(estimate_tokens(msg) for msg in messages)
+    cache = get_token_count_cache()
+    return sum(
+        cache.get_or_count(msg, BYTE_ESTIMATE_TOKENIZER, estimate_tokens)
+        for msg in messages
+    )
 
 
 def convert_message_to_litellm_format(message: BaseMessage) -> Dict:
@@ -92,6 +109,61 @@ def create_token_counter_wrapper(model: str):
     return wrapped_token_counter
 
 
+def get_list_overhead_tokens(model: str) -> int:
+    """Get the fixed number of tokens litellm adds once per list of messages.
+
+    litellm adds a constant (the reply priming) to every message list it counts,
+    so counting messages one at a time would include it once per message.
+
+    Args:
+        model: The model name to use for token counting
+
+    Returns:
+        Number of tokens counted once per message list
+    """
+    overhead = _list_overhead_tokens.get(model)
+    if overhead is None:
+        empty = {"role": "user", "content": ""}
+        single = token_counter(model=model, messages=[empty])
+        double = token_counter(model=model, messages=[empty, empty])
+        overhead = max(2 * single - double, 0)
+        _list_overhead_tokens[model] = overhead
+    return overhead
+
+
+def create_message_token_counter(model: str) -> Callable[[BaseMessage], int]:
+    """Create a per-message token counter backed by the shared token count cache.
+
+    Counts are additive: the sum of the counts of a list of messages plus
+    get_list_overhead_tokens(model) matches the count litellm reports for the list.
+
+    Args:
+        model: The model name to use for token counting
+
+    Returns:
+        A function that accepts a single BaseMessage and returns its token count
+    """
+
+    def count_uncached(message: BaseMessage) -> int:
+        litellm_message = convert_message_to_litellm_format(message)
+        return token_counter(
+            model=model, messages=[litellm_message]
+        ) - get_list_overhead_tokens(model)
+
+    def count_message_tokens(message: BaseMessage) -> int:
+        """Count tokens in a single message, reusing cached counts when possible.
+
+        Args:
+            message: The message to count
+
+        Returns:
+            Token count for the message
+        """
+        return get_token_count_cache().get_or_count(message, model, count_uncached)
+
+    return count_message_tokens
+
+
 def state_modifier(
     state: AgentState, model: BaseChatModel, max_input_tokens: int = DEFAULT_TOKEN_LIMIT
 ) -> list[BaseMessage]:
@@ -114,11 +186,13 @@ def state_modifier(
 
     model_name = get_model_name_from_chat_model(model)
     wrapped_token_counter = create_token_counter_wrapper(model_name)
+    message_token_counter = create_message_token_counter(model_name)
 
     result = anthropic_trim_messages(
         messages,
         token_counter=wrapped_token_counter,
-        max_tokens=max_input_tokens,
+        message_token_counter=message_token_counter,
+        max_tokens=max_input_tokens - get_list_overhead_tokens(model_name),
         strategy="last",
         allow_partial=False,
         include_system=True,
@@ -130,6 +204,11 @@ def state_modifier(
             f"Anthropic Token Limiter Trimmed: {len(messages)} messages → {len(result)} messages"
         )
 
+    cache_stats = get_token_count_cache().stats()
+    logger.debug(
+        f"Token count cache: {cache_stats['size']} entries, hit rate {cache_stats['hit_rate']:.1%}"
+    )
+
     return result
 
 
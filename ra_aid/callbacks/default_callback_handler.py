@@ -1,7 +1,6 @@
 import threading
 import time
 from langchain.chat_models.base import BaseChatModel
-import litellm
 from contextlib import contextmanager
 from contextvars import ContextVar
 from typing import Dict, Optional, Union, Any, List
@@ -14,6 +13,7 @@ from ra_aid.model_detection import (
     get_model_name_from_chat_model,
     get_provider_from_chat_model,
 )
+from ra_aid.utils.litellm_loader import get_litellm
 from ra_aid.utils.singleton import Singleton
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.database.repositories.session_repository import get_session_repository
@@ -137,7 +137,7 @@ class DefaultCallbackHandler(BaseCallbackHandler, metaclass=Singleton):
 
     def _initialize_model_costs(self) -> None:
         try:
-            model_info = litellm.get_model_info(
+            model_info = get_litellm().get_model_info(
                 model=self.model_name, custom_llm_provider=self.provider
             )
             if model_info:
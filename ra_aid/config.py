@@ -1,5 +1,7 @@
 """Configuration utilities."""
 
+from typing import Any, Dict
+
 DEFAULT_RECURSION_LIMIT = 100
 DEFAULT_MAX_TEST_CMD_RETRIES = 3
 DEFAULT_MAX_TOOL_FAILURES = 3
@@ -8,6 +10,49 @@ RETRY_FALLBACK_COUNT = 3
 DEFAULT_TEST_CMD_TIMEOUT = 60 * 5  # 5 minutes in seconds
 DEFAULT_MODEL="claude-3-7-sonnet-20250219"
 DEFAULT_SHOW_COST = False
+DEFAULT_SERVER_MAX_AGENTS = 2
+SERVER_AGENT_MODES = ["thread", "process"]
+DEFAULT_SERVER_AGENT_MODE = "thread"
+# Memory GC agents review at most this many records per run, oldest first, so
+# a backlog that outgrew the GC thresholds is drained over several runs
+# instead of being sent to the model in one prompt
+MEMORY_GC_WINDOW = 200
+
+# SQLite pragmas for each performance profile. Every profile uses WAL journaling and
+# enforces foreign keys; they differ in durability and how much memory SQLite may use.
+DB_PROFILES: Dict[str, Dict[str, Any]] = {
+    # fsync on every commit; survives power loss
+    "safe": {
+        "journal_mode": "wal",
+        "foreign_keys": 1,
+        "synchronous": "full",
+        "cache_size": -1024 * 32,  # 32MB cache
+        "temp_store": "default",
+        "mmap_size": 0,
+        "busy_timeout": 5000,  # milliseconds
+    },
+    # fsync only at WAL checkpoints; a crash can lose the last commits but never corrupts
+    "balanced": {
+        "journal_mode": "wal",
+        "foreign_keys": 1,
+        "synchronous": "normal",
+        "cache_size": -1024 * 64,  # 64MB cache
+        "temp_store": "memory",
+        "mmap_size": 256 * 1024 * 1024,
+        "busy_timeout": 5000,
+    },
+    # No fsync at all; fastest, but an OS crash can corrupt the database
+    "fast": {
+        "journal_mode": "wal",
+        "foreign_keys": 1,
+        "synchronous": "off",
+        "cache_size": -1024 * 128,  # 128MB cache
+        "temp_store": "memory",
+        "mmap_size": 1024 * 1024 * 1024,
+        "busy_timeout": 10000,
+    },
+}
+DEFAULT_DB_PROFILE = "balanced"
 
 
 VALID_PROVIDERS = [
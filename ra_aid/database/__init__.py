@@ -5,7 +5,15 @@ This package provides database functionality for the ra_aid application,
 including connection management, models, utility functions, and migrations.
 """
 
-from ra_aid.database.connection import DatabaseManager, close_db, get_db, init_db
+from ra_aid.database.connection import (
+    DB_PROFILES,
+    DEFAULT_DB_PROFILE,
+    DatabaseManager,
+    close_db,
+    get_db,
+    get_pool_stats,
+    init_db,
+)
 from ra_aid.database.migrations import (
     MigrationManager,
     create_new_migration,
@@ -20,6 +28,9 @@ __all__ = [
     "init_db",
     "get_db",
     "close_db",
+    "get_pool_stats",
+    "DB_PROFILES",
+    "DEFAULT_DB_PROFILE",
     "DatabaseManager",
     "BaseModel",
     "initialize_database",
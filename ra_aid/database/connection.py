@@ -3,15 +3,25 @@ Database connection management for ra_aid.
 
 This module provides functions to initialize, get, and close database connections.
 It also provides a context manager for database connections.
+
+File-based databases are opened as a connection pool shared by every thread that
+uses the same database file. Each thread checks out its own SQLite connection on
+connect and returns it on close, so server agent threads and request handlers do
+not serialize on a single connection. SQLite settings come from a named
+performance profile (see DB_PROFILES).
 """
 
 import contextvars
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 import peewee
+from playhouse.pool import PooledSqliteDatabase as _PeeweePooledSqliteDatabase
 
+from ra_aid.config import DB_PROFILES, DEFAULT_DB_PROFILE
 from ra_aid.logging_config import get_logger
 
 # Import initialize_database after it's defined in models.py
@@ -22,6 +32,148 @@ db_var = contextvars.ContextVar("db", default=None)
 logger = get_logger(__name__)
 
 
+# Maximum number of SQLite connections checked out at once from one pool
+DEFAULT_MAX_CONNECTIONS = 32
+
+# Seconds a thread waits for a free connection before giving up
+DEFAULT_POOL_TIMEOUT = 30
+
+# Seconds after which an idle pooled connection is closed instead of reused
+DEFAULT_STALE_TIMEOUT = 300
+
+# Pools for file-based databases, keyed by database path, so threads opening the
+# same file share connections and settings
+_pools: Dict[str, "PooledSqliteDatabase"] = {}
+_pools_lock = threading.Lock()
+
+
+def get_db_pragmas(profile: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get the SQLite pragmas for a performance profile.
+
+    Args:
+        profile: Name of a profile in DB_PROFILES, or None for DEFAULT_DB_PROFILE
+
+    Returns:
+        Dict[str, Any]: Pragma names mapped to their values
+
+    Raises:
+        ValueError: If the profile does not exist
+    """
+    name = profile or DEFAULT_DB_PROFILE
+    if name not in DB_PROFILES:
+        raise ValueError(
+            f"Unknown database profile '{name}'. Valid profiles: {', '.join(DB_PROFILES)}"
+        )
+    return dict(DB_PROFILES[name])
+
+
+class PooledSqliteDatabase(_PeeweePooledSqliteDatabase):
+    """
+    SQLite connection pool that records checkout metrics.
+
+    Connections are handed out per thread: a thread's first query (or connect())
+    checks out a connection and close() returns it for another thread to reuse.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        # Connections returned to the pool may be checked out by a different thread
+        kwargs.setdefault("check_same_thread", False)
+        self._metrics_lock = threading.Lock()
+        self.profile: Optional[str] = None
+        self._checkouts = 0
+        self._returns = 0
+        self._connections_created = 0
+        self._peak_in_use = 0
+        self._wait_seconds = 0.0
+        super().__init__(*args, **kwargs)
+
+    def connect(self, reuse_if_open: bool = False) -> bool:
+        start = time.monotonic()
+        try:
+            return super().connect(reuse_if_open)
+        finally:
+            with self._metrics_lock:
+                self._wait_seconds += time.monotonic() - start
+
+    def _connect(self):
+        conn = super()._connect()
+        with self._metrics_lock:
+            self._checkouts += 1
+            self._peak_in_use = max(self._peak_in_use, len(self._in_use))
+        return conn
+
+    def _add_conn_hooks(self, conn) -> None:
+        # Only called for brand new connections, not ones reused from the pool
+        super()._add_conn_hooks(conn)
+        with self._metrics_lock:
+            self._connections_created += 1
+
+    def _close(self, conn, close_conn: bool = False) -> None:
+        super()._close(conn, close_conn)
+        with self._metrics_lock:
+            self._returns += 1
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Get checkout metrics for this pool.
+
+        Returns:
+            Dict with checkouts, returns, connections_created, in_use, available,
+            peak_in_use, max_connections and wait_seconds (total time spent in connect)
+        """
+        with self._metrics_lock:
+            return {
+                "checkouts": self._checkouts,
+                "returns": self._returns,
+                "connections_created": self._connections_created,
+                "in_use": len(self._in_use),
+                "available": len(self._connections),
+                "peak_in_use": self._peak_in_use,
+                "max_connections": self._max_connections,
+                "wait_seconds": round(self._wait_seconds, 6),
+            }
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get checkout metrics for every open connection pool.
+
+    Returns:
+        Dict mapping database paths to their pool metrics
+    """
+    with _pools_lock:
+        pools = dict(_pools)
+    return {path: pool.pool_stats() for path, pool in pools.items()}
+
+
+def release_connection(db: Any) -> None:
+    """
+    Return the calling thread's pooled connection to its pool.
+
+    Meant for short-lived work on shared worker threads (such as a web server's
+    threadpool) that would otherwise keep a connection checked out indefinitely.
+    Does nothing for databases that are not pooled.
+
+    Args:
+        db: Database the calling thread may hold a connection to
+    """
+    if isinstance(db, PooledSqliteDatabase) and not db.is_closed():
+        db.close()
+
+
+def close_pools() -> None:
+    """Close every pooled connection and forget the pools."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        try:
+            pool.close_all()
+        except Exception as e:
+            logger.debug(f"Error closing connection pool: {str(e)}")
+
+
 class DatabaseManager:
     """
     Context manager for database connections.
@@ -43,7 +195,12 @@ class DatabaseManager:
             # Use database in custom directory
     """
 
-    def __init__(self, in_memory: bool = False, base_dir: Optional[str] = None):
+    def __init__(
+        self,
+        in_memory: bool = False,
+        base_dir: Optional[str] = None,
+        profile: Optional[str] = None,
+    ):
         """
         Initialize the DatabaseManager.
 
@@ -51,9 +208,12 @@ class DatabaseManager:
             in_memory: Whether to use an in-memory database (default: False)
             base_dir: Optional base directory to use instead of current working directory.
                      If None, uses os.getcwd() (default: None)
+            profile: Optional performance profile name from DB_PROFILES.
+                     If None, uses DEFAULT_DB_PROFILE (default: None)
         """
         self.in_memory = in_memory
         self.base_dir = base_dir
+        self.profile = profile
 
     def __enter__(self) -> peewee.SqliteDatabase:
         """
@@ -62,7 +222,9 @@ class DatabaseManager:
         Returns:
             peewee.SqliteDatabase: The initialized database connection
         """
-        db = init_db(in_memory=self.in_memory, base_dir=self.base_dir)
+        db = init_db(
+            in_memory=self.in_memory, base_dir=self.base_dir, profile=self.profile
+        )
         
         # Initialize the database proxy in models.py
         try:
@@ -96,7 +258,11 @@ class DatabaseManager:
         return False
 
 
-def init_db(in_memory: bool = False, base_dir: Optional[str] = None) -> peewee.SqliteDatabase:
+def init_db(
+    in_memory: bool = False,
+    base_dir: Optional[str] = None,
+    profile: Optional[str] = None,
+) -> peewee.SqliteDatabase:
     """
     Initialize the database connection.
 
@@ -104,14 +270,24 @@ def init_db(in_memory: bool = False, base_dir: Optional[str] = None) -> peewee.S
     the SQLite database connection. If a database connection already exists,
     returns the existing connection instead of creating a new one.
 
+    File-based databases share one PooledSqliteDatabase per database file across
+    threads; calling init_db from a new thread checks out a connection from it.
+
     Args:
         in_memory: Whether to use an in-memory database (default: False)
         base_dir: Optional base directory to use instead of current working directory.
                   If None, uses os.getcwd() (default: None)
+        profile: Optional performance profile name from DB_PROFILES. If None, uses
+                 DEFAULT_DB_PROFILE, or the profile of an existing pool for the file.
 
     Returns:
         peewee.SqliteDatabase: The initialized database connection
+
+    Raises:
+        ValueError: If the profile does not exist
     """
+    pragmas = get_db_pragmas(profile)
+
     # Check if a database connection already exists
     existing_db = db_var.get()
     if existing_db is not None:
@@ -250,6 +426,19 @@ def init_db(in_memory: bool = False, base_dir: Optional[str] = None) -> peewee.S
         db_path = os.path.join(ra_aid_dir_str, "pk.db")
         logger.debug(f"Database path: {db_path}")
 
+        # Another thread already opened this file: check out a connection from its pool
+        with _pools_lock:
+            pool = _pools.get(db_path)
+        if pool is not None:
+            if profile is not None and profile != pool.profile:
+                logger.warning(
+                    f"Database {db_path} is already open with profile '{pool.profile}', ignoring '{profile}'"
+                )
+            if pool.is_closed():
+                pool.connect()
+            db_var.set(pool)
+            return pool
+
     try:
         # For file-based databases, ensure the file exists or can be created
         if db_path != ":memory:":
@@ -275,14 +464,22 @@ def init_db(in_memory: bool = False, base_dir: Optional[str] = None) -> peewee.S
 
         # Initialize the database connection
         logger.debug(f"Initializing SQLite database at: {db_path}")
-        db = peewee.SqliteDatabase(
-            db_path,
-            pragmas={
-                "journal_mode": "wal",  # Write-Ahead Logging for better concurrency
-                "foreign_keys": 1,  # Enforce foreign key constraints
-                "cache_size": -1024 * 32,  # 32MB cache
-            },
-        )
+        if in_memory:
+            # Every connection to :memory: is a separate database, so it cannot be pooled
+            db = peewee.SqliteDatabase(db_path, pragmas=pragmas)
+        else:
+            db = PooledSqliteDatabase(
+                db_path,
+                pragmas=pragmas,
+                max_connections=DEFAULT_MAX_CONNECTIONS,
+                stale_timeout=DEFAULT_STALE_TIMEOUT,
+                timeout=DEFAULT_POOL_TIMEOUT,
+            )
+            db.profile = profile or DEFAULT_DB_PROFILE
+            with _pools_lock:
+                # Another thread may have opened the file while this one was setting up
+                db = _pools.setdefault(db_path, db)
+            logger.debug(f"Using database profile '{db.profile}'")
 
         # Always explicitly connect to ensure the connection is established
         if db.is_closed():
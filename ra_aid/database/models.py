@@ -256,3 +256,5 @@ class Trajectory(BaseModel):
 
     class Meta:
         table_name = "trajectory"
+        # Session timelines are read in created_at order
+        indexes = ((("session", "created_at"), False),)
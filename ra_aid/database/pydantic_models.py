@@ -30,6 +30,10 @@ class SessionModel(BaseModel):
         machine_info: Dictionary containing machine-specific metadata
         status: The current lifecycle state of the session (e.g., 'pending', 'running', 'completed', 'error')
         display_name: Display name for the session (derived from human input or command line)
+        total_cost: Summed model usage cost, only filled in when usage is requested
+        total_input_tokens: Summed model input tokens, only filled in when usage is requested
+        total_output_tokens: Summed model output tokens, only filled in when usage is requested
+        total_tokens: Sum of input and output tokens, only filled in when usage is requested
     """
     id: Optional[int] = None
     created_at: datetime.datetime
@@ -40,6 +44,10 @@ class SessionModel(BaseModel):
     machine_info: Optional[Dict[str, Any]] = None
     status: str # Added status field
     display_name: Optional[str] = None
+    total_cost: Optional[float] = None
+    total_input_tokens: Optional[int] = None
+    total_output_tokens: Optional[int] = None
+    total_tokens: Optional[int] = None
 
     # Configure the model to work with ORM objects
     model_config = ConfigDict(from_attributes=True)
@@ -101,6 +101,11 @@ class HumanInputRepository:
     
     This class provides methods for performing CRUD operations on the HumanInput model,
     abstracting the database access details from the business logic.
+
+    The ID of the most recent human input is kept in memory once known, so tool calls
+    that tag their trajectories with it do not query the database. Each thread or
+    session gets its own repository from HumanInputRepositoryManager, so the cached
+    ID is the one for that thread's own conversation.
     
     Example:
         with DatabaseManager() as db:
@@ -119,6 +124,8 @@ class HumanInputRepository:
         if db is None:
             raise ValueError("Database connection is required for HumanInputRepository")
         self.db = db
+        self._most_recent_id: Optional[int] = None
+        self._most_recent_id_loaded = False
         
     def _to_model(self, human_input: Optional[HumanInput]) -> Optional[HumanInputModel]:
         """
@@ -134,6 +141,16 @@ class HumanInputRepository:
             return None
         
         return HumanInputModel.model_validate(human_input, from_attributes=True)
+
+    def _set_most_recent_id(self, input_id: Optional[int]) -> None:
+        """Remember the ID of the most recent human input."""
+        self._most_recent_id = input_id
+        self._most_recent_id_loaded = True
+
+    def _invalidate_most_recent_id(self) -> None:
+        """Forget the remembered ID so the next lookup queries the database."""
+        self._most_recent_id = None
+        self._most_recent_id_loaded = False
     
     def create(self, content: str, source: str, session_id: Optional[int] = None) -> HumanInputModel:
         """
@@ -160,6 +177,7 @@ class HumanInputRepository:
                     logger.warning(f"Session with ID {session_id} not found, creating human input without session")
             
             input_record = HumanInput.create(content=content, source=source, session=session)
+            self._set_most_recent_id(input_record.id)
             logger.debug(f"Created human input ID {input_record.id} from {source}" + 
                         (f" for session {session_id}" if session_id else ""))
             return self._to_model(input_record)
@@ -244,6 +262,8 @@ class HumanInputRepository:
             
             # Delete the record
             input_record.delete_instance()
+            if input_id == self._most_recent_id:
+                self._invalidate_most_recent_id()
             logger.debug(f"Deleted human input ID {input_id}")
             return True
         except peewee.DatabaseError as e:
@@ -290,6 +310,9 @@ class HumanInputRepository:
     def get_most_recent_id(self) -> Optional[int]:
         """
         Get the ID of the most recent human input record.
+
+        The database is only queried the first time; after that the ID is served from
+        memory and kept current by create().
         
         Returns:
             Optional[int]: The ID of the most recent human input, or None if no records exist
@@ -297,11 +320,17 @@ class HumanInputRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        if self._most_recent_id_loaded:
+            return self._most_recent_id
         try:
-            recent_inputs = self.get_recent(1)
-            if recent_inputs and len(recent_inputs) > 0:
-                return recent_inputs[0].id
-            return None
+            recent_id = (
+                HumanInput.select(HumanInput.id)
+                .order_by(HumanInput.created_at.desc(), HumanInput.id.desc())
+                .limit(1)
+                .scalar()
+            )
+            self._set_most_recent_id(recent_id)
+            return recent_id
         except peewee.DatabaseError as e:
             logger.error(f"Failed to fetch most recent human input ID: {str(e)}")
             raise
@@ -352,6 +381,8 @@ class HumanInputRepository:
                 # Delete records not in the keep_ids list
                 delete_query = HumanInput.delete().where(HumanInput.id.not_in(keep_ids))
                 deleted_count = delete_query.execute()
+                if self._most_recent_id not in keep_ids:
+                    self._invalidate_most_recent_id()
                 
                 logger.info(f"Garbage collected {deleted_count} old human input records")
                 return deleted_count
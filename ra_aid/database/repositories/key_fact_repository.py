@@ -13,10 +13,15 @@ import peewee
 
 from ra_aid.database.models import KeyFact
 from ra_aid.database.pydantic_models import KeyFactModel
+from ra_aid.database.utils import GenerationCache, TableGeneration, select_session_window
+from ra_aid.model_formatters.key_facts_formatter import format_key_facts_dict
 from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Bumped on every KeyFact write so cached reads such as the formatted prompt section are rebuilt
+_key_fact_generation = TableGeneration()
+
 # Create contextvar to hold the KeyFactRepository instance
 key_fact_repo_var = contextvars.ContextVar("key_fact_repo", default=None)
 
@@ -120,6 +125,7 @@ class KeyFactRepository:
         if db is None:
             raise ValueError("Database connection is required for KeyFactRepository")
         self.db = db
+        self._cache = GenerationCache(db, _key_fact_generation, KeyFact)
     
     def _to_model(self, fact: Optional[KeyFact]) -> Optional[KeyFactModel]:
         """
@@ -136,13 +142,16 @@ class KeyFactRepository:
         
         return KeyFactModel.model_validate(fact, from_attributes=True)
     
-    def create(self, content: str, human_input_id: Optional[int] = None) -> KeyFactModel:
+    def create(
+        self, content: str, human_input_id: Optional[int] = None, session_id: Optional[int] = None
+    ) -> KeyFactModel:
         """
         Create a new key fact in the database.
         
         Args:
             content: The text content of the key fact
             human_input_id: Optional ID of the associated human input
+            session_id: Optional ID of the session the record belongs to
             
         Returns:
             KeyFactModel: The newly created key fact instance
@@ -151,7 +160,12 @@ class KeyFactRepository:
             peewee.DatabaseError: If there's an error creating the fact
         """
         try:
-            fact = KeyFact.create(content=content, human_input_id=human_input_id)
+            fact = KeyFact.create(
+                content=content,
+                human_input_id=human_input_id,
+                session=session_id,
+            )
+            _key_fact_generation.bump()
             logger.debug(f"Created key fact ID {fact.id}: {content}")
             return self._to_model(fact)
         except peewee.DatabaseError as e:
@@ -202,6 +216,7 @@ class KeyFactRepository:
             # Update the fact
             fact.content = content
             fact.save()
+            _key_fact_generation.bump()
             logger.debug(f"Updated key fact ID {fact_id}: {content}")
             return self._to_model(fact)
         except peewee.DatabaseError as e:
@@ -230,29 +245,59 @@ class KeyFactRepository:
             
             # Delete the fact
             fact.delete_instance()
+            _key_fact_generation.bump()
             logger.debug(f"Deleted key fact ID {fact_id}")
             return True
         except peewee.DatabaseError as e:
             logger.error(f"Failed to delete key fact {fact_id}: {str(e)}")
             raise
     
-    def get_all(self) -> List[KeyFactModel]:
+    def get_all(
+        self, session_id: Optional[int] = None, limit: Optional[int] = None, oldest: bool = False
+    ) -> List[KeyFactModel]:
         """
-        Retrieve all key facts from the database.
+        Retrieve key facts from the database in id order.
+        
+        Args:
+            session_id: Only return key facts recorded in this session
+            limit: Only return the most recent key facts
+            oldest: Take the limit window from the oldest key facts instead
         
         Returns:
-            List[KeyFactModel]: List of all key fact instances
+            List[KeyFactModel]: List of matching key fact instances
             
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
         try:
-            facts = list(KeyFact.select().order_by(KeyFact.id))
+            facts = select_session_window(KeyFact, session_id, limit, oldest)
             return [self._to_model(fact) for fact in facts]
         except peewee.DatabaseError as e:
             logger.error(f"Failed to fetch all key facts: {str(e)}")
             raise
     
+    def count(self, session_id: Optional[int] = None) -> int:
+        """
+        Count key facts without loading them.
+        
+        Args:
+            session_id: Only count key facts recorded in this session
+        
+        Returns:
+            int: Number of matching key facts
+            
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            query = KeyFact.select()
+            if session_id is not None:
+                query = query.where(KeyFact.session == session_id)
+            return query.count()
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to count key facts: {str(e)}")
+            raise
+    
     def get_facts_dict(self) -> Dict[int, str]:
         """
         Retrieve all key facts as a dictionary mapping IDs to content.
@@ -266,8 +311,22 @@ class KeyFactRepository:
             peewee.DatabaseError: If there's an error accessing the database
         """
         try:
-            facts = self.get_all()
-            return {fact.id: fact.content for fact in facts}
+            return dict(self._cache.get("dict", lambda: {fact.id: fact.content for fact in self.get_all()}))
         except peewee.DatabaseError as e:
             logger.error(f"Failed to fetch key facts as dictionary: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def get_formatted_facts(self) -> str:
+        """
+        Retrieve all key facts formatted as the markdown prompt section.
+        
+        The result is cached until a key fact is created, updated or deleted,
+        so repeated prompt builds do not re-read the table.
+        
+        Returns:
+            str: Output of format_key_facts_dict for the current key facts
+            
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        return self._cache.get("formatted", lambda: format_key_facts_dict(self.get_facts_dict()))
@@ -12,10 +12,15 @@ import peewee
 
 from ra_aid.database.models import KeySnippet
 from ra_aid.database.pydantic_models import KeySnippetModel
+from ra_aid.database.utils import GenerationCache, TableGeneration, select_session_window
+from ra_aid.model_formatters.key_snippets_formatter import format_key_snippets_dict
 from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Bumped on every KeySnippet write so cached reads such as the formatted prompt section are rebuilt
+_key_snippet_generation = TableGeneration()
+
 # Create contextvar to hold the KeySnippetRepository instance
 key_snippet_repo_var = contextvars.ContextVar("key_snippet_repo", default=None)
 
@@ -129,6 +134,7 @@ class KeySnippetRepository:
         if db is None:
             raise ValueError("Database connection is required for KeySnippetRepository")
         self.db = db
+        self._cache = GenerationCache(db, _key_snippet_generation, KeySnippet)
     
     def _to_model(self, snippet: Optional[KeySnippet]) -> Optional[KeySnippetModel]:
         """
@@ -147,7 +153,7 @@ class KeySnippetRepository:
     
     def create(
         self, filepath: str, line_number: int, snippet: str, description: Optional[str] = None,
-        human_input_id: Optional[int] = None
+        human_input_id: Optional[int] = None, session_id: Optional[int] = None
     ) -> KeySnippetModel:
         """
         Create a new key snippet in the database.
@@ -158,6 +164,7 @@ class KeySnippetRepository:
             snippet: The source code snippet text
             description: Optional description of the significance
             human_input_id: Optional ID of the associated human input
+            session_id: Optional ID of the session the record belongs to
             
         Returns:
             KeySnippetModel: The newly created key snippet instance
@@ -171,8 +178,10 @@ class KeySnippetRepository:
                 line_number=line_number,
                 snippet=snippet,
                 description=description,
-                human_input_id=human_input_id
+                human_input_id=human_input_id,
+                session=session_id
             )
+            _key_snippet_generation.bump()
             logger.debug(f"Created key snippet ID {key_snippet.id}: {filepath}:{line_number}")
             return self._to_model(key_snippet)
         except peewee.DatabaseError as e:
@@ -236,6 +245,7 @@ class KeySnippetRepository:
             key_snippet.snippet = snippet
             key_snippet.description = description
             key_snippet.save()
+            _key_snippet_generation.bump()
             logger.debug(f"Updated key snippet ID {snippet_id}: {filepath}:{line_number}")
             return self._to_model(key_snippet)
         except peewee.DatabaseError as e:
@@ -264,29 +274,59 @@ class KeySnippetRepository:
             
             # Delete the snippet
             key_snippet.delete_instance()
+            _key_snippet_generation.bump()
             logger.debug(f"Deleted key snippet ID {snippet_id}")
             return True
         except peewee.DatabaseError as e:
             logger.error(f"Failed to delete key snippet {snippet_id}: {str(e)}")
             raise
     
-    def get_all(self) -> List[KeySnippetModel]:
+    def get_all(
+        self, session_id: Optional[int] = None, limit: Optional[int] = None, oldest: bool = False
+    ) -> List[KeySnippetModel]:
         """
-        Retrieve all key snippets from the database.
+        Retrieve key snippets from the database in id order.
+        
+        Args:
+            session_id: Only return key snippets recorded in this session
+            limit: Only return the most recent key snippets
+            oldest: Take the limit window from the oldest key snippets instead
         
         Returns:
-            List[KeySnippetModel]: List of all key snippet instances
+            List[KeySnippetModel]: List of matching key snippet instances
             
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
         try:
-            snippets = list(KeySnippet.select().order_by(KeySnippet.id))
+            snippets = select_session_window(KeySnippet, session_id, limit, oldest)
             return [self._to_model(snippet) for snippet in snippets]
         except peewee.DatabaseError as e:
             logger.error(f"Failed to fetch all key snippets: {str(e)}")
             raise
     
+    def count(self, session_id: Optional[int] = None) -> int:
+        """
+        Count key snippets without loading them.
+        
+        Args:
+            session_id: Only count key snippets recorded in this session
+        
+        Returns:
+            int: Number of matching key snippets
+            
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            query = KeySnippet.select()
+            if session_id is not None:
+                query = query.where(KeySnippet.session == session_id)
+            return query.count()
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to count key snippets: {str(e)}")
+            raise
+    
     def get_snippets_dict(self) -> Dict[int, Dict[str, Any]]:
         """
         Retrieve all key snippets as a dictionary mapping IDs to snippet information.
@@ -301,16 +341,34 @@ class KeySnippetRepository:
             peewee.DatabaseError: If there's an error accessing the database
         """
         try:
-            snippets = self.get_all()
-            return {
-                snippet.id: {
-                    "filepath": snippet.filepath,
-                    "line_number": snippet.line_number,
-                    "snippet": snippet.snippet,
-                    "description": snippet.description
-                } 
-                for snippet in snippets
-            }
+            snippets = self._cache.get("dict", self._load_snippets_dict)
+            return {snippet_id: dict(info) for snippet_id, info in snippets.items()}
         except peewee.DatabaseError as e:
             logger.error(f"Failed to fetch key snippets as dictionary: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def _load_snippets_dict(self) -> Dict[int, Dict[str, Any]]:
+        return {
+            snippet.id: {
+                "filepath": snippet.filepath,
+                "line_number": snippet.line_number,
+                "snippet": snippet.snippet,
+                "description": snippet.description
+            } 
+            for snippet in self.get_all()
+        }
+
+    def get_formatted_snippets(self) -> str:
+        """
+        Retrieve all key snippets formatted as the markdown prompt section.
+        
+        The result is cached until a key snippet is created, updated or deleted,
+        so repeated prompt builds do not re-read the table.
+        
+        Returns:
+            str: Output of format_key_snippets_dict for the current snippets
+            
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        return self._cache.get("formatted", lambda: format_key_snippets_dict(self.get_snippets_dict()))
@@ -13,10 +13,15 @@ import peewee
 
 from ra_aid.database.models import ResearchNote
 from ra_aid.database.pydantic_models import ResearchNoteModel
+from ra_aid.database.utils import GenerationCache, TableGeneration, select_session_window
+from ra_aid.model_formatters.research_notes_formatter import format_research_notes_dict
 from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Bumped on every ResearchNote write so cached reads such as the formatted prompt section are rebuilt
+_research_note_generation = TableGeneration()
+
 # Create contextvar to hold the ResearchNoteRepository instance
 research_note_repo_var = contextvars.ContextVar("research_note_repo", default=None)
 
@@ -120,6 +125,7 @@ class ResearchNoteRepository:
         if db is None:
             raise ValueError("Database connection is required for ResearchNoteRepository")
         self.db = db
+        self._cache = GenerationCache(db, _research_note_generation, ResearchNote)
     
     def _to_model(self, note: Optional[ResearchNote]) -> Optional[ResearchNoteModel]:
         """
@@ -136,13 +142,16 @@ class ResearchNoteRepository:
         
         return ResearchNoteModel.model_validate(note, from_attributes=True)
     
-    def create(self, content: str, human_input_id: Optional[int] = None) -> ResearchNoteModel:
+    def create(
+        self, content: str, human_input_id: Optional[int] = None, session_id: Optional[int] = None
+    ) -> ResearchNoteModel:
         """
         Create a new research note in the database.
         
         Args:
             content: The text content of the research note
             human_input_id: Optional ID of the associated human input
+            session_id: Optional ID of the session the record belongs to
             
         Returns:
             ResearchNoteModel: The newly created research note instance
@@ -151,7 +160,12 @@ class ResearchNoteRepository:
             peewee.DatabaseError: If there's an error creating the note
         """
         try:
-            note = ResearchNote.create(content=content, human_input_id=human_input_id)
+            note = ResearchNote.create(
+                content=content,
+                human_input_id=human_input_id,
+                session=session_id,
+            )
+            _research_note_generation.bump()
             logger.debug(f"Created research note ID {note.id}: {content[:50]}...")
             return self._to_model(note)
         except peewee.DatabaseError as e:
@@ -202,6 +216,7 @@ class ResearchNoteRepository:
             # Update the note
             note.content = content
             note.save()
+            _research_note_generation.bump()
             logger.debug(f"Updated research note ID {note_id}: {content[:50]}...")
             return self._to_model(note)
         except peewee.DatabaseError as e:
@@ -230,29 +245,59 @@ class ResearchNoteRepository:
             
             # Delete the note
             note.delete_instance()
+            _research_note_generation.bump()
             logger.debug(f"Deleted research note ID {note_id}")
             return True
         except peewee.DatabaseError as e:
             logger.error(f"Failed to delete research note {note_id}: {str(e)}")
             raise
     
-    def get_all(self) -> List[ResearchNoteModel]:
+    def get_all(
+        self, session_id: Optional[int] = None, limit: Optional[int] = None, oldest: bool = False
+    ) -> List[ResearchNoteModel]:
         """
-        Retrieve all research notes from the database.
+        Retrieve research notes from the database in id order.
+        
+        Args:
+            session_id: Only return research notes recorded in this session
+            limit: Only return the most recent research notes
+            oldest: Take the limit window from the oldest research notes instead
         
         Returns:
-            List[ResearchNoteModel]: List of all research note instances
+            List[ResearchNoteModel]: List of matching research note instances
             
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
         try:
-            notes = list(ResearchNote.select().order_by(ResearchNote.id))
+            notes = select_session_window(ResearchNote, session_id, limit, oldest)
             return [self._to_model(note) for note in notes]
         except peewee.DatabaseError as e:
             logger.error(f"Failed to fetch all research notes: {str(e)}")
             raise
     
+    def count(self, session_id: Optional[int] = None) -> int:
+        """
+        Count research notes without loading them.
+        
+        Args:
+            session_id: Only count research notes recorded in this session
+        
+        Returns:
+            int: Number of matching research notes
+            
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            query = ResearchNote.select()
+            if session_id is not None:
+                query = query.where(ResearchNote.session == session_id)
+            return query.count()
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to count research notes: {str(e)}")
+            raise
+    
     def get_notes_dict(self) -> Dict[int, str]:
         """
         Retrieve all research notes as a dictionary mapping IDs to content.
@@ -266,8 +311,22 @@ class ResearchNoteRepository:
             peewee.DatabaseError: If there's an error accessing the database
         """
         try:
-            notes = self.get_all()
-            return {note.id: note.content for note in notes}
+            return dict(self._cache.get("dict", lambda: {note.id: note.content for note in self.get_all()}))
         except peewee.DatabaseError as e:
             logger.error(f"Failed to fetch research notes as dictionary: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def get_formatted_notes(self) -> str:
+        """
+        Retrieve all research notes formatted as the markdown prompt section.
+        
+        The result is cached until a research note is created, updated or deleted,
+        so repeated prompt builds do not re-read the table.
+        
+        Returns:
+            str: Output of format_research_notes_dict for the current research notes
+            
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        return self._cache.get("formatted", lambda: format_research_notes_dict(self.get_notes_dict()))
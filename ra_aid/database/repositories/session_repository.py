@@ -16,7 +16,7 @@ import sys
 import peewee
 
 from ra_aid.config import DEFAULT_MODEL
-from ra_aid.database.models import Session, HumanInput
+from ra_aid.database.models import Session, HumanInput, Trajectory
 from ra_aid.database.pydantic_models import SessionModel
 from ra_aid.exceptions import SessionNotFoundError # Import exception
 from ra_aid.__version__ import __version__
@@ -24,6 +24,9 @@ from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Display names longer than this many characters are truncated and end in "..."
+DISPLAY_NAME_MAX_LENGTH = 80
+
 # Create contextvar to hold the SessionRepository instance
 session_repo_var = contextvars.ContextVar("session_repo", default=None)
 
@@ -102,6 +105,13 @@ def get_session_repository() -> "SessionRepository":
     return repo
 
 
+def _truncate_display_name(text: Optional[str]) -> Optional[str]:
+    """Shorten a display name to DISPLAY_NAME_MAX_LENGTH characters plus "..."."""
+    if text and len(text) > DISPLAY_NAME_MAX_LENGTH:
+        return text[:DISPLAY_NAME_MAX_LENGTH] + "..."
+    return text
+
+
 class SessionRepository:
     """
     Repository for handling Session records in the database.
@@ -123,45 +133,6 @@ class SessionRepository:
         self.db = db
         self.current_session = None
 
-    def _get_display_name_for_session(self, session_id: int) -> Optional[str]:
-        """
-        Get the display name for a session using Peewee ORM.
-
-        Args:
-            session_id: The ID of the session
-
-        Returns:
-            Optional[str]: The display name or None if an error occurs
-        """
-        try:
-            # Get the session
-            session = Session.get_by_id(session_id)
-            if not session:
-                return None
-
-            # Try to get the oldest human input for this session
-            oldest_input = (
-                HumanInput.select()
-                .where(HumanInput.session == session_id)
-                .order_by(HumanInput.id)
-                .first()
-            )
-
-            # Use human input content if available, otherwise use command line
-            if oldest_input:
-                content = oldest_input.content
-                if len(content) > 80:
-                    return content[:80] + "..."
-                return content
-
-            # Fallback to command line
-            if session.command_line and len(session.command_line) > 80:
-                return session.command_line[:80] + "..."
-            return session.command_line
-        except Exception as e:
-            logger.error(f"Error getting display name for session {session_id}: {str(e)}")
-            return None
-
     def _to_model(self, session: Optional[Session]) -> Optional[SessionModel]:
         """
         Convert a Session model to a SessionModel Pydantic model.
@@ -208,6 +179,94 @@ class SessionRepository:
                 display_name=display_name,
             )
 
+    def _get_display_name_subquery(self) -> peewee.ModelSelect:
+        """
+        Create a correlated subquery for the start of a session's oldest human input.
+
+        Only DISPLAY_NAME_MAX_LENGTH + 1 characters are read, which is enough to tell
+        whether the display name needs truncating.
+
+        Returns:
+            peewee.ModelSelect: Scalar subquery to select alongside Session columns
+        """
+        return (
+            HumanInput.select(
+                peewee.fn.SUBSTR(HumanInput.content, 1, DISPLAY_NAME_MAX_LENGTH + 1)
+            )
+            .where(HumanInput.session == Session.id)
+            .order_by(HumanInput.id)
+            .limit(1)
+        )
+
+    def _get_usage_subqueries(self) -> Dict[str, peewee.ModelSelect]:
+        """
+        Create correlated subqueries summing a session's model usage records.
+
+        Returns:
+            Dict[str, peewee.ModelSelect]: Scalar subqueries keyed by the alias to select them as
+        """
+        def total(field: peewee.Field, default: Any) -> peewee.ModelSelect:
+            return Trajectory.select(
+                peewee.fn.COALESCE(peewee.fn.SUM(field), default)
+            ).where(
+                (Trajectory.session == Session.id)
+                & (Trajectory.record_type == "model_usage")
+            )
+
+        return {
+            "total_cost": total(Trajectory.current_cost, 0.0),
+            "total_input_tokens": total(Trajectory.input_tokens, 0),
+            "total_output_tokens": total(Trajectory.output_tokens, 0),
+        }
+
+    def _select_sessions(self, include_usage: bool = False) -> peewee.ModelSelect:
+        """
+        Select sessions together with their display name source, in a single query.
+
+        Args:
+            include_usage: Whether to also select per-session cost and token totals
+
+        Returns:
+            peewee.ModelSelect: Query whose rows can be passed to _to_session_model
+        """
+        columns = [Session, self._get_display_name_subquery().alias("first_input")]
+        if include_usage:
+            columns.extend(
+                subquery.alias(alias)
+                for alias, subquery in self._get_usage_subqueries().items()
+            )
+        return Session.select(*columns)
+
+    def _to_session_model(
+        self, session: Optional[Session], include_usage: bool = False
+    ) -> Optional[SessionModel]:
+        """
+        Convert a row from _select_sessions into a SessionModel with its display name.
+
+        Args:
+            session: Session row selected by _select_sessions, or None
+            include_usage: Whether the row includes usage totals
+
+        Returns:
+            SessionModel or None if session is None
+        """
+        model = self._to_model(session)
+        if model is None:
+            return None
+
+        # Use the oldest human input if there is one, otherwise the command line
+        model.display_name = _truncate_display_name(
+            getattr(session, "first_input", None) or model.command_line
+        )
+
+        if include_usage:
+            model.total_cost = float(session.total_cost or 0.0)
+            model.total_input_tokens = int(session.total_input_tokens or 0)
+            model.total_output_tokens = int(session.total_output_tokens or 0)
+            model.total_tokens = model.total_input_tokens + model.total_output_tokens
+
+        return model
+
     def create_session(self, metadata: Optional[Dict[str, Any]] = None) -> SessionModel:
         """
         Create a new session record in the database.
@@ -252,10 +311,7 @@ class SessionRepository:
                 result = self._to_model(session)
                 # Set display_name to command_line (truncated if needed)
                 if result and result.command_line:
-                    if len(result.command_line) > 80:
-                        result.display_name = result.command_line[:80] + "..."
-                    else:
-                        result.display_name = result.command_line
+                    result.display_name = _truncate_display_name(result.command_line)
             
             return result
         except peewee.DatabaseError as e:
@@ -304,10 +360,7 @@ class SessionRepository:
             result = self._to_model(current_session)
             if result and result.command_line:
                 # Set display_name to command_line (truncated if needed)
-                if len(result.command_line) > 80:
-                    result.display_name = result.command_line[:80] + "..."
-                else:
-                    result.display_name = result.command_line
+                result.display_name = _truncate_display_name(result.command_line)
             return result
 
     def get_current_session_record(self) -> Optional[Session]:
@@ -368,28 +421,8 @@ class SessionRepository:
             Optional[SessionModel]: The session with the given ID or None if not found
         """
         try:
-            # Get the session using normal ORM
-            session = Session.get_or_none(Session.id == session_id)
-            if session is None:
-                return None
-
-            # Convert to model (includes status)
-            model = self._to_model(session)
-            if model is None: # Should not happen if session is not None, but check
-                return None
-
-            # Get display name directly
-            display_name = self._get_display_name_for_session(session_id)
-            if display_name:
-                model.display_name = display_name
-            elif model.command_line:
-                # Fallback to command line
-                if len(model.command_line) > 80:
-                    model.display_name = model.command_line[:80] + "..."
-                else:
-                    model.display_name = model.command_line
-
-            return model
+            session = self._select_sessions().where(Session.id == session_id).first()
+            return self._to_session_model(session)
 
         except Session.DoesNotExist: # Added specific exception handling
              logger.warning(f"Session with ID {session_id} not found during get operation.")
@@ -399,14 +432,18 @@ class SessionRepository:
             return None
 
     def get_all(
-        self, offset: int = 0, limit: int = 10
+        self, offset: int = 0, limit: Optional[int] = 10, include_usage: bool = False
     ) -> tuple[List[SessionModel], int]:
         """
         Get all sessions from the database with pagination support.
 
+        Sessions and their display names (and usage totals, if requested) are
+        fetched with a single query, however many sessions the page holds.
+
         Args:
             offset: Number of sessions to skip (default: 0)
-            limit: Maximum number of sessions to return (default: 10)
+            limit: Maximum number of sessions to return, or None for all (default: 10)
+            include_usage: Whether to fill in per-session cost and token totals (default: False)
 
         Returns:
             tuple: (List[SessionModel], int) containing the list of sessions and the total count
@@ -415,32 +452,24 @@ class SessionRepository:
             # Get total count for pagination info
             total_count = Session.select().count()
 
-            # Get paginated sessions ordered by created_at in descending order (newest first)
-            sessions = list(
-                Session.select()
+            # Get paginated sessions ordered by created_at in descending order (newest first).
+            # The page is picked in an inner query so that SQLite only evaluates the
+            # display name and usage subqueries for the sessions on it.
+            page = (
+                Session.select(Session.id)
                 .order_by(Session.created_at.desc())
                 .offset(offset)
                 .limit(limit)
             )
-
-            # Process sessions and add display_name
-            result = []
-            for session in sessions:
-                model = self._to_model(session)
-                if model is None: continue # Skip if conversion fails
-
-                # Get display name directly
-                display_name = self._get_display_name_for_session(session.id)
-                if display_name:
-                    model.display_name = display_name
-                elif model.command_line:
-                    # Fallback to command line
-                    if len(model.command_line) > 80:
-                        model.display_name = model.command_line[:80] + "..."
-                    else:
-                        model.display_name = model.command_line
-
-                result.append(model)
+            sessions = (
+                self._select_sessions(include_usage=include_usage)
+                .where(Session.id.in_(page))
+                .order_by(Session.created_at.desc())
+            )
+            result = [
+                self._to_session_model(session, include_usage=include_usage)
+                for session in sessions
+            ]
 
             return result, total_count
 
@@ -459,31 +488,13 @@ class SessionRepository:
             List[SessionModel]: List of the most recent sessions
         """
         try:
-            # Get recent sessions
-            sessions = list(
-                Session.select().order_by(Session.created_at.desc()).limit(limit)
+            page = Session.select(Session.id).order_by(Session.created_at.desc()).limit(limit)
+            sessions = (
+                self._select_sessions()
+                .where(Session.id.in_(page))
+                .order_by(Session.created_at.desc())
             )
-
-            # Process sessions and add display_name
-            result = []
-            for session in sessions:
-                model = self._to_model(session)
-                if model is None: continue # Skip if conversion fails
-
-                # Get display name directly
-                display_name = self._get_display_name_for_session(session.id)
-                if display_name:
-                    model.display_name = display_name
-                elif model.command_line:
-                    # Fallback to command line
-                    if len(model.command_line) > 80:
-                        model.display_name = model.command_line[:80] + "..."
-                    else:
-                        model.display_name = model.command_line
-
-                result.append(model)
-
-            return result
+            return [self._to_session_model(session) for session in sessions]
 
         except peewee.DatabaseError as e:
             logger.error(f"Failed to get recent sessions: {str(e)}")
@@ -501,27 +512,9 @@ class SessionRepository:
             Optional[SessionModel]: The most recent session or None if no sessions exist
         """
         try:
-            # Get the most recent session
-            session = Session.select().order_by(Session.created_at.desc()).first()
-            if session is None:
-                return None
-
-            # Convert to model
-            model = self._to_model(session)
-            if model is None: return None # Handle potential conversion failure
-
-            # Get display name directly
-            display_name = self._get_display_name_for_session(session.id)
-            if display_name:
-                model.display_name = display_name
-            elif model.command_line:
-                # Fallback to command line
-                if len(model.command_line) > 80:
-                    model.display_name = model.command_line[:80] + "..."
-                else:
-                    model.display_name = model.command_line
-
-            return model
+            latest = Session.select(Session.id).order_by(Session.created_at.desc()).limit(1)
+            session = self._select_sessions().where(Session.id.in_(latest)).first()
+            return self._to_session_model(session)
 
         except peewee.DatabaseError as e:
             logger.error(f"Failed to get latest session: {str(e)}")
@@ -541,35 +534,3 @@ class SessionRepository:
         except peewee.DatabaseError as e:
             logger.error(f"Failed to get all session IDs: {str(e)}")
             return []
-
-    def _get_display_name_subquery(self):
-        """
-        Create a subquery for computing the display_name field.
-
-        This creates a SQL expression that computes the display_name based on:
-        1. First 80 chars of the oldest human_input content, or
-        2. First 80 chars of command_line if no human_input exists
-
-        Returns:
-            peewee.SQL: The SQL expression for the display_name computation
-        """
-        # Use peewee.SQL to create a raw SQL expression for display_name
-        # We need to use the actual table name "session" instead of any aliases
-        display_name_sql = """
-            COALESCE(
-                (SELECT
-                    CASE
-                        WHEN LENGTH(hi.content) > 80 THEN SUBSTR(hi.content, 1, 80) || '...'
-                        ELSE hi.content
-                    END
-                FROM human_input hi
-                WHERE hi.session_id = t1.id
-                ORDER BY hi.id ASC
-                LIMIT 1),
-                CASE
-                    WHEN LENGTH(t1.command_line) > 80 THEN SUBSTR(t1.command_line, 1, 80) || '...'
-                    ELSE t1.command_line
-                END
-            )
-        """
-        return peewee.SQL(display_name_sql)
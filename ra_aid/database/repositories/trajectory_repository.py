@@ -6,8 +6,9 @@ following the repository pattern for data access abstraction. It handles
 operations for storing and retrieving agent action trajectories.
 """
 
-from typing import Dict, List, Optional, Any, Union, Callable
+from typing import Dict, Iterator, List, Optional, Any, Union, Callable
 import contextvars
+import datetime
 import json
 import logging
 import sys
@@ -17,10 +18,21 @@ import peewee
 from ra_aid.database.models import Trajectory, HumanInput
 from ra_aid.database.pydantic_models import TrajectoryModel
 from ra_aid.database.repositories.session_repository import get_session_repository
+from ra_aid.database.trajectory_writer import (
+    close_trajectory_writer,
+    get_trajectory_writer,
+    open_trajectory_writer,
+)
 from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Default number of records fetched per query when streaming a session's trajectories
+DEFAULT_TRAJECTORY_BATCH_SIZE = 200
+
+# Columns left out of trajectory queries when the caller does not need payloads
+PAYLOAD_FIELDS = ("tool_result", "step_data")
+
 # Create contextvar to hold the TrajectoryRepository instance
 trajectory_repo_var = contextvars.ContextVar("trajectory_repo", default=None)
 
@@ -51,6 +63,7 @@ class TrajectoryRepositoryManager:
             db: Database connection to use (required)
         """
         self.db = db
+        self.repo: Optional["TrajectoryRepository"] = None
 
     def __enter__(self) -> "TrajectoryRepository":
         """
@@ -60,7 +73,10 @@ class TrajectoryRepositoryManager:
             TrajectoryRepository: The initialized repository
         """
         repo = TrajectoryRepository(self.db)
+        if repo.write_behind:
+            open_trajectory_writer(self.db)
         trajectory_repo_var.set(repo)
+        self.repo = repo
         return repo
 
     def __exit__(
@@ -80,6 +96,11 @@ class TrajectoryRepositoryManager:
         # Reset the contextvar to None
         trajectory_repo_var.set(None)
 
+        # The session is over (or crashed): write any queued records before the connection goes away
+        if self.repo is not None and self.repo.write_behind:
+            close_trajectory_writer(self.db)
+        self.repo = None
+
         # Don't suppress exceptions
         return False
 
@@ -115,6 +136,11 @@ class TrajectoryRepository:
     It also supports registering hooks that are executed after a new trajectory record
     is successfully created.
 
+    For file-based databases, records are written behind: create() queues the row
+    on a shared TrajectoryWriter and returns immediately, and the writer thread
+    inserts queued rows in batches and then runs the hooks. Read methods flush
+    the queue first, so they always see every record created before them.
+
     Example:
         with DatabaseManager() as db:
             with TrajectoryRepositoryManager(db) as repo:
@@ -127,17 +153,37 @@ class TrajectoryRepository:
 
     # _create_hooks: List[Callable[[TrajectoryModel], None]] = [] # Removed class variable
 
-    def __init__(self, db):
+    def __init__(self, db, write_behind: Optional[bool] = None):
         """
         Initialize the repository with a database connection.
 
         Args:
             db: Database connection to use (required)
+            write_behind: Whether to queue created records for a background writer.
+                Defaults to None, which enables it for file-based databases only, since
+                the writer thread cannot see another connection's in-memory database.
         """
         if db is None:
             raise ValueError("Database connection is required for TrajectoryRepository")
         self.db = db
         self._create_hooks: List[Callable[[TrajectoryModel], None]] = [] # Initialized instance variable
+        if write_behind is None:
+            write_behind = getattr(db, "_is_in_memory", None) is False
+        self.write_behind = write_behind
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all records queued for writing have been committed.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if nothing is left to write
+        """
+        if not self.write_behind:
+            return True
+        return get_trajectory_writer(self.db).flush(timeout)
 
     def register_create_hook(self, hook: Callable[[TrajectoryModel], None]) -> None: # Changed cls to self
         """
@@ -192,6 +238,9 @@ class TrajectoryRepository:
         """
         Create a new trajectory record in the database and execute registered hooks.
 
+        With write-behind enabled the record is only queued: the returned model has
+        no id yet, and hooks run on the writer thread once the record is committed.
+
         Args:
             tool_name: Optional name of the tool that was executed
             tool_parameters: Optional parameters passed to the tool (will be JSON encoded)
@@ -224,6 +273,24 @@ class TrajectoryRepository:
             )
             step_data_json = json.dumps(step_data) if step_data is not None else None
 
+            if self.write_behind:
+                return self._queue_create(
+                    human_input_id=human_input_id,
+                    session_id=session_id,
+                    tool_name=tool_name or "",
+                    tool_parameters=tool_parameters_json,
+                    tool_result=tool_result_json,
+                    step_data=step_data_json,
+                    record_type=record_type,
+                    current_cost=current_cost,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    is_error=is_error,
+                    error_message=error_message,
+                    error_type=error_type,
+                    error_details=error_details,
+                )
+
             # Create human input reference if provided
             human_input = None
             if human_input_id is not None:
@@ -284,6 +351,36 @@ class TrajectoryRepository:
             logger.error(f"Failed to create trajectory record: {str(e)}")
             raise
 
+    def _queue_create(
+        self, human_input_id: Optional[int], session_id: Optional[int], **fields: Any
+    ) -> TrajectoryModel:
+        """Queue a new record on the trajectory writer and return its (id-less) model."""
+        if not session_id:
+            session_id = get_session_repository().get_current_session_record().get_id()
+
+        now = datetime.datetime.now()
+        row = {
+            "created_at": now,
+            "updated_at": now,
+            "human_input": human_input_id,
+            "session": session_id,
+            **fields,
+        }
+        get_trajectory_writer(self.db).submit(row, hooks=list(self._create_hooks))
+        logger.debug(
+            f"Queued trajectory record for: {fields['tool_name'] or fields['record_type']}"
+        )
+
+        return TrajectoryModel.model_validate(
+            {
+                **fields,
+                "created_at": now,
+                "updated_at": now,
+                "human_input_id": human_input_id,
+                "session_id": session_id,
+            }
+        )
+
 
     def get(self, trajectory_id: int) -> Optional[TrajectoryModel]:
         """
@@ -298,6 +395,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self.flush()
         try:
             trajectory = Trajectory.get_or_none(Trajectory.id == trajectory_id)
             return self._to_model(trajectory)
@@ -341,6 +439,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error updating the record
         """
+        self.flush()
         try:
             # First check if the trajectory exists
             peewee_trajectory = Trajectory.get_or_none(Trajectory.id == trajectory_id)
@@ -406,6 +505,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error deleting the record
         """
+        self.flush()
         try:
             # First check if the trajectory exists
             trajectory = Trajectory.get_or_none(Trajectory.id == trajectory_id)
@@ -433,6 +533,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self.flush()
         try:
             trajectories = Trajectory.select().order_by(Trajectory.id)
             return {                trajectory.id: self._to_model(trajectory) for trajectory in trajectories            }
@@ -455,6 +556,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self.flush()
         try:
             trajectories = list(
                 Trajectory.select()
@@ -493,6 +595,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self.flush()
         try:
             # Use SQL aggregation instead of Python computation
             query = (
@@ -535,12 +638,99 @@ class TrajectoryRepository:
             logger.error(f"Failed to calculate session usage totals: {str(e)}")
             raise
 
-    def get_trajectories_by_session(self, session_id: int) -> List[TrajectoryModel]:
+    def get_usage_totals_by_session(
+        self, since: Optional[datetime.datetime] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Calculate usage totals for every session with a single GROUP BY query.
+
+        Args:
+            since: Only count model usage records created at or after this time
+
+        Returns:
+            Dict[int, Dict[str, Any]]: Totals in the get_session_usage_totals format,
+                keyed by session ID. Sessions without matching usage records are absent.
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        self.flush()
+        try:
+            conditions = (Trajectory.record_type == "model_usage") & (
+                Trajectory.session.is_null(False)
+            )
+            if since is not None:
+                conditions &= Trajectory.created_at >= since
+
+            query = (
+                Trajectory
+                .select(
+                    Trajectory.session.alias('session_id'),
+                    peewee.fn.COALESCE(peewee.fn.SUM(Trajectory.current_cost), 0.0).alias('total_cost'),
+                    peewee.fn.COALESCE(peewee.fn.SUM(Trajectory.input_tokens), 0).alias('total_input_tokens'),
+                    peewee.fn.COALESCE(peewee.fn.SUM(Trajectory.output_tokens), 0).alias('total_output_tokens')
+                )
+                .where(conditions)
+                .group_by(Trajectory.session)
+                .dicts()
+            )
+
+            totals_by_session = {}
+            for row in query:
+                input_tokens = int(row['total_input_tokens'])
+                output_tokens = int(row['total_output_tokens'])
+                totals_by_session[row['session_id']] = {
+                    "total_cost": float(row['total_cost']),
+                    "total_input_tokens": input_tokens,
+                    "total_output_tokens": output_tokens,
+                    "total_tokens": input_tokens + output_tokens,
+                }
+
+            logger.debug(f"Calculated usage totals for {len(totals_by_session)} sessions")
+            return totals_by_session
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to calculate usage totals by session: {str(e)}")
+            raise
+
+    def _session_query(
+        self, session_id: int, after_id: Optional[int], include_payload: bool
+    ) -> peewee.ModelSelect:
+        """Build the select for a session's trajectories, optionally without payload columns."""
+        if include_payload:
+            query = Trajectory.select()
+        else:
+            query = Trajectory.select(
+                *[
+                    field
+                    for field in Trajectory._meta.sorted_fields
+                    if field.name not in PAYLOAD_FIELDS
+                ]
+            )
+        query = query.where(Trajectory.session == session_id)
+        if after_id is not None:
+            query = query.where(Trajectory.id > after_id)
+        return query
+
+    def get_trajectories_by_session(
+        self,
+        session_id: int,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        include_payload: bool = True,
+    ) -> List[TrajectoryModel]:
         """
-        Retrieve all trajectory records associated with a specific session.
+        Retrieve trajectory records associated with a specific session.
+
+        Without after_id or limit every record is returned in creation order. With
+        either of them, records are returned in ID order so that the ID of the last
+        record can be passed as after_id to fetch the next page.
 
         Args:
             session_id: The ID of the session to get trajectories for
+            after_id: Only return records with an ID greater than this
+            limit: Maximum number of records to return
+            include_payload: Whether to load tool_result and step_data; when False
+                they are left as None and their JSON is never parsed
 
         Returns:
             List[TrajectoryModel]: List of trajectory Pydantic models associated with the session
@@ -548,15 +738,57 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self.flush()
         try:
-            trajectories = list(
-                Trajectory.select()
-                .where(Trajectory.session == session_id)
-                .order_by(Trajectory.created_at)
-            )
-            return [self._to_model(trajectory) for trajectory in trajectories]
+            query = self._session_query(session_id, after_id, include_payload)
+            if after_id is None and limit is None:
+                query = query.order_by(Trajectory.created_at)
+            else:
+                query = query.order_by(Trajectory.id)
+                if limit is not None:
+                    query = query.limit(limit)
+            return [self._to_model(trajectory) for trajectory in query]
         except peewee.DatabaseError as e:
             logger.error(
                 f"Failed to fetch trajectories for session {session_id}: {str(e)}"
             )
             raise
+
+    def iter_trajectories_by_session(
+        self,
+        session_id: int,
+        after_id: Optional[int] = None,
+        include_payload: bool = True,
+        batch_size: int = DEFAULT_TRAJECTORY_BATCH_SIZE,
+    ) -> Iterator[List[TrajectoryModel]]:
+        """
+        Iterate over a session's trajectory records in ID order, one batch at a time.
+
+        Each batch is a separate keyset query, so no cursor is held open between
+        batches and memory use is bounded by batch_size.
+
+        Args:
+            session_id: The ID of the session to get trajectories for
+            after_id: Only return records with an ID greater than this
+            include_payload: Whether to load tool_result and step_data
+            batch_size: Number of records fetched per query
+
+        Yields:
+            List[TrajectoryModel]: The next non-empty batch of records
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        while True:
+            batch = self.get_trajectories_by_session(
+                session_id,
+                after_id=after_id,
+                limit=batch_size,
+                include_payload=include_payload,
+            )
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            after_id = batch[-1].id
@@ -0,0 +1,346 @@
+"""
+Write-behind queue for trajectory records.
+
+Nearly every tool call records a trajectory. Instead of running an INSERT and
+a commit inside each call, TrajectoryRepository hands rows to a TrajectoryWriter.
+Its background thread inserts whatever rows are queued in one transaction,
+with multi-row INSERT statements, and then runs the create hooks for them.
+Writers are flushed when their TrajectoryRepositoryManager exits and at
+interpreter exit, so queued records survive both normal and abnormal shutdown.
+"""
+
+import atexit
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import peewee
+
+from ra_aid.database.models import Trajectory
+from ra_aid.database.pydantic_models import TrajectoryModel
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Maximum number of queued records written in one transaction
+DEFAULT_BATCH_SIZE = 200
+
+# Rows per INSERT statement, keeping each statement below SQLite's bound parameter limit
+INSERT_CHUNK_SIZE = 50
+
+# Seconds to wait for queued records to be written on shutdown
+DEFAULT_CLOSE_TIMEOUT = 10.0
+
+
+@dataclass
+class _PendingRecord:
+    """A trajectory row waiting to be inserted, with the hooks to run once it is."""
+
+    row: Dict[str, Any]
+    hooks: Sequence[Callable[[TrajectoryModel], None]]
+
+
+def _row_to_model(row: Dict[str, Any], trajectory_id: Optional[int]) -> TrajectoryModel:
+    """Build a TrajectoryModel from a row as passed to Trajectory.insert_many."""
+    data = {
+        key: value for key, value in row.items() if key not in ("human_input", "session")
+    }
+    data["id"] = trajectory_id
+    data["human_input_id"] = row.get("human_input")
+    data["session_id"] = row.get("session")
+    return TrajectoryModel.model_validate(data)
+
+
+class TrajectoryWriter:
+    """
+    Background writer that inserts trajectory rows in batches.
+
+    Rows are written in submission order. Each batch is every row queued when
+    the writer wakes up (up to batch_size), so batches grow on their own while
+    a commit is in progress and callers never wait for SQLite.
+
+    Example:
+        writer = TrajectoryWriter()
+        writer.submit(row, hooks=[send_broadcast])
+        writer.flush()  # Block until the row is committed
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize the writer and start its thread.
+
+        Args:
+            batch_size: Maximum number of records written in one transaction
+        """
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Optional[_PendingRecord]]" = queue.Queue()
+        self._condition = threading.Condition()
+        self._submitted = 0
+        self._completed = 0
+        self._closed = False
+        self.batches_written = 0
+        self.records_written = 0
+        self.records_failed = 0
+        self._thread = threading.Thread(
+            target=self._run, name="trajectory-writer", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def submit(
+        self,
+        row: Dict[str, Any],
+        hooks: Sequence[Callable[[TrajectoryModel], None]] = (),
+    ) -> None:
+        """
+        Queue a row for insertion.
+
+        Args:
+            row: Field values for Trajectory.insert_many
+            hooks: Callables to run with the created TrajectoryModel after the row is committed
+
+        Raises:
+            RuntimeError: If the writer has been closed
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("TrajectoryWriter is closed")
+            self._submitted += 1
+            self._queue.put(_PendingRecord(row, tuple(hooks)))
+
+    def pending(self) -> int:
+        """Get the number of submitted records not yet written."""
+        with self._condition:
+            return self._submitted - self._completed
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every record submitted so far has been written.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if all records were written, False on timeout
+        """
+        # A create hook that reads trajectories runs on the writer thread itself
+        if threading.current_thread() is self._thread:
+            return self.pending() == 0
+        with self._condition:
+            target = self._submitted
+            return self._condition.wait_for(
+                lambda: self._completed >= target or not self._thread.is_alive(),
+                timeout=timeout,
+            ) and self._completed >= target
+
+    def close(self, timeout: Optional[float] = DEFAULT_CLOSE_TIMEOUT) -> bool:
+        """
+        Write all queued records and stop the writer thread.
+
+        Args:
+            timeout: Maximum seconds to wait for queued records
+
+        Returns:
+            bool: True if all records were written before the thread stopped
+        """
+        with self._condition:
+            if self._closed:
+                return self._completed >= self._submitted
+            self._closed = True
+            self._queue.put(None)
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+        with self._condition:
+            done = self._completed >= self._submitted
+        if not done:
+            logger.warning(
+                f"Trajectory writer closed with {self.pending()} records not written"
+            )
+        return done
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get write counters.
+
+        Returns:
+            Dict with pending, batches_written, records_written and records_failed
+        """
+        return {
+            "pending": self.pending(),
+            "batches_written": self.batches_written,
+            "records_written": self.records_written,
+            "records_failed": self.records_failed,
+        }
+
+    def _run(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                stop = False
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+
+                try:
+                    self._write_batch(batch)
+                except Exception as e:
+                    self.records_failed += len(batch)
+                    logger.error(f"Failed to write trajectory batch: {e}", exc_info=True)
+                finally:
+                    with self._condition:
+                        self._completed += len(batch)
+                        self._condition.notify_all()
+                if stop:
+                    break
+        finally:
+            with self._condition:
+                self._condition.notify_all()
+            try:
+                # Close this thread's connection; other threads keep their own
+                Trajectory._meta.database.close()
+            except Exception:
+                pass
+
+    def _write_batch(self, batch: List[_PendingRecord]) -> None:
+        rows = [record.row for record in batch]
+        db = Trajectory._meta.database
+        try:
+            ids: List[Optional[int]] = []
+            with db.atomic():
+                for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+                    chunk = rows[start : start + INSERT_CHUNK_SIZE]
+                    last_id = Trajectory.insert_many(chunk).execute()
+                    # The write lock is held for the whole statement, so its rowids are consecutive
+                    ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+        except peewee.DatabaseError as e:
+            logger.warning(
+                f"Batch insert of {len(rows)} trajectory records failed, retrying one by one: {e}"
+            )
+            ids = [self._write_one(row) for row in rows]
+
+        self.batches_written += 1
+        for record, trajectory_id in zip(batch, ids):
+            if trajectory_id is None:
+                self.records_failed += 1
+                continue
+            self.records_written += 1
+            if not record.hooks:
+                continue
+            model = _row_to_model(record.row, trajectory_id)
+            for hook in record.hooks:
+                try:
+                    hook(model)
+                except Exception as hook_exc:
+                    logger.error(
+                        f"Error executing trajectory create hook {getattr(hook, '__name__', hook)}: {hook_exc}",
+                        exc_info=True,
+                    )
+
+    def _write_one(self, row: Dict[str, Any]) -> Optional[int]:
+        try:
+            return Trajectory.insert(row).execute()
+        except peewee.IntegrityError as e:
+            if row.get("human_input") is None:
+                logger.error(f"Failed to create trajectory record: {e}")
+                return None
+            # Matches the synchronous path, which drops references to unknown human inputs
+            logger.warning(f"Human input with ID {row['human_input']} not found")
+            row["human_input"] = None
+            return self._write_one(row)
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to create trajectory record: {e}")
+            return None
+
+
+_writers: Dict[int, TrajectoryWriter] = {}
+# Number of open TrajectoryRepositoryManager contexts using each writer. Pooled
+# databases are shared by threads, so one session ending must not stop the writer
+# another session is still using.
+_writer_users: Dict[int, int] = {}
+_writers_lock = threading.Lock()
+
+
+def get_trajectory_writer(db: peewee.Database) -> TrajectoryWriter:
+    """
+    Get the writer for a database connection, starting one if needed.
+
+    Args:
+        db: Database connection the writer belongs to
+
+    Returns:
+        TrajectoryWriter: The running writer for db
+    """
+    with _writers_lock:
+        writer = _writers.get(id(db))
+        if writer is None or writer.closed:
+            writer = TrajectoryWriter()
+            _writers[id(db)] = writer
+        return writer
+
+
+def open_trajectory_writer(db: peewee.Database) -> TrajectoryWriter:
+    """
+    Register a user of the writer for a database connection, starting it if needed.
+
+    Each call must be matched by a call to close_trajectory_writer.
+
+    Args:
+        db: Database connection the writer belongs to
+
+    Returns:
+        TrajectoryWriter: The running writer for db
+    """
+    writer = get_trajectory_writer(db)
+    with _writers_lock:
+        _writer_users[id(db)] = _writer_users.get(id(db), 0) + 1
+    return writer
+
+
+def close_trajectory_writer(db: peewee.Database) -> None:
+    """
+    Write all queued records for a database connection and, once its last
+    user is gone, stop its writer.
+
+    Args:
+        db: Database connection whose writer should be closed
+    """
+    with _writers_lock:
+        users = max(_writer_users.get(id(db), 0) - 1, 0)
+        if users:
+            _writer_users[id(db)] = users
+            writer = _writers.get(id(db))
+        else:
+            _writer_users.pop(id(db), None)
+            writer = _writers.pop(id(db), None)
+    if writer is None:
+        return
+    if users:
+        writer.flush(DEFAULT_CLOSE_TIMEOUT)
+    else:
+        writer.close()
+
+
+def close_all_trajectory_writers() -> None:
+    """Write all queued records and stop every writer. Registered to run at exit."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+        _writer_users.clear()
+    for writer in writers:
+        writer.close()
+
+
+atexit.register(close_all_trajectory_writers)
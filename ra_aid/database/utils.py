@@ -5,7 +5,8 @@ This module provides utility functions for common database operations.
 """
 
 import inspect
-from typing import List, Type
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
 import peewee
 
@@ -96,3 +97,115 @@ def truncate_table(model_class: Type[BaseModel]) -> None:
     except peewee.DatabaseError as e:
         logger.error(f"Database Error: Failed to truncate table: {str(e)}")
         raise
+
+
+def select_session_window(
+    model_class: Type[BaseModel],
+    session_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    oldest: bool = False,
+) -> List[BaseModel]:
+    """
+    Select records of a table with a session foreign key, in id order.
+
+    Args:
+        model_class: Model class with a session field
+        session_id: Only return records of this session
+        limit: Only return the most recent records, still in id order
+        oldest: Return the oldest limit records instead of the most recent
+
+    Returns:
+        List[BaseModel]: The selected records
+    """
+    query = model_class.select()
+    if session_id is not None:
+        query = query.where(model_class.session == session_id)
+    if limit is None or oldest:
+        query = query.order_by(model_class.id)
+        return list(query if limit is None else query.limit(limit))
+    # Read the window newest first so the index scan stops after limit rows
+    return list(query.order_by(model_class.id.desc()).limit(limit))[::-1]
+
+
+def get_current_session_id() -> Optional[int]:
+    """
+    Get the id of the session new records belong to.
+
+    Returns:
+        Optional[int]: The current session id, or None if there is no session repository or session
+    """
+    from ra_aid.database.repositories.session_repository import get_session_repository
+
+    try:
+        return get_session_repository().get_current_session_id()
+    except RuntimeError:
+        return None
+
+
+class TableGeneration:
+    """
+    Process-wide write counter for a table.
+
+    A repository bumps the counter after every create, update and delete, so
+    values cached from the table by any repository instance can tell they are stale.
+    """
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def bump(self) -> None:
+        with self._lock:
+            self.value += 1
+
+
+def _table_fingerprint(db: peewee.Database, model_class: Type[BaseModel]) -> Optional[Tuple[int, int]]:
+    """
+    Cheap summary of a table that changes when rows are added or removed by another connection.
+
+    MAX(id) is read from the rowid b-tree and COUNT(*) from the smallest index,
+    so writes to other tables, such as trajectory records, leave it unchanged.
+    """
+    table = model_class._meta.table_name
+    try:
+        return tuple(db.execute_sql(f'SELECT MAX(id), COUNT(*) FROM "{table}"').fetchone())
+    except Exception:
+        return None
+
+
+class GenerationCache:
+    """
+    Memoizes values derived from a table until the table is written to.
+
+    A cached value is rebuilt once the table's TableGeneration has moved on, or
+    once the table's row count or highest id changes, which catches records
+    created or deleted by another process. Edits made by another process to
+    existing rows are picked up with its next create or delete.
+
+    Example:
+        cache = GenerationCache(db, _key_fact_generation, KeyFact)
+        formatted = cache.get("formatted", lambda: format_key_facts_dict(repo.get_facts_dict()))
+    """
+
+    def __init__(self, db: peewee.Database, generation: TableGeneration, model_class: Type[BaseModel]):
+        self.db = db
+        self.generation = generation
+        self.model_class = model_class
+        self._values: Dict[str, Tuple[Any, Any]] = {}
+
+    def get(self, name: str, build: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for name, calling build() if the table changed since it was cached.
+
+        Args:
+            name: Cache slot
+            build: Computes the value from the table
+        """
+        # Taken before building so a write during build() invalidates the result
+        key = (self.generation.value, _table_fingerprint(self.db, self.model_class))
+        cached = self._values.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        value = build()
+        self._values[name] = (key, value)
+        return value
@@ -1,11 +1,34 @@
+import json
 import os
 import platform
 import shutil
 import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Discovery results are cached in the project state directory (.ra-aid) and
+# reused while PATH, the PATH and include directories, and every executable that
+# was found are unchanged, for at most ENV_INVENTORY_CACHE_TTL seconds.
+ENV_INVENTORY_CACHE_FILE = "env_inventory.json"
+ENV_INVENTORY_CACHE_TTL = 60 * 60
+_CACHE_FORMAT = 1
+
+# Upper bound on threads running which/--version/pkg-config probes. The pool is
+# also capped at the CPU count: the probes have wall-clock timeouts, and
+# CPU-bound ones (pyenv shims, pkg-config on large .pc graphs) miss them when
+# they outnumber the cores.
+MAX_PROBE_WORKERS = 16
+
+
 class EnvDiscovery:
-    def __init__(self):
+    def __init__(self, cache_dir=None, cache_ttl=ENV_INVENTORY_CACHE_TTL):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.cwd() / ".ra-aid"
+        self.cache_ttl = cache_ttl
+        self._pool = None
+        # Executables found by _which, fingerprinted when results are cached.
+        self._tool_paths = set()
         # Structured results dictionary.
         self.results = {
             "os": {},
@@ -221,15 +244,113 @@ class EnvDiscovery:
             pass
         return distro
 
-    def discover(self):
-        self._detect_os()
-        self._detect_cli_tools()
+    def discover(self, use_cache=True):
+        if use_cache:
+            cached = self._load_cache()
+            if cached is not None:
+                self.results = cached
+                return self.results
+        detectors = [
+            self._detect_os,
+            self._detect_cli_tools,
+            self._detect_python_environments,
+            self._detect_package_managers,
+            self._detect_libraries,
+            self._detect_node,
+        ]
+        # Detectors run side by side and fan their subprocess probes out to a
+        # shared pool. The pools are separate so a detector waiting on its probes
+        # never holds a probe worker.
+        probe_workers = min(MAX_PROBE_WORKERS, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=probe_workers) as pool, \
+                ThreadPoolExecutor(max_workers=len(detectors)) as detector_pool:
+            self._pool = pool
+            try:
+                for future in [detector_pool.submit(detector) for detector in detectors]:
+                    future.result()
+            finally:
+                self._pool = None
+        if use_cache:
+            self._save_cache()
+        return self.results
+
+    def _map(self, fn, items):
+        if self._pool is None:
+            return [fn(item) for item in items]
+        return list(self._pool.map(fn, items))
+
+    def _which(self, name):
+        path = shutil.which(name)
+        if path:
+            self._tool_paths.add(path)
+        return path
+
+    def _cache_path(self):
+        return self.cache_dir / ENV_INVENTORY_CACHE_FILE
+
+    def _fingerprint(self, tool_paths):
+        def mtimes(paths):
+            stamps = {}
+            for path in paths:
+                try:
+                    stamps[str(path)] = os.stat(path).st_mtime_ns
+                except OSError:
+                    stamps[str(path)] = None
+            return stamps
+
+        path_env = os.environ.get("PATH", "")
+        # Installing or removing a tool changes its PATH directory; upgrading one
+        # in place changes the executable itself.
+        dirs = [d for d in path_env.split(os.pathsep) if d] + [str(p) for p in self._include_paths]
+        return {
+            "path": path_env,
+            "dirs": mtimes(dirs),
+            "tools": mtimes(sorted(tool_paths)),
+        }
+
+    def _load_cache(self):
+        try:
+            with open(self._cache_path()) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("format") != _CACHE_FORMAT:
+            return None
+        age = time.time() - data.get("created", 0)
+        if age < 0 or age > self.cache_ttl:
+            return None
+        fingerprint = data.get("fingerprint") or {}
+        if fingerprint != self._fingerprint(fingerprint.get("tools") or {}):
+            return None
+        return data.get("results")
+
+    def _save_cache(self):
+        # The state directory is created by DatabaseManager; never create it here.
+        if not self.cache_dir.is_dir():
+            return
+        data = {
+            "format": _CACHE_FORMAT,
+            "created": time.time(),
+            "fingerprint": self._fingerprint(self._tool_paths),
+            "results": self.results,
+        }
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".env_inventory.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f)
+                # Concurrent spawns may write at the same time; readers only ever see a whole file
+                os.replace(tmp_path, self._cache_path())
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
+
+    def _detect_python_environments(self):
+        # venv availability is derived from the installations, so these run in order
         self._detect_python()
         self._detect_python_env_tools()
-        self._detect_package_managers()
-        self._detect_libraries()
-        self._detect_node()
-        return self.results
 
     def _detect_os(self):
         os_type = platform.system()
@@ -261,28 +382,29 @@ class EnvDiscovery:
         self.results["os"] = os_info
 
     def _detect_cli_tools(self):
-        tools_found = {}
-        for tool in self._cli_tool_names:
-            path = shutil.which(tool)
-            if path:
-                version = None
-                if tool in ("g++", "gcc", "clang", "git"):
-                    try:
-                        out = subprocess.check_output([tool, "--version"], text=True, stderr=subprocess.STDOUT, timeout=1)
-                        version = out.splitlines()[0].strip()
-                    except Exception:
-                        version = None
-                tools_found[tool] = {"found": True}
-                if version:
-                    tools_found[tool]["version"] = version
-            else:
-                tools_found[tool] = {"found": False}
-        self.results["cli_tools"] = tools_found
+        def probe(tool):
+            path = self._which(tool)
+            if not path:
+                return {"found": False}
+            version = None
+            if tool in ("g++", "gcc", "clang", "git"):
+                try:
+                    out = subprocess.check_output([tool, "--version"], text=True, stderr=subprocess.STDOUT, timeout=1)
+                    version = out.splitlines()[0].strip()
+                except Exception:
+                    version = None
+            status = {"found": True}
+            if version:
+                status["version"] = version
+            return status
+
+        statuses = self._map(probe, self._cli_tool_names)
+        self.results["cli_tools"] = dict(zip(self._cli_tool_names, statuses))
 
     def _detect_python(self):
         installations = []
         if platform.system() == "Windows":
-            launcher = shutil.which("py")
+            launcher = self._which("py")
             if launcher:
                 try:
                     out = subprocess.check_output([launcher, "-0p"], text=True, timeout=2)
@@ -300,11 +422,11 @@ class EnvDiscovery:
             if not installations:
                 try:
                     out = subprocess.check_output(["where", "python"], text=True, timeout=2)
-                    for path in out.splitlines():
-                        path = path.strip()
-                        if path and Path(path).name.lower().startswith("python"):
-                            ver = self._get_python_version(path)
-                            installations.append({"version": ver, "path": path})
+                    paths = [path.strip() for path in out.splitlines()]
+                    paths = [path for path in paths if path and Path(path).name.lower().startswith("python")]
+                    self._tool_paths.update(paths)
+                    for path, ver in zip(paths, self._map(self._get_python_version, paths)):
+                        installations.append({"version": ver, "path": path})
                 except Exception:
                     pass
         else:
@@ -312,13 +434,12 @@ class EnvDiscovery:
             for major in [2, 3]:
                 for minor in range(0, 15):
                     common_names.append(f"python{major}.{minor}")
-            seen_paths = set()
-            for name in common_names:
-                path = shutil.which(name)
-                if path and path not in seen_paths:
-                    seen_paths.add(path)
-                    ver = self._get_python_version(path)
-                    installations.append({"version": ver, "path": path})
+            paths = []
+            for path in self._map(self._which, common_names):
+                if path and path not in paths:
+                    paths.append(path)
+            for path, ver in zip(paths, self._map(self._get_python_version, paths)):
+                installations.append({"version": ver, "path": path})
 
         installations = sorted(installations, key=lambda x: x.get("version", "") or "")
         self.results["python"]["installations"] = installations
@@ -336,31 +457,36 @@ class EnvDiscovery:
         venv_available = any(inst for inst in self.results["python"]["installations"]
                              if inst.get("version") and inst["version"][0] == '3')
         env_tools_status["venv"] = {"available": venv_available, "built_in": True}
-        for tool, display_name in self._py_env_tools.items():
-            found_path = shutil.which(tool)
-            if found_path:
+
+        def probe(tool):
+            found_path = self._which(tool)
+            if not found_path:
+                return {"installed": False}
+            version = None
+            try:
+                if tool == "pyenv":
+                    out = subprocess.check_output([tool, "--version"], text=True, timeout=1)
+                    version = out.strip().split()[-1]
+                elif tool in ("pipenv", "poetry", "conda", "pipx", "uv"):
+                    out = subprocess.check_output([tool, "--version"], text=True, timeout=2)
+                    version = out.strip().split()[-1]
+                elif tool == "virtualenv":
+                    out = subprocess.check_output([tool, "--version"], text=True, timeout=2)
+                    version = out.strip()
+            except Exception:
                 version = None
-                try:
-                    if tool == "pyenv":
-                        out = subprocess.check_output([tool, "--version"], text=True, timeout=1)
-                        version = out.strip().split()[-1]
-                    elif tool in ("pipenv", "poetry", "conda", "pipx", "uv"):
-                        out = subprocess.check_output([tool, "--version"], text=True, timeout=2)
-                        version = out.strip().split()[-1]
-                    elif tool == "virtualenv":
-                        out = subprocess.check_output([tool, "--version"], text=True, timeout=2)
-                        version = out.strip()
-                except Exception:
-                    version = None
-                env_tools_status[display_name] = {"installed": True}
-                if version:
-                    env_tools_status[display_name]["version"] = version
-            else:
-                env_tools_status[display_name] = {"installed": False}
+            status = {"installed": True}
+            if version:
+                status["version"] = version
+            return status
+
+        tools = list(self._py_env_tools)
+        for tool, status in zip(tools, self._map(probe, tools)):
+            env_tools_status[self._py_env_tools[tool]] = status
         self.results["python"]["env_tools"] = env_tools_status
 
     def _detect_package_managers(self):
-        pkg_status = {}
+        managers = []
         for mgr in self._package_managers:
             if platform.system() == "Windows":
                 if mgr in ("apt", "apt-get", "dnf", "yum", "pacman", "paru", "zypper", "brew"):
@@ -383,8 +509,11 @@ class EnvDiscovery:
                     if distro_id in ("opensuse", "suse"):
                         if mgr in ("apt", "apt-get", "dnf", "yum", "pacman", "paru"):
                             continue
-            path = shutil.which(mgr)
-            pkg_status[mgr] = {"found": bool(path)}
+            managers.append(mgr)
+
+        def probe(mgr):
+            path = self._which(mgr)
+            status = {"found": bool(path)}
             if path:
                 version = None
                 try:
@@ -399,13 +528,16 @@ class EnvDiscovery:
                 except Exception:
                     version = None
                 if version:
-                    pkg_status[mgr]["version"] = version
-        self.results["package_managers"] = pkg_status
+                    status["version"] = version
+            return status
+
+        self.results["package_managers"] = dict(zip(managers, self._map(probe, managers)))
 
     def _detect_libraries(self):
-        libs_found = {}
-        have_pkg_config = bool(shutil.which("pkg-config"))
-        for lib, info in self._libraries.items():
+        have_pkg_config = bool(self._which("pkg-config"))
+
+        def probe(lib):
+            info = self._libraries[lib]
             lib_info = {"found": False}
             found = False
             ver = None
@@ -439,7 +571,7 @@ class EnvDiscovery:
                         ).strip()
                     except Exception:
                         libs_flags = None
-                except subprocess.CalledProcessError:
+                except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
                     found = False
             if not found and info.get("headers"):
                 for header in info["headers"]:
@@ -457,33 +589,27 @@ class EnvDiscovery:
                 lib_info["libs"] = libs_flags
             if header_paths:
                 lib_info["header_paths"] = header_paths
-            libs_found[lib] = lib_info
-        self.results["libraries"] = libs_found
+            return lib_info
+
+        libs = list(self._libraries)
+        self.results["libraries"] = dict(zip(libs, self._map(probe, libs)))
 
     def _detect_node(self):
-        node_info = {}
-        node_path = shutil.which("node")
-        if node_path:
-            try:
-                out = subprocess.check_output(["node", "--version"], text=True, timeout=1)
-                node_info["node_version"] = out.strip()
-            except Exception:
-                node_info["node_version"] = "found"
-        else:
-            node_info["node_version"] = None
-        npm_path = shutil.which("npm")
-        if npm_path:
+        def probe(tool):
+            if not self._which(tool):
+                return None
             try:
-                out = subprocess.check_output(["npm", "--version"], text=True, timeout=1)
-                node_info["npm_version"] = out.strip()
+                out = subprocess.check_output([tool, "--version"], text=True, timeout=1)
+                return out.strip()
             except Exception:
-                node_info["npm_version"] = "found"
-        else:
-            node_info["npm_version"] = None
+                return "found"
+
+        node_info = {}
+        node_info["node_version"], node_info["npm_version"] = self._map(probe, ["node", "npm"])
         nvm_installed = False
         nvm_version = None
         if platform.system() == "Windows":
-            if shutil.which("nvm"):
+            if self._which("nvm"):
                 nvm_installed = True
                 try:
                     out = subprocess.check_output(["nvm", "version"], text=True, timeout=2)
@@ -1,8 +1,10 @@
 """Custom exceptions for RA.Aid."""
 
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from langchain_core.messages import BaseMessage
+if TYPE_CHECKING:
+    # Only used in annotations; keeps langchain out of the database layer's imports
+    from langchain_core.messages import BaseMessage
 
 
 class AgentInterrupt(Exception):
@@ -25,7 +27,7 @@ class ToolExecutionError(Exception):
     def __init__(
         self,
         message: str,
-        base_message: Optional[BaseMessage] = None,
+        base_message: Optional["BaseMessage"] = None,
         tool_name: Optional[str] = None,
     ):
         super().__init__(message)
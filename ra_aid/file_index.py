@@ -0,0 +1,297 @@
+"""In-process index of project files shared by file listing, fuzzy find and project info."""
+
+import itertools
+import os
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from ra_aid.file_listing import (
+    apply_exclude_patterns,
+    filter_git_files,
+    list_git_files,
+    scan_project_files,
+)
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Maximum age of a snapshot before it is rebuilt even if the git index is unchanged.
+# Untracked files created outside the agent's own tools do not touch the git index.
+DEFAULT_MAX_AGE_SECONDS = 60.0
+
+
+def get_git_dir(directory: str) -> Optional[str]:
+    """Get the absolute git directory for a path, or None if it is not in a git repository.
+
+    Args:
+        directory: Path to check
+
+    Returns:
+        Optional[str]: Absolute path of the git directory, or None
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--absolute-git-dir"],
+            cwd=directory,
+            capture_output=True,
+            text=True,
+        )
+    except Exception:
+        return None
+
+    git_dir = result.stdout.strip() if isinstance(result.stdout, str) else ""
+    if result.returncode != 0 or not git_dir or not os.path.isabs(git_dir):
+        return None
+    return git_dir
+
+
+def get_git_signature(git_dir: str) -> Optional[Tuple[int, int]]:
+    """Get a cheap freshness signature for a git repository.
+
+    The signature changes whenever git rewrites its index (add, commit, checkout,
+    reset, ...) or moves HEAD.
+
+    Args:
+        git_dir: Absolute path of the git directory
+
+    Returns:
+        Optional[Tuple[int, int]]: mtimes of the index and HEAD, or None if unavailable
+    """
+    try:
+        index_mtime = os.stat(os.path.join(git_dir, "index")).st_mtime_ns
+    except FileNotFoundError:
+        # A freshly initialised repository has no index yet
+        index_mtime = 0
+    except OSError:
+        return None
+    try:
+        head_mtime = os.stat(os.path.join(git_dir, "HEAD")).st_mtime_ns
+    except OSError:
+        return None
+    return index_mtime, head_mtime
+
+
+@dataclass
+class _Snapshot:
+    """Files of one project directory as listed by git at a point in time."""
+
+    root: str
+    git_dir: str
+    signature: Tuple[int, int]
+    files: Set[str]
+    # Unique per build; revision counts incremental changes to files since then
+    serial: int = 0
+    revision: int = 0
+    built_at: float = field(default_factory=time.monotonic)
+    query_cache: Dict[tuple, List[str]] = field(default_factory=dict)
+
+    def query(
+        self, include_hidden: bool, exclude_patterns: Optional[List[str]]
+    ) -> List[str]:
+        key = (include_hidden, tuple(exclude_patterns or ()))
+        result = self.query_cache.get(key)
+        if result is None:
+            result = sorted(
+                apply_exclude_patterns(
+                    filter_git_files(self.files, include_hidden), exclude_patterns
+                )
+            )
+            self.query_cache[key] = result
+        return list(result)
+
+
+class FileIndex:
+    """Session-wide cache of project file listings.
+
+    Git repositories are listed once and reused until the git index or HEAD
+    changes, the snapshot is older than max_age, or it is invalidated. Files
+    written by the agent's own tools are added incrementally through
+    record_file_written. Directories that are not git repositories are not
+    cached, since there is no cheap way to tell when they change.
+    """
+
+    def __init__(self, max_age: Optional[float] = DEFAULT_MAX_AGE_SECONDS):
+        self.max_age = max_age
+        self._snapshots: Dict[str, _Snapshot] = {}
+        self._lock = threading.RLock()
+        self._serials = itertools.count(1)
+        self.hits = 0
+        self.builds = 0
+
+    def _is_fresh(self, snapshot: _Snapshot) -> bool:
+        if (
+            self.max_age is not None
+            and time.monotonic() - snapshot.built_at > self.max_age
+        ):
+            return False
+        return get_git_signature(snapshot.git_dir) == snapshot.signature
+
+    def get_files(
+        self,
+        directory: str,
+        include_hidden: bool = False,
+        exclude_patterns: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Get all project files, using the cached snapshot when it is fresh.
+
+        Args:
+            directory: Path to the directory
+            include_hidden: Whether to include hidden files (starting with .) in the results
+            exclude_patterns: Optional list of patterns to exclude from the results
+
+        Returns:
+            List[str]: Sorted list of file paths relative to the directory
+
+        Raises:
+            DirectoryNotFoundError: If directory does not exist
+            DirectoryAccessError: If directory cannot be accessed
+            GitCommandError: If git command fails
+            FileListerError: For other unexpected errors
+        """
+        root = os.path.abspath(directory)
+
+        with self._lock:
+            snapshot = self._snapshots.get(root)
+            if snapshot is not None and self._is_fresh(snapshot):
+                self.hits += 1
+                return snapshot.query(include_hidden, exclude_patterns)
+
+        if not os.path.isdir(directory):
+            return scan_project_files(directory, include_hidden, exclude_patterns)
+
+        git_dir = get_git_dir(directory)
+        # Take the signature before listing so changes made while listing invalidate it
+        signature = get_git_signature(git_dir) if git_dir else None
+        if signature is None:
+            with self._lock:
+                self._snapshots.pop(root, None)
+            return scan_project_files(directory, include_hidden, exclude_patterns)
+
+        snapshot = _Snapshot(
+            root=root,
+            git_dir=git_dir,
+            signature=signature,
+            files=set(list_git_files(directory)),
+        )
+        with self._lock:
+            snapshot.serial = next(self._serials)
+            self._snapshots[root] = snapshot
+            self.builds += 1
+            logger.debug(f"Indexed {len(snapshot.files)} files in {root}")
+            return snapshot.query(include_hidden, exclude_patterns)
+
+    def record_file_written(self, filepath: str) -> None:
+        """Add a file the agent created or modified to every snapshot containing it.
+
+        Files ignored by git are not added, matching what a full rebuild would list.
+
+        Args:
+            filepath: Path of the written file, absolute or relative to the working directory
+        """
+        path = os.path.abspath(filepath)
+        with self._lock:
+            for snapshot in list(self._snapshots.values()):
+                rel_path = self._relative_path(snapshot, path)
+                if rel_path is None or rel_path in snapshot.files:
+                    continue
+                if self._is_ignored(snapshot, rel_path):
+                    continue
+                snapshot.files.add(rel_path)
+                snapshot.revision += 1
+                snapshot.query_cache.clear()
+
+    def record_file_removed(self, filepath: str) -> None:
+        """Remove a deleted file from every snapshot containing it.
+
+        Args:
+            filepath: Path of the removed file, absolute or relative to the working directory
+        """
+        path = os.path.abspath(filepath)
+        with self._lock:
+            for snapshot in self._snapshots.values():
+                rel_path = self._relative_path(snapshot, path)
+                if rel_path is not None and rel_path in snapshot.files:
+                    snapshot.files.discard(rel_path)
+                    snapshot.revision += 1
+                    snapshot.query_cache.clear()
+
+    def get_version(self, directory: str) -> Optional[Tuple[int, int]]:
+        """Identify the current listing of a directory without listing it.
+
+        The version changes whenever the snapshot is rebuilt or a written or
+        removed file is recorded, so values derived from a listing can be reused
+        while it stays the same.
+
+        Args:
+            directory: Path to the directory
+
+        Returns:
+            Optional[Tuple[int, int]]: Snapshot serial and revision, or None if the
+                directory has no fresh snapshot
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(os.path.abspath(directory))
+            if snapshot is None or not self._is_fresh(snapshot):
+                return None
+            return snapshot.serial, snapshot.revision
+
+    def invalidate(self, directory: Optional[str] = None) -> None:
+        """Drop the snapshot for a directory, or all snapshots if no directory is given.
+
+        Args:
+            directory: Optional directory whose snapshot should be dropped
+        """
+        with self._lock:
+            if directory is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(os.path.abspath(directory), None)
+
+    def stats(self) -> Dict[str, int]:
+        """Get snapshot and reuse counters.
+
+        Returns:
+            Dict with snapshots, files, hits and builds
+        """
+        with self._lock:
+            return {
+                "snapshots": len(self._snapshots),
+                "files": sum(len(s.files) for s in self._snapshots.values()),
+                "hits": self.hits,
+                "builds": self.builds,
+            }
+
+    @staticmethod
+    def _relative_path(snapshot: _Snapshot, path: str) -> Optional[str]:
+        if not path.startswith(snapshot.root + os.sep):
+            return None
+        return os.path.relpath(path, snapshot.root).replace(os.sep, "/")
+
+    @staticmethod
+    def _is_ignored(snapshot: _Snapshot, rel_path: str) -> bool:
+        try:
+            result = subprocess.run(
+                ["git", "check-ignore", "-q", "--", rel_path],
+                cwd=snapshot.root,
+                capture_output=True,
+            )
+        except Exception:
+            return False
+        return result.returncode == 0
+
+
+_file_index: Optional[FileIndex] = None
+_file_index_lock = threading.Lock()
+
+
+def get_file_index() -> FileIndex:
+    """Get the process-wide file index, creating it on first use."""
+    global _file_index
+    if _file_index is None:
+        with _file_index_lock:
+            if _file_index is None:
+                _file_index = FileIndex()
+    return _file_index
@@ -1,9 +1,10 @@
 """Module for efficient file listing using git."""
 
 import os
+import re
 import subprocess
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 import fnmatch
 
 
@@ -71,20 +72,120 @@ def is_git_repo(directory: str) -> bool:
         raise FileListerError(f"Error checking git repository: {e}")
 
 
-def get_all_project_files(
+def list_git_files(directory: str) -> List[str]:
+    """
+    List tracked and untracked (non-ignored) files in a git repository.
+
+    No filtering is applied beyond skipping blank lines, so hidden files are included.
+
+    Args:
+        directory: Path to the git repository (or a directory inside it)
+
+    Returns:
+        List[str]: File paths relative to the directory, in git output order
+
+    Raises:
+        GitCommandError: If git command fails
+        DirectoryAccessError: If directory cannot be accessed
+    """
+    try:
+        # Get both tracked and untracked files
+        tracked_files_process = subprocess.run(
+            ["git", "ls-files"],
+            cwd=directory,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        untracked_files_process = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard"],
+            cwd=directory,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise GitCommandError(f"Git command failed: {e}")
+    except PermissionError as e:
+        raise DirectoryAccessError(f"Permission denied: {e}")
+
+    files = []
+    for file in (
+        tracked_files_process.stdout.splitlines()
+        + untracked_files_process.stdout.splitlines()
+    ):
+        file = file.strip()
+        if file:
+            files.append(file)
+    return files
+
+
+def filter_git_files(files: Iterable[str], include_hidden: bool = False) -> List[str]:
+    """
+    Apply the hidden file and .aider rules to paths listed by git.
+
+    Args:
+        files: File paths relative to the repository directory
+        include_hidden: Whether to include hidden files (starting with .) in the results
+
+    Returns:
+        List[str]: The files that pass the filters
+    """
+    filtered = []
+    for file in files:
+        # Skip hidden files unless explicitly included
+        if not include_hidden and (
+            file.startswith(".")
+            or any(part.startswith(".") for part in file.split("/"))
+        ):
+            continue
+        # Skip .aider files
+        if ".aider" in file:
+            continue
+        filtered.append(file)
+    return filtered
+
+
+def apply_exclude_patterns(
+    files: Iterable[str], exclude_patterns: Optional[List[str]] = None
+) -> List[str]:
+    """
+    Remove files matching any of the given fnmatch patterns.
+
+    Args:
+        files: File paths to filter
+        exclude_patterns: Optional list of patterns to exclude from the results
+
+    Returns:
+        List[str]: The files that match none of the patterns
+    """
+    if not exclude_patterns:
+        return list(files)
+
+    # One combined regex is much faster than calling fnmatch once per pattern and file
+    combined = re.compile(
+        "|".join(
+            fnmatch.translate(os.path.normcase(pattern))
+            for pattern in exclude_patterns
+        )
+    )
+    return [f for f in files if not combined.match(os.path.normcase(f))]
+
+
+def scan_project_files(
     directory: str, include_hidden: bool = False, exclude_patterns: Optional[List[str]] = None
 ) -> List[str]:
     """
-    Get a list of all files in a project directory, handling both git and non-git repositories.
-    
+    List all files in a project directory without using the file index.
+
     Args:
         directory: Path to the directory
         include_hidden: Whether to include hidden files (starting with .) in the results
         exclude_patterns: Optional list of patterns to exclude from the results
-        
+
     Returns:
-        List[str]: List of file paths relative to the directory
-        
+        List[str]: Sorted list of file paths relative to the directory
+
     Raises:
         DirectoryNotFoundError: If directory does not exist
         DirectoryAccessError: If directory cannot be accessed
@@ -110,46 +211,7 @@ def get_all_project_files(
     all_files = []
     
     if is_git:
-        # Get list of files from git ls-files
-        try:
-            # Get both tracked and untracked files
-            tracked_files_process = subprocess.run(
-                ["git", "ls-files"],
-                cwd=directory,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            untracked_files_process = subprocess.run(
-                ["git", "ls-files", "--others", "--exclude-standard"],
-                cwd=directory,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-        except subprocess.CalledProcessError as e:
-            raise GitCommandError(f"Git command failed: {e}")
-        except PermissionError as e:
-            raise DirectoryAccessError(f"Permission denied: {e}")
-
-        # Combine and process the files
-        for file in (
-            tracked_files_process.stdout.splitlines()
-            + untracked_files_process.stdout.splitlines()
-        ):
-            file = file.strip()
-            if not file:
-                continue
-            # Skip hidden files unless explicitly included
-            if not include_hidden and (
-                file.startswith(".")
-                or any(part.startswith(".") for part in file.split("/"))
-            ):
-                continue
-            # Skip .aider files
-            if ".aider" in file:
-                continue
-            all_files.append(file)
+        all_files = filter_git_files(list_git_files(directory), include_hidden)
     else:
         # Not a git repository, use manual file listing
         base_path = Path(directory)
@@ -190,14 +252,42 @@ def get_all_project_files(
             raise DirectoryAccessError(f"Permission denied while walking directory {directory}: {e}")
     
     # Apply additional exclude patterns if specified
-    if exclude_patterns:
-        for pattern in exclude_patterns:
-            all_files = [f for f in all_files if not fnmatch.fnmatch(f, pattern)]
+    all_files = apply_exclude_patterns(all_files, exclude_patterns)
             
     # Remove duplicates and sort
     return sorted(set(all_files))
 
 
+def get_all_project_files(
+    directory: str, include_hidden: bool = False, exclude_patterns: Optional[List[str]] = None
+) -> List[str]:
+    """
+    Get a list of all files in a project directory, handling both git and non-git repositories.
+
+    Git repositories are served from the session file index, which lists the
+    repository once and reuses the result until the git index changes.
+    
+    Args:
+        directory: Path to the directory
+        include_hidden: Whether to include hidden files (starting with .) in the results
+        exclude_patterns: Optional list of patterns to exclude from the results
+        
+    Returns:
+        List[str]: List of file paths relative to the directory
+        
+    Raises:
+        DirectoryNotFoundError: If directory does not exist
+        DirectoryAccessError: If directory cannot be accessed
+        GitCommandError: If git command fails
+        FileListerError: For other unexpected errors
+    """
+    from ra_aid.file_index import get_file_index
+
+    return get_file_index().get_files(
+        directory, include_hidden=include_hidden, exclude_patterns=exclude_patterns
+    )
+
+
 def get_file_listing(
     directory: str, limit: Optional[int] = None, include_hidden: bool = False
 ) -> Tuple[List[str], int]:
@@ -0,0 +1,206 @@
+"""Fuzzy path matching engine used by fuzzy_find_project_files.
+
+Scoring uses rapidfuzz's C implementation of WRatio on preprocessed strings.
+Large candidate lists are first narrowed with a trigram index over path
+components, and only the candidates sharing the most trigrams with the search
+term are scored. When numpy is available the survivors are scored in one
+batch with process.cdist across worker threads.
+"""
+
+import heapq
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Candidate lists smaller than this are scored in full without prefiltering
+PREFILTER_MIN_CHOICES = 20000
+
+# Minimum number of prefiltered candidates to score, and multiple of the result limit
+PREFILTER_MIN_CANDIDATES = 2000
+PREFILTER_CANDIDATES_PER_RESULT = 200
+
+
+def _trigrams(token: str) -> List[str]:
+    return [token[i : i + 3] for i in range(len(token) - 2)]
+
+
+class FuzzyMatcher:
+    """Scores a fixed list of choices against search terms.
+
+    Preprocessing and the trigram index are built once per matcher, so reusing
+    a matcher for the same choices makes subsequent searches cheap.
+    """
+
+    def __init__(self, choices: Sequence[str], workers: int = -1):
+        self.choices = list(choices)
+        self.workers = workers
+        self._processed = [default_process(choice) for choice in self.choices]
+        self._token_postings: Optional[List[List[int]]] = None
+        self._trigram_tokens: Optional[Dict[str, List[int]]] = None
+        self._index_lock = threading.Lock()
+
+    def _build_index(self) -> None:
+        token_ids: Dict[str, int] = {}
+        token_postings: List[List[int]] = []
+        for choice_idx, processed in enumerate(self._processed):
+            for token in set(processed.split()):
+                token_id = token_ids.get(token)
+                if token_id is None:
+                    token_id = token_ids[token] = len(token_postings)
+                    token_postings.append([])
+                token_postings[token_id].append(choice_idx)
+
+        trigram_tokens: Dict[str, List[int]] = defaultdict(list)
+        for token, token_id in token_ids.items():
+            for trigram in set(_trigrams(token)):
+                trigram_tokens[trigram].append(token_id)
+
+        self._token_postings = token_postings
+        self._trigram_tokens = dict(trigram_tokens)
+
+    def _prefilter(self, processed_query: str, keep: int) -> Optional[List[int]]:
+        """Get indices of the choices sharing the most trigrams with the query.
+
+        Returns None when the query has no trigrams to filter on.
+        """
+        query_trigrams = {
+            trigram
+            for token in processed_query.split()
+            for trigram in _trigrams(token)
+        }
+        if not query_trigrams:
+            return None
+
+        with self._index_lock:
+            if self._trigram_tokens is None:
+                self._build_index()
+
+        token_hits: Dict[int, int] = defaultdict(int)
+        for trigram in query_trigrams:
+            for token_id in self._trigram_tokens.get(trigram, ()):
+                token_hits[token_id] += 1
+
+        choice_hits: Dict[int, int] = defaultdict(int)
+        for token_id, hits in token_hits.items():
+            for choice_idx in self._token_postings[token_id]:
+                choice_hits[choice_idx] += hits
+
+        if len(choice_hits) <= keep:
+            return sorted(choice_hits)
+        best = heapq.nlargest(keep, choice_hits.items(), key=lambda item: item[1])
+        return sorted(choice_idx for choice_idx, _ in best)
+
+    def _score(
+        self, processed_query: str, indices: Optional[List[int]], score_cutoff: int
+    ) -> List[Tuple[int, int]]:
+        """Score choices (all of them, or the given indices) and keep those at or above the cutoff."""
+        candidates = (
+            self._processed
+            if indices is None
+            else [self._processed[idx] for idx in indices]
+        )
+        if not candidates:
+            return []
+
+        # Scores are rounded to integers afterwards, so let through anything that may round up
+        raw_cutoff = max(score_cutoff - 0.5, 0)
+
+        if numpy is not None:
+            scores = process.cdist(
+                [processed_query],
+                candidates,
+                scorer=fuzz.WRatio,
+                score_cutoff=raw_cutoff,
+                workers=self.workers,
+            )[0]
+            positions = numpy.nonzero(scores >= raw_cutoff)[0]
+            scored = [(int(pos), float(scores[pos])) for pos in positions]
+        else:
+            scored = [
+                (pos, score)
+                for _, score, pos in process.extract(
+                    processed_query,
+                    candidates,
+                    scorer=fuzz.WRatio,
+                    processor=None,
+                    score_cutoff=raw_cutoff,
+                    limit=None,
+                )
+            ]
+
+        results = []
+        for pos, score in scored:
+            score = int(round(score))
+            if score >= score_cutoff:
+                results.append((pos if indices is None else indices[pos], score))
+        return results
+
+    def extract(
+        self, query: str, limit: int = 10, threshold: int = 0
+    ) -> List[Tuple[str, int]]:
+        """Get the best matching choices for a search term.
+
+        Args:
+            query: Search term
+            limit: Maximum number of results
+            threshold: Minimum score (0-100) for a choice to be returned
+
+        Returns:
+            List of (choice, score) tuples ordered by descending score, ties in
+            choice order
+        """
+        if limit <= 0 or not self.choices:
+            return []
+
+        processed_query = default_process(query)
+        if not processed_query:
+            return [(choice, 0) for choice in self.choices[:limit]] if threshold <= 0 else []
+
+        scored = None
+        if len(self.choices) >= PREFILTER_MIN_CHOICES:
+            keep = max(PREFILTER_MIN_CANDIDATES, limit * PREFILTER_CANDIDATES_PER_RESULT)
+            indices = self._prefilter(processed_query, keep)
+            if indices is not None:
+                scored = self._score(processed_query, indices, threshold)
+                # Too few good matches among the survivors: fall back to scoring everything
+                if len(scored) < limit and len(indices) < len(self.choices):
+                    scored = None
+
+        if scored is None:
+            scored = self._score(processed_query, None, threshold)
+
+        best = heapq.nsmallest(limit, scored, key=lambda item: (-item[1], item[0]))
+        return [(self.choices[idx], score) for idx, score in best]
+
+
+_matcher_cache: Optional[Tuple[tuple, FuzzyMatcher]] = None
+_matcher_cache_lock = threading.Lock()
+
+
+def get_fuzzy_matcher(choices: Sequence[str]) -> FuzzyMatcher:
+    """Get a matcher for the choices, reusing the last one if the choices are unchanged.
+
+    Args:
+        choices: Candidate strings
+
+    Returns:
+        FuzzyMatcher for the choices
+    """
+    global _matcher_cache
+    key = tuple(choices)
+    with _matcher_cache_lock:
+        if _matcher_cache is not None and _matcher_cache[0] == key:
+            return _matcher_cache[1]
+
+    matcher = FuzzyMatcher(key)
+    with _matcher_cache_lock:
+        _matcher_cache = (key, matcher)
+    return matcher
@@ -1,5 +1,6 @@
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional
 
 from langchain_anthropic import ChatAnthropic
 from langchain_core.language_models import BaseChatModel
@@ -627,16 +628,147 @@ def create_llm_client(
         raise ValueError(f"Unsupported provider: {provider}")
 
 
+# Attributes of LangChain chat models that hold an SDK client, and the
+# attribute of the SDK client that holds its httpx client.
+_SDK_CLIENT_ATTRS = ("root_client", "root_async_client", "_client", "_async_client")
+
+
+def _httpx_clients(client: Any) -> List[Any]:
+    """The httpx clients used by a chat model, found on a best-effort basis."""
+    # Read the instance dict so that lazily created SDK clients are not created here
+    attrs = getattr(client, "__dict__", {})
+    found = []
+    for attr in _SDK_CLIENT_ATTRS:
+        sdk_client = attrs.get(attr)
+        http_client = getattr(sdk_client, "_client", None)
+        if http_client is not None and hasattr(http_client, "_transport"):
+            found.append(http_client)
+    return found
+
+
+def _open_connections(http_client: Any) -> int:
+    pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+    try:
+        return len(pool.connections)
+    except Exception:
+        return 0
+
+
+class LLMClientPool:
+    """Thread-safe registry of configured chat model clients.
+
+    Building a client also builds its SDK client and HTTP connection pool, so
+    agents that initialize the same model over and over (sub-agents, fallback
+    handlers, server threads) get the first client back and reuse its open
+    connections instead of redoing the TLS handshakes.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Hashable, BaseChatModel] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable, factory: Callable[[], BaseChatModel]) -> BaseChatModel:
+        """Return the client stored under key, creating it with factory if there is none."""
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._hits += 1
+                return client
+            self._misses += 1
+
+        # Create outside the lock; the expert model lookup may call the provider API
+        client = factory()
+        with self._lock:
+            return self._clients.setdefault(key, client)
+
+    def clear(self) -> None:
+        """Drop all clients and reset the counters."""
+        with self._lock:
+            self._clients.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Client count, reuse counters and open connections across the pooled clients."""
+        with self._lock:
+            clients = list(self._clients.values())
+            hits, misses = self._hits, self._misses
+
+        # SDKs share default httpx clients between models, so count each once
+        http_clients = {}
+        for client in clients:
+            for http_client in _httpx_clients(client):
+                http_clients[id(http_client)] = http_client
+
+        return {
+            "clients": len(clients),
+            "hits": hits,
+            "misses": misses,
+            "http_clients": len(http_clients),
+            "connections": sum(_open_connections(c) for c in http_clients.values()),
+        }
+
+
+_client_pool = LLMClientPool()
+
+
+def get_llm_client_pool() -> LLMClientPool:
+    """Get the process-wide LLM client pool."""
+    return _client_pool
+
+
+def _client_pool_key(
+    provider: str,
+    model_name: str,
+    temperature: Optional[float],
+    is_expert: bool,
+) -> tuple:
+    """Everything create_llm_client builds a client from, so changed settings miss the pool."""
+    config = get_provider_config(provider, is_expert)
+    num_ctx_key = "expert_num_ctx" if is_expert else "num_ctx"
+    return (
+        provider,
+        model_name,
+        temperature,
+        is_expert,
+        get_config_repository().get(num_ctx_key, 262144),
+        config.get("api_key"),
+        config.get("base_url"),
+        get_env_var(name="LLM_REQUEST_TIMEOUT", default=LLM_REQUEST_TIMEOUT),
+        get_env_var(name="LLM_MAX_RETRIES", default=LLM_MAX_RETRIES),
+    )
+
+
+def _get_pooled_llm_client(
+    provider: str,
+    model_name: str,
+    temperature: Optional[float],
+    is_expert: bool,
+) -> BaseChatModel:
+    key = _client_pool_key(provider, model_name, temperature, is_expert)
+    return _client_pool.get(
+        key, lambda: create_llm_client(provider, model_name, temperature, is_expert=is_expert)
+    )
+
+
 def initialize_llm(
     provider: str, model_name: str, temperature: float | None = None
 ) -> BaseChatModel:
-    """Initialize a language model client based on the specified provider and model."""
-    return create_llm_client(provider, model_name, temperature, is_expert=False)
+    """Initialize a language model client based on the specified provider and model.
+
+    Clients are reused from the LLM client pool for identical settings.
+    """
+    return _get_pooled_llm_client(provider, model_name, temperature, is_expert=False)
 
 
 def initialize_expert_llm(provider: str, model_name: str) -> BaseChatModel:
-    """Initialize an expert language model client based on the specified provider and model."""
-    return create_llm_client(provider, model_name, temperature=None, is_expert=True)
+    """Initialize an expert language model client based on the specified provider and model.
+
+    Clients are reused from the LLM client pool for identical settings.
+    """
+    return _get_pooled_llm_client(provider, model_name, temperature=None, is_expert=True)
 
 
 def validate_provider_env(provider: str) -> bool:
@@ -0,0 +1,31 @@
+"""Peewee migrations -- 016_20250415_120000_add_trajectory_usage_index.py.
+
+Adds a covering index for the per-session usage aggregation used by
+all_sessions_usage. The index leads with record_type and session_id so the
+GROUP BY walks the index in order, and carries created_at plus the usage
+columns so the --since filter and the sums never touch the table rows.
+"""
+
+import peewee as pw
+from peewee_migrate import Migrator
+
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_NAME = "trajectory_usage_idx"
+
+
+def migrate(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Create the trajectory usage covering index."""
+    logger.info(f"Creating {INDEX_NAME} on trajectory table")
+    migrator.sql(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON trajectory "
+        "(record_type, session_id, created_at, current_cost, input_tokens, output_tokens)"
+    )
+
+
+def rollback(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Drop the trajectory usage covering index."""
+    logger.info(f"Dropping {INDEX_NAME} from trajectory table")
+    migrator.sql(f"DROP INDEX IF EXISTS {INDEX_NAME}")
@@ -0,0 +1,34 @@
+"""Peewee migrations -- 017_20250416_090000_add_trajectory_session_created_index.py.
+
+Adds a composite index on trajectory (session_id, created_at) so session
+timelines are read in created_at order straight from the index instead of
+sorting every record of the session. The index name matches the one peewee
+derives from Trajectory.Meta.indexes, so create_tables and this migration
+never create it twice.
+
+Lookups by human_input ordered by id are already served by the
+trajectory_human_input_id index, which SQLite keys by (human_input_id, rowid).
+"""
+
+import peewee as pw
+from peewee_migrate import Migrator
+
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_NAME = "trajectory_session_id_created_at"
+
+
+def migrate(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Create the trajectory session timeline index."""
+    logger.info(f"Creating {INDEX_NAME} on trajectory table")
+    migrator.sql(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON trajectory (session_id, created_at)"
+    )
+
+
+def rollback(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Drop the trajectory session timeline index."""
+    logger.info(f"Dropping {INDEX_NAME} from trajectory table")
+    migrator.sql(f"DROP INDEX IF EXISTS {INDEX_NAME}")
@@ -0,0 +1,31 @@
+"""Peewee migrations -- 018_20250417_100000_add_memory_session_indexes.py.
+
+Makes sure key_fact, key_snippet and research_note have an index on session_id
+so session-scoped reads do not scan every record ever stored in the project
+database. SQLite keys these indexes by (session_id, rowid), so reading a session
+in id order, or its most recent records, is served from the index alone.
+
+The index names match the ones peewee derives for the session foreign keys, so
+databases that already have them are left unchanged.
+"""
+
+import peewee as pw
+from peewee_migrate import Migrator
+
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TABLES = ["key_fact", "key_snippet", "research_note"]
+
+
+def migrate(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Create the session_id indexes on the memory tables."""
+    for table in TABLES:
+        logger.info(f"Creating {table}_session_id on {table} table")
+        migrator.sql(f"CREATE INDEX IF NOT EXISTS {table}_session_id ON {table} (session_id)")
+
+
+def rollback(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Leave the indexes in place; peewee creates them with the tables as well."""
+    pass
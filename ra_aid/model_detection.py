@@ -1,6 +1,5 @@
 """Utilities for detecting and working with specific model types."""
 
-import litellm
 from typing import Any, Dict, Optional
 
 from langchain_core.language_models import BaseChatModel
@@ -9,6 +8,7 @@ from ra_aid.config import DEFAULT_MODEL
 from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.logging_config import get_logger
 from ra_aid.models_params import models_params, AgentBackendType, DEFAULT_AGENT_BACKEND
+from ra_aid.utils.litellm_loader import get_litellm
 
 
 logger = get_logger(__name__)
@@ -129,7 +129,7 @@ def should_use_react_agent(model: BaseChatModel) -> bool:
     provider = get_provider_from_chat_model(model)
 
     try:
-        supports_function_calling = litellm.supports_function_calling(
+        supports_function_calling = get_litellm().supports_function_calling(
             model=model_name, custom_llm_provider=provider
         )
         use_react_agent = supports_function_calling
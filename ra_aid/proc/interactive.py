@@ -5,6 +5,8 @@ with full raw input passthrough for interactive commands.
 
 It uses a pseudo-tty and integrates pyte's HistoryScreen to simulate
 a terminal and capture the final scrollback history (non-blank lines).
+Commands that never need a terminal can instead run over plain pipes, which
+skips terminal emulation and keeps only a bounded head and tail of the output.
 The interface remains compatible with external callers expecting a tuple (output, return_code),
 where output is a bytes object (UTF-8 encoded).
 """
@@ -12,12 +14,16 @@ where output is a bytes object (UTF-8 encoded).
 import errno
 import io
 import os
+import re
+import shlex
 import shutil
 import signal
 import subprocess
 import sys
+import threading
 import time
-from typing import List, Optional, Tuple
+from collections import deque
+from typing import Deque, List, Optional, Tuple
 
 import pyte
 from pyte.screens import HistoryScreen
@@ -25,12 +31,254 @@ from pyte.screens import HistoryScreen
 # Platform-specific imports
 if sys.platform == "win32":
     import msvcrt
-    import threading
 else:
     import select
     import termios
     import tty
 
+# Lines of output kept in memory from the start and end of a command; lines in between are only counted
+CAPTURE_HEAD_LINES = 100
+CAPTURE_TAIL_LINES = 2000
+CAPTURE_MAX_LINE_BYTES = 8192
+
+# Size of the output returned to callers, and how much of it comes from the start of the output
+MAX_OUTPUT_BYTES = 8000
+OUTPUT_HEAD_BYTES = 2000
+
+# Programs that never need a terminal. Shell command lines made only of these run over pipes.
+NON_INTERACTIVE_PROGRAMS = frozenset(
+    {
+        "awk", "basename", "cat", "cd", "cut", "date", "diff", "dirname", "du",
+        "echo", "egrep", "fd", "fgrep", "file", "find", "grep", "head", "ls",
+        "nl", "printf", "pwd", "pytest", "realpath", "rg", "sed", "sort",
+        "stat", "tail", "tr", "tree", "true", "uniq", "wc", "which",
+    }
+)
+NON_INTERACTIVE_GIT_SUBCOMMANDS = frozenset(
+    {
+        "blame", "branch", "describe", "diff", "grep", "log", "ls-files",
+        "rev-parse", "show", "status",
+    }
+)
+# Programs whose "test" subcommand runs a test suite
+TEST_SUBCOMMAND_PROGRAMS = frozenset({"cargo", "go", "npm", "pnpm", "yarn"})
+PYTHON_TEST_MODULES = frozenset({"pytest", "unittest"})
+SHELL_PROGRAMS = frozenset({"bash", "sh", "zsh"})
+
+_SHELL_OPERATOR_RE = re.compile(r"&&|\|\||[;|&\n]")
+_OMITTED_MARKER_RE = re.compile(
+    r"^\[\.\.\. (\d+) lines \((\d+) bytes\) of output omitted \.\.\.\]$"
+)
+_ANSI_ESCAPE_RE = re.compile(
+    r"\x1b\[[0-?]*[ -/]*[@-~]|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)|\x1b[@-Z\\-_]"
+)
+
+
+def omitted_marker(lines: int, num_bytes: int) -> str:
+    """Format the line that stands in for omitted output."""
+    return f"[... {lines} lines ({num_bytes} bytes) of output omitted ...]"
+
+
+class HeadTailBuffer:
+    """Line buffer that keeps only the first and last lines written to it.
+
+    The first head_lines and last tail_lines lines are kept; lines in between
+    are counted in dropped_lines and dropped_bytes. A line longer than
+    max_line_bytes keeps only its last max_line_bytes (the final state of a
+    progress bar), so memory use stays O(head_lines + tail_lines) no matter
+    what the command writes. Writes are thread-safe.
+    """
+
+    def __init__(
+        self,
+        head_lines: int = CAPTURE_HEAD_LINES,
+        tail_lines: int = CAPTURE_TAIL_LINES,
+        max_line_bytes: int = CAPTURE_MAX_LINE_BYTES,
+    ):
+        self.head_lines = head_lines
+        self.max_line_bytes = max_line_bytes
+        self.head: List[bytes] = []
+        self.tail: Deque[bytes] = deque(maxlen=tail_lines)
+        self.partial = bytearray()
+        self.dropped_lines = 0
+        self.dropped_bytes = 0
+        self._lock = threading.Lock()
+
+    def _add_line(self, line: bytes) -> None:
+        if len(line) > self.max_line_bytes:
+            self.dropped_bytes += len(line) - self.max_line_bytes
+            line = line[-self.max_line_bytes :]
+        if len(self.head) < self.head_lines:
+            self.head.append(line)
+        elif self.tail.maxlen == 0:
+            self.dropped_lines += 1
+            self.dropped_bytes += len(line)
+        else:
+            if len(self.tail) == self.tail.maxlen:
+                self.dropped_lines += 1
+                self.dropped_bytes += len(self.tail[0])
+            self.tail.append(line)
+
+    def write(self, data: bytes) -> None:
+        with self._lock:
+            start = 0
+            end = data.find(b"\n")
+            while end >= 0:
+                if self.partial:
+                    self.partial += data[start : end + 1]
+                    self._add_line(bytes(self.partial))
+                    self.partial.clear()
+                else:
+                    self._add_line(data[start : end + 1])
+                start = end + 1
+                end = data.find(b"\n", start)
+            if start < len(data):
+                self.partial += data[start:]
+                excess = len(self.partial) - self.max_line_bytes
+                if excess > 0:
+                    del self.partial[:excess]
+                    self.dropped_bytes += excess
+
+    def getvalue(self) -> bytes:
+        """Get the retained output, with a marker line where output was dropped."""
+        with self._lock:
+            parts = list(self.head)
+            if self.dropped_lines or self.dropped_bytes:
+                marker = omitted_marker(self.dropped_lines, self.dropped_bytes)
+                parts.append(marker.encode() + b"\n")
+            parts.extend(self.tail)
+            parts.append(bytes(self.partial))
+            return b"".join(parts)
+
+
+def keep_head_and_tail(
+    text: str, max_bytes: int = MAX_OUTPUT_BYTES, head_bytes: int = OUTPUT_HEAD_BYTES
+) -> str:
+    """Shorten text to at most about max_bytes, keeping whole lines from its start and end.
+
+    The lines in between are replaced by one marker line that reports how many
+    lines and bytes were left out, including any already omitted at capture time.
+
+    Args:
+        text: Output to shorten
+        max_bytes: Maximum size of the result in UTF-8 bytes
+        head_bytes: Bytes from the start of the output to keep
+
+    Returns:
+        The text unchanged if it fits, otherwise its head, a marker line and its tail
+    """
+    if len(text.encode("utf-8")) <= max_bytes:
+        return text
+
+    lines = text.split("\n")
+    sizes = [len(line.encode("utf-8")) + 1 for line in lines]
+
+    head_count = 0
+    used = 0
+    while head_count < len(lines) and used + sizes[head_count] <= head_bytes:
+        used += sizes[head_count]
+        head_count += 1
+
+    # Leave room for the marker line; the head may already have used up the budget
+    tail_budget = max(max_bytes - used - 80, 0)
+    tail_start = len(lines)
+    while tail_start > head_count and sizes[tail_start - 1] <= tail_budget:
+        tail_budget -= sizes[tail_start - 1]
+        tail_start -= 1
+
+    tail = lines[tail_start:]
+    omitted = lines[head_count:tail_start]
+    dropped_lines = 0
+    dropped_bytes = 0
+    if not tail and omitted:
+        # Not even the last line fits: keep its end
+        last_line = omitted.pop().encode("utf-8")
+        kept = last_line[len(last_line) - tail_budget:]
+        dropped_bytes += len(last_line) - len(kept)
+        tail = [kept.decode("utf-8", errors="ignore")]
+
+    for line in omitted:
+        match = _OMITTED_MARKER_RE.match(line)
+        if match:
+            dropped_lines += int(match.group(1))
+            dropped_bytes += int(match.group(2))
+        else:
+            dropped_lines += 1
+            dropped_bytes += len(line.encode("utf-8")) + 1
+
+    return "\n".join(
+        lines[:head_count] + [omitted_marker(dropped_lines, dropped_bytes)] + tail
+    )
+
+
+def _is_non_interactive_segment(segment: str) -> bool:
+    try:
+        words = shlex.split(segment)
+    except ValueError:
+        return False
+    # Skip leading environment assignments such as FOO=1
+    while words and re.match(r"^[A-Za-z_][A-Za-z0-9_]*=", words[0]):
+        words = words[1:]
+    if not words:
+        return True
+
+    program = os.path.basename(words[0])
+    args = [word for word in words[1:] if not word.startswith("-")]
+    if program in NON_INTERACTIVE_PROGRAMS:
+        return True
+    if program == "git":
+        return bool(args) and args[0] in NON_INTERACTIVE_GIT_SUBCOMMANDS
+    if program in TEST_SUBCOMMAND_PROGRAMS:
+        return bool(args) and args[0] == "test"
+    if re.match(r"^python(\d+(\.\d+)?)?$", program) and "-m" in words:
+        module_args = words[words.index("-m") + 1 :]
+        return bool(module_args) and module_args[0] in PYTHON_TEST_MODULES
+    return False
+
+
+def should_use_pty(cmd: List[str]) -> bool:
+    """Decide whether a command needs a pseudo-terminal.
+
+    Commands are run over plain pipes when they are known not to need a terminal:
+    a program from NON_INTERACTIVE_PROGRAMS, a read-only git subcommand or a test
+    runner, either directly or as a shell command line (bash -c "...") in which
+    every command qualifies. Anything else gets a pty.
+
+    Args:
+        cmd: Command and arguments
+
+    Returns:
+        True if the command should run in a pty
+    """
+    if not cmd:
+        return True
+    program = os.path.basename(cmd[0])
+    if program in SHELL_PROGRAMS and len(cmd) == 3 and cmd[1] == "-c":
+        command_line = cmd[2].replace("2>&1", "")
+        # Subshells, substitutions and redirections from files can hide anything
+        if re.search(r"[`$(<]", command_line):
+            return True
+        segments = [seg for seg in _SHELL_OPERATOR_RE.split(command_line) if seg.strip()]
+        if not segments:
+            return True
+        return not all(_is_non_interactive_segment(seg) for seg in segments)
+    return not _is_non_interactive_segment(shlex.join(cmd))
+
+
+def clean_pipe_output(text: str) -> List[str]:
+    """Turn raw output captured over a pipe into the lines a terminal would show.
+
+    Strips ANSI escape sequences, keeps only the text after the last carriage
+    return of each line (progress bars), drops trailing whitespace and blank lines.
+    """
+    lines = []
+    for line in _ANSI_ESCAPE_RE.sub("", text).split("\n"):
+        segments = [segment for segment in line.split("\r") if segment]
+        line = segments[-1].rstrip() if segments else ""
+        if line.strip():
+            lines.append(line)
+    return lines
+
 
 def create_process(
     cmd: List[str],
@@ -133,8 +381,104 @@ def render_line(line, columns: int) -> str:
         return str(line)
 
 
+def _run_over_pipes(
+    cmd: List[str], env: dict, expected_runtime_seconds: int
+) -> Tuple[str, int, bool]:
+    """Run a command over plain pipes instead of a pty, keeping a bounded head and tail of its output.
+
+    Output is echoed to stdout as it arrives. The process is terminated after 2x and
+    killed after 3x expected_runtime_seconds.
+
+    Returns:
+        A tuple of (output, return_code, was_terminated)
+    """
+    is_windows = sys.platform == "win32"
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=0,
+        env=env,
+        start_new_session=not is_windows,  # Own process group so the whole tree can be signalled
+    )
+    buffer = HeadTailBuffer()
+
+    def read_output():
+        while True:
+            try:
+                data = proc.stdout.read(65536)
+            except (OSError, ValueError):
+                break
+            if not data:
+                break
+            buffer.write(data)
+            try:
+                sys.stdout.buffer.write(data)
+                sys.stdout.buffer.flush()
+            except (AttributeError, OSError, ValueError):
+                pass
+
+    reader = threading.Thread(target=read_output, daemon=True)
+    reader.start()
+
+    def send_signal(kill: bool):
+        try:
+            if is_windows:
+                proc.kill() if kill else proc.terminate()
+            else:
+                os.killpg(proc.pid, signal.SIGKILL if kill else signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    start_time = time.time()
+    was_terminated = False
+    try:
+        while True:
+            try:
+                proc.wait(timeout=0.1)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            elapsed = time.time() - start_time
+            if elapsed > 3 * expected_runtime_seconds:
+                send_signal(kill=True)
+                was_terminated = True
+            elif elapsed > 2 * expected_runtime_seconds and not was_terminated:
+                send_signal(kill=False)
+                was_terminated = True
+    except KeyboardInterrupt:
+        send_signal(kill=False)
+        proc.wait()
+
+    reader.join(5.0)
+    proc.stdout.close()
+
+    decoded = buffer.getvalue().decode("utf-8", errors="replace")
+    return "\n".join(clean_pipe_output(decoded)), proc.returncode, was_terminated
+
+
+def _limit_output(final_output, was_terminated: bool, expected_runtime_seconds: int) -> bytes:
+    """Add the timeout note if needed and shorten the output to MAX_OUTPUT_BYTES."""
+    if isinstance(final_output, bytes):
+        final_output = final_output.decode("utf-8", errors="replace")
+    elif not isinstance(final_output, str):
+        # Handle any unexpected type
+        final_output = str(final_output)
+
+    # Add timeout message if process was terminated due to timeout.
+    if was_terminated:
+        timeout_msg = f"\n[Process exceeded timeout ({expected_runtime_seconds} seconds expected)]"
+        final_output += timeout_msg
+
+    # Keep the start and end of the output, reporting what was left out
+    return keep_head_and_tail(final_output).encode("utf-8")
+
+
 def run_interactive_command(
-    cmd: List[str], expected_runtime_seconds: int = 30
+    cmd: List[str],
+    expected_runtime_seconds: int = 30,
+    use_pty: Optional[bool] = None,
 ) -> Tuple[bytes, int]:
     """
     Runs an interactive command with output capture, capturing final scrollback history.
@@ -159,16 +503,26 @@ def run_interactive_command(
     - Handles raw terminal mode for proper input forwarding
     - Uses process groups for proper signal handling
 
+    Commands that do not need a terminal can instead run over plain pipes
+    (use_pty=False). This skips terminal emulation and input forwarding, strips
+    ANSI escape sequences, and keeps only a bounded head and tail of the output
+    in memory.
+
     Args:
       cmd: A list containing the command and its arguments.
       expected_runtime_seconds: Expected runtime in seconds, defaults to 30.
         If process exceeds 2x this value, it will be terminated gracefully.
         If process exceeds 3x this value, it will be killed forcefully.
         Must be between 1 and 1800 seconds (30 minutes).
+      use_pty: Whether to run the command in a pseudo-terminal. Defaults to None,
+        which picks pipes for commands known not to need a terminal (see should_use_pty).
 
     Returns:
       A tuple of (captured_output, return_code), where captured_output is a UTF-8 encoded
       bytes object containing the trimmed non-empty history lines from the terminal session.
+      Only the first CAPTURE_HEAD_LINES and last CAPTURE_TAIL_LINES lines are kept while the
+      command runs, and the result is shortened to MAX_OUTPUT_BYTES; omitted output is
+      replaced by a line reporting how many lines and bytes were left out.
 
     Raises:
       ValueError: If no command is provided.
@@ -206,10 +560,21 @@ def run_interactive_command(
         }
     )
 
+    if use_pty is None:
+        use_pty = should_use_pty(cmd)
+    if not use_pty:
+        # Colors would only be stripped again without a terminal to render them
+        env.pop("FORCE_COLOR", None)
+        output, return_code, was_terminated = _run_over_pipes(
+            cmd, env, expected_runtime_seconds
+        )
+        return _limit_output(output, was_terminated, expected_runtime_seconds), return_code
+
     # Create process based on platform
     proc, master_fd = create_process(cmd, env, cols, rows)
 
-    captured_data = []
+    # Only a bounded head and tail of the output is kept, however much the command prints
+    buffer = HeadTailBuffer()
     start_time = time.time()
     was_terminated = False
 
@@ -241,7 +606,7 @@ def run_interactive_command(
                     data = proc.stdout.read(1024)
                     if not data:
                         break
-                    captured_data.append(data)
+                    buffer.write(data)
                     sys.stdout.buffer.write(data)
                     sys.stdout.buffer.flush()
                 except (OSError, IOError):
@@ -257,7 +622,7 @@ def run_interactive_command(
                     data = proc.stderr.read(1024)
                     if not data:
                         break
-                    captured_data.append(data)
+                    buffer.write(data)
                     sys.stderr.buffer.write(data)
                     sys.stderr.buffer.flush()
                 except (OSError, IOError):
@@ -346,7 +711,7 @@ def run_interactive_command(
                                 raise
                         if not data:  # EOF detected.
                             break
-                        captured_data.append(data)
+                        buffer.write(data)
                         os.write(1, data)
                     if stdin_fd in rlist:
                         try:
@@ -378,7 +743,7 @@ def run_interactive_command(
                             raise
                     if not data:  # EOF detected.
                         break
-                    captured_data.append(data)
+                    buffer.write(data)
                     os.write(1, data)
             except KeyboardInterrupt:
                 proc.terminate()
@@ -389,16 +754,18 @@ def run_interactive_command(
     proc.wait()
 
     # Ensure we have captured data even if the screen processing failed
-    raw_output = b"".join(captured_data)
+    raw_output = buffer.getvalue()
 
     # Process the captured output through a fresh screen
     try:
         # Create a new screen and stream for final processing
-        screen = HistoryScreen(cols, rows, history=2000, ratio=0.5)
+        # History holds every retained line, so the head of the output is not scrolled away
+        screen = HistoryScreen(
+            cols, rows, history=CAPTURE_HEAD_LINES + CAPTURE_TAIL_LINES + 1, ratio=0.5
+        )
         stream = pyte.Stream(screen)
 
         # Feed all captured data at once to get the final state
-        raw_output = b"".join(captured_data)
         decoded = raw_output.decode("utf-8", errors="ignore")
         stream.feed(decoded)
 
@@ -447,22 +814,7 @@ def run_interactive_command(
             # Ultimate fallback if line processing fails
             final_output = raw_output.decode("utf-8", errors="replace").strip()
 
-    # Add timeout message if process was terminated due to timeout.
-    if was_terminated:
-        timeout_msg = f"\n[Process exceeded timeout ({expected_runtime_seconds} seconds expected)]"
-        final_output += timeout_msg
-
-    # Limit output to the last 8000 bytes
-    if isinstance(final_output, str):
-        final_output = final_output[-8000:]
-        final_output = final_output.encode("utf-8")
-    elif isinstance(final_output, bytes):
-        final_output = final_output[-8000:]
-    else:
-        # Handle any unexpected type
-        final_output = str(final_output)[-8000:].encode("utf-8")
-
-    return final_output, proc.returncode
+    return _limit_output(final_output, was_terminated, expected_runtime_seconds), proc.returncode
 
 
 if __name__ == "__main__":
@@ -1,17 +1,21 @@
 """Module providing unified interface for project information."""
 
-from dataclasses import dataclass
-from typing import List, Optional
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
 __all__ = [
     "ProjectInfo",
     "ProjectInfoError",
     "get_project_info",
+    "clear_project_info_cache",
     "format_project_info",
     "display_project_status",
 ]
 
 from ra_aid.console.formatting import cpm
+from ra_aid.file_index import get_file_index
 from ra_aid.file_listing import FileListerError, get_file_listing
 from ra_aid.project_state import ProjectStateError, is_new_project
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
@@ -28,11 +32,13 @@ class ProjectInfo:
         is_new: Whether the project is new/empty
         files: List of tracked files in the project
         total_files: Total number of tracked files (before any limit)
+        formatted: Output of format_project_info, filled in on first use
     """
 
     is_new: bool
     files: List[str]
     total_files: int
+    formatted: Optional[str] = field(default=None, repr=False, compare=False)
 
 
 class ProjectInfoError(Exception):
@@ -41,10 +47,42 @@ class ProjectInfoError(Exception):
     pass
 
 
+# Project info per (directory, file_limit) with the version it was built at
+_project_snapshots: Dict[Tuple[str, Optional[int]], Tuple[tuple, ProjectInfo]] = {}
+_project_snapshots_lock = threading.Lock()
+
+
+def _project_version(directory: str) -> Optional[tuple]:
+    """Cheap freshness key: the file index version plus the directory's mtime.
+
+    The file index version covers git index/HEAD changes and files written by
+    the agent's tools. The directory mtime covers top-level entries appearing or
+    disappearing, which decide is_new. Directories without a fresh git snapshot
+    return None and are never cached.
+    """
+    index_version = get_file_index().get_version(directory)
+    if index_version is None:
+        return None
+    try:
+        return index_version, os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+def clear_project_info_cache() -> None:
+    """Drop all cached project info snapshots."""
+    with _project_snapshots_lock:
+        _project_snapshots.clear()
+
+
 def get_project_info(directory: str, file_limit: Optional[int] = None) -> ProjectInfo:
     """
     Get unified project information including new status and file listing.
 
+    The result is reused across agents for as long as the project listing is
+    unchanged, so spawning many agents does not re-list the repository each time.
+    Callers must not modify the returned object.
+
     Args:
         directory: Path to the project directory
         file_limit: Optional maximum number of files to return in listing
@@ -57,6 +95,14 @@ def get_project_info(directory: str, file_limit: Optional[int] = None) -> Projec
         ProjectStateError: If there are errors checking project state
         FileListerError: If there are errors listing files
     """
+    key = (os.path.abspath(directory), file_limit)
+    version = _project_version(directory)
+    if version is not None:
+        with _project_snapshots_lock:
+            cached = _project_snapshots.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
     try:
         # Check if project is new
         new_status = is_new_project(directory)
@@ -64,7 +110,15 @@ def get_project_info(directory: str, file_limit: Optional[int] = None) -> Projec
         # Get file listing
         files, total = get_file_listing(directory, limit=file_limit)
 
-        return ProjectInfo(is_new=new_status, files=files, total_files=total)
+        info = ProjectInfo(is_new=new_status, files=files, total_files=total)
+
+        # The listing builds the file index snapshot on first use, so the version may only exist now.
+        # Do not cache if it moved on while the listing ran.
+        built_version = _project_version(directory)
+        if built_version is not None and version in (None, built_version):
+            with _project_snapshots_lock:
+                _project_snapshots[key] = (built_version, info)
+        return info
 
     except (ProjectStateError, FileListerError):
         # Re-raise known errors
@@ -83,6 +137,12 @@ def format_project_info(info: ProjectInfo) -> str:
     Returns:
         Formatted string containing project status and file listing
     """
+    if info.formatted is None:
+        info.formatted = _format_project_info(info)
+    return info.formatted
+
+
+def _format_project_info(info: ProjectInfo) -> str:
     # Create project status line
     status = "New/Empty Project" if info.is_new else "Existing Project"
 
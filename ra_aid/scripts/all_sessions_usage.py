@@ -5,6 +5,7 @@ This module provides functions to retrieve usage statistics for all sessions
 from the database.
 """
 
+import datetime
 import json
 import os
 from pathlib import Path
@@ -30,16 +31,55 @@ def create_empty_result(error_message=None):
     return result
 
 
-def get_all_sessions_usage(project_dir: Optional[str] = None, db_path: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+def parse_since(value: str) -> datetime.datetime:
+    """
+    Parse a --since value given as an ISO date or date and time.
+
+    Args:
+        value: Date such as 2025-04-01, or date and time such as 2025-04-01T12:00
+
+    Returns:
+        datetime.datetime: The parsed start time
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not an ISO date or date and time
+    """
+    import argparse
+
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid --since value '{value}', expected an ISO date such as 2025-04-01"
+        )
+
+
+def add_since_argument(parser) -> None:
+    """Add the --since option to an argument parser."""
+    parser.add_argument(
+        "--since",
+        type=parse_since,
+        help="Only count usage recorded on or after this ISO date or date and time",
+    )
+
+
+def get_all_sessions_usage(
+    project_dir: Optional[str] = None,
+    db_path: Optional[str] = None,
+    since: Optional[datetime.datetime] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
     """
     Get usage statistics for all sessions.
     
     This function retrieves all sessions and calculates their usage metrics.
+    Usage for every session is summed by one aggregate query.
     
     Args:
         project_dir: Optional directory path where the .ra-aid folder is located.
                     Defaults to current working directory if not specified.
         db_path: Optional direct path to the database file. Takes precedence over project_dir if specified.
+        since: Optional start time. Only usage recorded from then on is counted, and
+               only sessions with such usage are listed.
     
     Returns:
         Tuple[List[Dict[str, Any]], int]: A tuple containing:
@@ -87,49 +127,48 @@ def get_all_sessions_usage(project_dir: Optional[str] = None, db_path: Optional[
             
         # Initialize database connection using DatabaseManager context
         with DatabaseManager(base_dir=base_dir) as db:
-            # Get all session IDs
-            with SessionRepositoryManager(db) as session_repo:
-                session_ids = session_repo.get_all_session_ids()
-                
-                if not session_ids:
+            with SessionRepositoryManager(db) as session_repo, \
+                 TrajectoryRepositoryManager(db) as trajectory_repo:
+                sessions, _ = session_repo.get_all(limit=None)
+
+                if not sessions:
                     return [create_empty_result("No sessions found in database")], 1
-                
-                # Get usage totals for each session
+
+                # Usage totals for all sessions in one query
+                usage_by_session = trajectory_repo.get_usage_totals_by_session(since=since)
+
                 results = []
-                with TrajectoryRepositoryManager(db) as trajectory_repo:
-                    for session_id in session_ids:
-                        # Get session details
-                        session = session_repo.get(session_id)
-                        if not session:
+                for session in sessions:
+                    usage_totals = usage_by_session.get(session.id)
+                    if usage_totals is None:
+                        if since is not None:
                             continue
-                            
-                        # Get usage totals for the session
-                        usage_totals = trajectory_repo.get_session_usage_totals(session_id)
-                        
-                        # Create result object with session info and usage totals
-                        result = {
-                            "session_id": session.id,
-                            "session_start_time": session.start_time.isoformat() if session.start_time else None,
-                            "session_display_name": session.display_name,
-                            **usage_totals  # Unpack usage totals directly
-                        }
-                        
-                        results.append(result)
-                    
-                    # Calculate grand totals
-                    grand_total = {
-                        "session_id": "all",
-                        "session_display_name": "All Sessions",
-                        "total_cost": sum(r["total_cost"] for r in results),
-                        "total_input_tokens": sum(r["total_input_tokens"] for r in results),
-                        "total_output_tokens": sum(r["total_output_tokens"] for r in results),
-                        "total_tokens": sum(r["total_tokens"] for r in results)
+                        usage_totals = create_empty_result()
+
+                    # Create result object with session info and usage totals
+                    result = {
+                        "session_id": session.id,
+                        "session_start_time": session.start_time.isoformat() if session.start_time else None,
+                        "session_display_name": session.display_name,
+                        **usage_totals  # Unpack usage totals directly
                     }
-                    
-                    # Add grand total to the beginning of the results
-                    results.insert(0, grand_total)
-                    
-                    return results, 0
+
+                    results.append(result)
+
+                # Calculate grand totals
+                grand_total = {
+                    "session_id": "all",
+                    "session_display_name": "All Sessions",
+                    "total_cost": sum(r["total_cost"] for r in results),
+                    "total_input_tokens": sum(r["total_input_tokens"] for r in results),
+                    "total_output_tokens": sum(r["total_output_tokens"] for r in results),
+                    "total_tokens": sum(r["total_tokens"] for r in results)
+                }
+                
+                # Add grand total to the beginning of the results
+                results.insert(0, grand_total)
+                
+                return results, 0
     except Exception as e:
         return [create_empty_result(str(e))], 1
 
@@ -146,12 +185,14 @@ def main():
     parser = argparse.ArgumentParser(description="Get usage statistics for all sessions")
     parser.add_argument("--project-dir", help="Directory containing the .ra-aid folder (defaults to current directory)")
     parser.add_argument("--db-path", help="Direct path to the database file (takes precedence over project-dir)")
+    add_since_argument(parser)
     
     args = parser.parse_args()
     
     results, status_code = get_all_sessions_usage(
         project_dir=args.project_dir,
-        db_path=args.db_path
+        db_path=args.db_path,
+        since=args.since
     )
     print(json.dumps(results, indent=2))
     return status_code
@@ -9,7 +9,7 @@ import sys
 import json
 import argparse
 from ra_aid.scripts.last_session_usage import get_latest_session_usage
-from ra_aid.scripts.all_sessions_usage import get_all_sessions_usage
+from ra_aid.scripts.all_sessions_usage import add_since_argument, get_all_sessions_usage
 
 def session_usage_command():
     """
@@ -41,12 +41,14 @@ def all_sessions_usage_command():
     parser = argparse.ArgumentParser(description="Get usage statistics for all sessions")
     parser.add_argument("--project-dir", help="Directory containing the .ra-aid folder (defaults to current directory)")
     parser.add_argument("--db-path", help="Direct path to the database file (takes precedence over project-dir)")
+    add_since_argument(parser)
     
     args = parser.parse_args(sys.argv[2:] if len(sys.argv) > 2 else [])
     
     results, status_code = get_all_sessions_usage(
         project_dir=args.project_dir,
-        db_path=args.db_path
+        db_path=args.db_path,
+        since=args.since
     )
     print(json.dumps(results, indent=2))
     return status_code
@@ -65,6 +67,7 @@ def main():
     all_parser = subparsers.add_parser("all", help="Get usage statistics for all sessions")
     all_parser.add_argument("--project-dir", help="Directory containing the .ra-aid folder (defaults to current directory)")
     all_parser.add_argument("--db-path", help="Direct path to the database file (takes precedence over project-dir)")
+    add_since_argument(all_parser)
     
     args = parser.parse_args()
     
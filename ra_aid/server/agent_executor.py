@@ -0,0 +1,282 @@
+'''Bounded worker pool that runs agents spawned through the server.
+
+Agents are admitted from a priority queue (FIFO within a priority) and run on at
+most max_workers threads, so a burst of spawn requests queues up instead of
+starting an LLM loop per request. Queued agents keep their session in the
+'pending' status until a worker picks them up; run_agent_thread moves the
+session to 'running' when it starts.
+'''
+
+import datetime
+import heapq
+import itertools
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from ra_aid.config import DEFAULT_SERVER_MAX_AGENTS
+from ra_aid.database.repositories.config_repository import get_config_repository
+
+logger = logging.getLogger(__name__)
+
+
+# Finished and cancelled jobs kept for status lookups
+MAX_FINISHED_JOBS = 500
+
+QUEUED = "queued"
+RUNNING = "running"
+FINISHED = "finished"
+CANCELLED = "cancelled"
+
+
+class AgentJob:
+    '''An agent run waiting for, or holding, a worker.'''
+
+    def __init__(
+        self,
+        session_id: int,
+        fn: Callable[..., Any],
+        args: tuple,
+        kwargs: Dict[str, Any],
+        priority: int,
+        seq: int,
+    ):
+        self.session_id = session_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.seq = seq
+        self.state = QUEUED
+        self.queued_at = datetime.datetime.now()
+        self.started_at: Optional[datetime.datetime] = None
+        self.finished_at: Optional[datetime.datetime] = None
+
+    def sort_key(self) -> tuple:
+        # Higher priority first, then submission order
+        return (-self.priority, self.seq)
+
+    def to_dict(self, position: Optional[int] = None) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "state": self.state,
+            "priority": self.priority,
+            "queue_position": position,
+            "queued_at": self.queued_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class AgentExecutor:
+    '''Runs submitted agent jobs on a bounded set of daemon worker threads.'''
+
+    def __init__(self, max_workers: int = DEFAULT_SERVER_MAX_AGENTS):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._queue: List[tuple] = []
+        self._jobs: Dict[int, AgentJob] = {}
+        self._seq = itertools.count()
+        self._finished: deque = deque()
+        self._workers: List[threading.Thread] = []
+        self._running = 0
+        self._completed = 0
+        self._shutdown = False
+
+    def submit(
+        self,
+        session_id: int,
+        fn: Callable[..., Any],
+        *args: Any,
+        priority: int = 0,
+        **kwargs: Any,
+    ) -> AgentJob:
+        '''
+        Queue fn(*args, **kwargs) to run on a worker.
+
+        Args:
+            session_id: Session the agent run belongs to
+            fn: Callable running the agent
+            priority: Higher priorities are admitted first; equal priorities run in submission order
+
+        Returns:
+            AgentJob: The queued job
+
+        Raises:
+            RuntimeError: If the executor has been shut down
+        '''
+        with self._available:
+            if self._shutdown:
+                raise RuntimeError("Agent executor is shut down")
+            job = AgentJob(session_id, fn, args, kwargs, priority, next(self._seq))
+            self._jobs[session_id] = job
+            heapq.heappush(self._queue, (job.sort_key(), job))
+            if len(self._workers) < self.max_workers and len(self._workers) - self._running < len(self._queue):
+                self._start_worker()
+            self._available.notify()
+        logger.info(f"Queued agent for session {session_id} with priority {priority}")
+        return job
+
+    def cancel(self, session_id: int) -> bool:
+        '''
+        Remove a queued job before it starts.
+
+        Returns:
+            bool: True if the job was queued and is now cancelled, False if it is
+                unknown, already running or already finished
+        '''
+        with self._available:
+            job = self._jobs.get(session_id)
+            if job is None or job.state != QUEUED:
+                return False
+            self._queue = [entry for entry in self._queue if entry[1] is not job]
+            heapq.heapify(self._queue)
+            self._retire(job, CANCELLED)
+        logger.info(f"Cancelled queued agent for session {session_id}")
+        return True
+
+    def get_job(self, session_id: int) -> Optional[Dict[str, Any]]:
+        '''Describe a job with its 1-based queue position, or None if the session has no job.'''
+        with self._lock:
+            job = self._jobs.get(session_id)
+            if job is None:
+                return None
+            return job.to_dict(self._position(job))
+
+    def _position(self, job: AgentJob) -> Optional[int]:
+        if job.state != QUEUED:
+            return None
+        key = job.sort_key()
+        return 1 + sum(1 for other_key, _ in self._queue if other_key < key)
+
+    def stats(self) -> Dict[str, Any]:
+        '''Worker utilization and the admission queue in run order.'''
+        with self._lock:
+            queued = [job for _, job in sorted(self._queue, key=lambda entry: entry[0])]
+            running = [job for job in self._jobs.values() if job.state == RUNNING]
+            return {
+                "max_workers": self.max_workers,
+                "running": self._running,
+                "queued": len(queued),
+                "completed": self._completed,
+                "utilization": self._running / self.max_workers,
+                "running_jobs": [job.to_dict() for job in running],
+                "queued_jobs": [job.to_dict(position) for position, job in enumerate(queued, 1)],
+            }
+
+    def shutdown(self) -> List[int]:
+        '''
+        Stop admitting jobs and let idle workers exit. Running agents finish on their own.
+
+        Returns:
+            List[int]: Sessions whose queued jobs were cancelled. Their sessions are
+                still 'pending' in the database; the caller marks them 'cancelled'.
+        '''
+        with self._available:
+            self._shutdown = True
+            cancelled = [job for _, job in sorted(self._queue, key=lambda entry: entry[0])]
+            self._queue.clear()
+            for job in cancelled:
+                self._retire(job, CANCELLED)
+            self._available.notify_all()
+        if cancelled:
+            logger.info(f"Cancelled {len(cancelled)} queued agents on shutdown")
+        return [job.session_id for job in cancelled]
+
+    def _retire(self, job: AgentJob, state: str) -> None:
+        # Caller holds the lock
+        job.state = state
+        job.finished_at = datetime.datetime.now()
+        self._finished.append(job.session_id)
+        while len(self._finished) > MAX_FINISHED_JOBS:
+            session_id = self._finished.popleft()
+            if session_id in self._jobs and self._jobs[session_id].state in (FINISHED, CANCELLED):
+                del self._jobs[session_id]
+
+    def _start_worker(self) -> None:
+        worker = threading.Thread(
+            target=self._worker_loop,
+            name=f"ra-aid-agent-worker-{len(self._workers) + 1}",
+            daemon=True,
+        )
+        self._workers.append(worker)
+        worker.start()
+
+    def _next_job(self) -> Optional[AgentJob]:
+        with self._available:
+            while not self._queue and not self._shutdown:
+                self._available.wait()
+            if self._shutdown:
+                return None
+            _, job = heapq.heappop(self._queue)
+            job.state = RUNNING
+            job.started_at = datetime.datetime.now()
+            self._running += 1
+            return job
+
+    def _worker_loop(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            logger.info(f"Starting agent for session {job.session_id}")
+            try:
+                job.fn(*job.args, **job.kwargs)
+            except Exception:
+                logger.exception(f"Agent for session {job.session_id} raised an error")
+            finally:
+                with self._lock:
+                    self._retire(job, FINISHED)
+                    self._running -= 1
+                    self._completed += 1
+
+
+_executor: Optional[AgentExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_agent_executor() -> AgentExecutor:
+    '''
+    Get the server's agent executor, creating it on first use.
+
+    The worker count comes from the "server_max_agents" config value when a config
+    repository is available, otherwise DEFAULT_SERVER_MAX_AGENTS.
+    '''
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = DEFAULT_SERVER_MAX_AGENTS
+            try:
+                max_workers = get_config_repository().get("server_max_agents") or DEFAULT_SERVER_MAX_AGENTS
+            except RuntimeError:
+                pass
+            _executor = AgentExecutor(max_workers=max_workers)
+        return _executor
+
+
+def shutdown_agent_executor() -> List[int]:
+    '''
+    Shut down the server's agent executor, if it was created, and detach it.
+
+    Returns:
+        List[int]: Sessions whose queued agents were cancelled
+    '''
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is None:
+        return []
+    return executor.shutdown()
+
+
+def set_agent_executor(executor: Optional[AgentExecutor]) -> None:
+    '''Replace the server's agent executor, shutting down the previous one.'''
+    global _executor
+    with _executor_lock:
+        previous, _executor = _executor, executor
+    if previous is not None and previous is not executor:
+        previous.shutdown()
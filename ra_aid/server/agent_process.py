@@ -0,0 +1,126 @@
+'''Run spawned agents in worker processes instead of server threads.
+
+In process mode each agent admitted by the AgentExecutor runs run_agent_thread
+in its own spawned process, so agents no longer share the GIL with the event
+loop or with each other and a crashing agent cannot take the server down. The
+child's broadcasts (trajectories and session updates) travel back over a pipe
+and the parent hands them to send_broadcast, so WebSocket clients see the same
+messages as in thread mode.
+'''
+
+import logging
+import multiprocessing
+import threading
+from typing import Any, Callable, Dict
+
+from ra_aid.database.connection import DatabaseManager
+from ra_aid.database.repositories.config_repository import ConfigRepository
+from ra_aid.database.repositories.session_repository import SessionRepositoryManager
+from ra_aid.server.broadcast_sender import send_broadcast, set_broadcast_queue
+
+logger = logging.getLogger(__name__)
+
+# Spawn rather than fork: the server process holds an event loop, threads and pooled connections
+_mp_context = multiprocessing.get_context("spawn")
+
+
+class PipeBroadcastQueue:
+    '''Broadcast queue for a child process that forwards messages to the parent over a pipe.'''
+
+    def __init__(self, conn: Any):
+        self._conn = conn
+        # Trajectory hooks run on the trajectory writer thread as well as the agent thread
+        self._lock = threading.Lock()
+
+    def put(self, item: Any) -> None:
+        with self._lock:
+            try:
+                self._conn.send(item)
+            except (BrokenPipeError, EOFError, OSError):
+                logger.debug("Parent closed the broadcast pipe, dropping message.")
+
+
+def agent_process_main(
+    conn: Any,
+    message: str,
+    session_id: int,
+    config: Dict[str, Any],
+    research_only: bool,
+    kwargs: Dict[str, Any],
+) -> None:
+    '''Child process entry point: run the agent with broadcasts routed to the pipe.'''
+    from ra_aid.server.api_v1_spawn_agent import run_agent_thread
+
+    set_broadcast_queue(PipeBroadcastQueue(conn))
+    source_config_repo = ConfigRepository()
+    source_config_repo.update(config)
+    try:
+        run_agent_thread(message, session_id, source_config_repo, research_only, **kwargs)
+    finally:
+        conn.close()
+
+
+def run_agent_process(
+    message: str,
+    session_id: int,
+    source_config_repo: ConfigRepository,
+    research_only: bool = False,
+    process_target: Callable[..., None] = agent_process_main,
+    **kwargs: Any,
+) -> int:
+    '''
+    Run an agent in a child process and relay its broadcasts until it exits.
+
+    Takes the same arguments as run_agent_thread and blocks the calling executor
+    worker for the lifetime of the child. If the child dies without finishing
+    normally, the session is marked 'error' here since the child could not do it.
+
+    Args:
+        message: The message or task for the agent to process
+        session_id: The ID of the session to associate with this agent
+        source_config_repo: ConfigRepository whose values the child starts from
+        research_only: Whether to use research-only mode
+        process_target: Child entry point, replaceable for tests
+
+    Returns:
+        int: The child's exit code
+    '''
+    reader, writer = _mp_context.Pipe(duplex=False)
+    process = _mp_context.Process(
+        target=process_target,
+        args=(writer, message, session_id, source_config_repo.to_dict(), research_only, kwargs),
+        name=f"ra-aid-agent-{session_id}",
+        daemon=True,
+    )
+    process.start()
+    # Only the child writes; closing our copy lets recv() see EOF when the child exits
+    writer.close()
+    logger.info(f"Started agent process {process.pid} for session {session_id}")
+
+    try:
+        while True:
+            try:
+                item = reader.recv()
+            except EOFError:
+                break
+            try:
+                send_broadcast(item)
+            except Exception as e:
+                logger.error(f"Failed to relay broadcast from agent process for session {session_id}: {e}")
+    finally:
+        reader.close()
+        process.join()
+
+    if process.exitcode != 0:
+        logger.error(f"Agent process for session {session_id} exited with code {process.exitcode}")
+        _mark_session_failed(session_id)
+    return process.exitcode
+
+
+def _mark_session_failed(session_id: int) -> None:
+    try:
+        with DatabaseManager() as db, SessionRepositoryManager(db) as session_repo:
+            session = session_repo.update_session_status(session_id, 'error')
+            send_broadcast({'type': 'session_update', 'payload': session.model_dump(mode='json')})
+    except Exception as e:
+        logger.error(f"Failed to mark session {session_id} as failed after its agent process died: {e}")
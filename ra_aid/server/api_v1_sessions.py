@@ -7,14 +7,26 @@ It implements routes for creating, listing, and retrieving sessions
 with proper validation and error handling.
 """
 
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 import peewee
 from pydantic import BaseModel, Field
 
+from ra_aid.database.connection import release_connection
 from ra_aid.database.repositories.session_repository import SessionRepository, get_session_repository
 from ra_aid.database.repositories.trajectory_repository import TrajectoryRepository, get_trajectory_repository
 from ra_aid.database.pydantic_models import SessionModel, TrajectoryModel
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Largest page of trajectories returned by one request
+MAX_TRAJECTORY_PAGE_SIZE = 1000
+
+# Response header holding the after_id for the next page of trajectories
+NEXT_AFTER_ID_HEADER = "X-Next-After-Id"
 
 # Create API router
 router = APIRouter(
@@ -74,6 +86,31 @@ class PaginatedSessionResponse(PaginatedResponse):
     items: List[SessionModel]
 
 
+async def run_db(repo: Any, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run blocking repository work in the threadpool so it does not stall the event loop.
+
+    The worker thread's pooled connection is returned afterwards, since threadpool
+    threads are long-lived and would otherwise keep it checked out.
+
+    Args:
+        repo: Repository whose database the work uses
+        fn: Callable doing the database work
+        *args: Positional arguments for fn
+        **kwargs: Keyword arguments for fn
+
+    Returns:
+        Whatever fn returns
+    """
+    def work() -> Any:
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            release_connection(getattr(repo, "db", None))
+
+    return await run_in_threadpool(work)
+
+
 # Dependency to get the session repository
 def get_repository() -> SessionRepository:
     """
@@ -97,6 +134,7 @@ def get_repository() -> SessionRepository:
 async def list_sessions(
     offset: int = Query(0, ge=0, description="Number of sessions to skip"),
     limit: int = Query(10, ge=1, le=100, description="Maximum number of sessions to return"),
+    include_usage: bool = Query(False, description="Include per-session cost and token totals"),
     repo: SessionRepository = Depends(get_repository),
 ) -> PaginatedSessionResponse:
     """
@@ -105,6 +143,7 @@ async def list_sessions(
     Args:
         offset: Number of sessions to skip (default: 0)
         limit: Maximum number of sessions to return (default: 10)
+        include_usage: Whether to include per-session cost and token totals (default: False)
         repo: SessionRepository dependency injection
         
     Returns:
@@ -114,7 +153,9 @@ async def list_sessions(
         HTTPException: With a 500 status code if there's a database error
     """
     try:
-        sessions, total = repo.get_all(offset=offset, limit=limit)
+        sessions, total = await run_db(
+            repo, repo.get_all, offset=offset, limit=limit, include_usage=include_usage
+        )
         return PaginatedSessionResponse(
             total=total,
             items=sessions,
@@ -201,22 +242,80 @@ async def create_session(
         )
 
 
+def _log_empty_trajectory_diagnostics() -> None:
+    """Log whether an empty trajectory result is down to missing data or pending migrations."""
+    from ra_aid.database.models import Trajectory
+    try:
+        total_trajectories = Trajectory.select().count()
+        logger.info(f"Total trajectories in database: {total_trajectories}")
+
+        # Check if the migrations were applied
+        from ra_aid.database.migrations import get_migration_status
+        migration_status = get_migration_status()
+        logger.info(
+            f"Migration status: {migration_status['applied_count']} applied, "
+            f"{migration_status['pending_count']} pending"
+        )
+
+        # If no trajectories but migrations applied, it's just empty data
+        if total_trajectories == 0 and migration_status['pending_count'] == 0:
+            logger.warning(
+                "Database has no trajectories but all migrations are applied. "
+                "The database is properly set up but contains no data."
+            )
+        elif migration_status['pending_count'] > 0:
+            logger.warning(
+                f"There are {migration_status['pending_count']} pending migrations. "
+                "Run migrations to ensure database is properly set up."
+            )
+    except Exception as count_error:
+        logger.error(f"Error checking trajectory count: {str(count_error)}")
+
+
+async def _require_session(session_repo: SessionRepository, session_id: int) -> SessionModel:
+    """Get a session, raising a 404 HTTPException if it does not exist."""
+    session = await run_db(session_repo, session_repo.get, session_id)
+    if not session:
+        logger.warning(f"Session with ID {session_id} not found")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session with ID {session_id} not found",
+        )
+    return session
+
+
 @router.get(
     "/{session_id}/trajectory",
     response_model=List[TrajectoryModel],
     summary="Get session trajectories",
-    description="Get all trajectory records associated with a specific session",
+    description=(
+        "Get trajectory records associated with a specific session. Pass limit to page "
+        f"through them: the {NEXT_AFTER_ID_HEADER} response header holds the after_id "
+        "for the next page and is absent on the last page."
+    ),
 )
 async def get_session_trajectories(
     session_id: int,
+    response: Response,
+    after_id: Optional[int] = Query(None, ge=0, description="Only return records with an ID greater than this"),
+    limit: Optional[int] = Query(
+        None, ge=1, le=MAX_TRAJECTORY_PAGE_SIZE, description="Maximum number of records to return"
+    ),
+    fields: Literal["full", "summary"] = Query(
+        "full", description="Use summary to leave out tool_result and step_data"
+    ),
     session_repo: SessionRepository = Depends(get_repository),
     trajectory_repo: TrajectoryRepository = Depends(get_trajectory_repository),
 ) -> List[TrajectoryModel]:
     """
-    Get all trajectory records for a specific session.
+    Get trajectory records for a specific session.
     
     Args:
         session_id: The ID of the session to get trajectories for
+        response: Response used to set the next-page header
+        after_id: Only return records with an ID greater than this
+        limit: Maximum number of records to return (default: all)
+        fields: "full" for complete records, "summary" to skip tool_result and step_data
         session_repo: SessionRepository dependency injection
         trajectory_repo: TrajectoryRepository dependency injection
         
@@ -227,57 +326,29 @@ async def get_session_trajectories(
         HTTPException: With a 404 status code if the session is not found
         HTTPException: With a 500 status code if there's a database error
     """
-    # Import the logger
-    from ra_aid.logging_config import get_logger
-    logger = get_logger(__name__)
-    
     logger.info(f"Fetching trajectories for session ID: {session_id}")
     
     try:
-        # Verify the session exists
-        session = session_repo.get(session_id)
-        if not session:
-            logger.warning(f"Session with ID {session_id} not found")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Session with ID {session_id} not found",
-            )
+        await _require_session(session_repo, session_id)
             
-        # Get trajectories for the session
-        trajectories = trajectory_repo.get_trajectories_by_session(session_id)
+        trajectories = await run_db(
+            trajectory_repo,
+            trajectory_repo.get_trajectories_by_session,
+            session_id,
+            after_id=after_id,
+            limit=limit,
+            include_payload=fields == "full",
+        )
         
         # Log the number of trajectories found
         logger.info(f"Found {len(trajectories)} trajectories for session ID: {session_id}")
+
+        if limit is not None and len(trajectories) == limit:
+            response.headers[NEXT_AFTER_ID_HEADER] = str(trajectories[-1].id)
         
         # If no trajectories were found, check if the database has any trajectories at all
-        if not trajectories:
-            # Try to get total trajectory count to verify if the DB is populated
-            from ra_aid.database.models import Trajectory
-            try:
-                total_trajectories = Trajectory.select().count()
-                logger.info(f"Total trajectories in database: {total_trajectories}")
-                
-                # Check if the migrations were applied
-                from ra_aid.database.migrations import get_migration_status
-                migration_status = get_migration_status()
-                logger.info(
-                    f"Migration status: {migration_status['applied_count']} applied, "
-                    f"{migration_status['pending_count']} pending"
-                )
-                
-                # If no trajectories but migrations applied, it's just empty data
-                if total_trajectories == 0 and migration_status['pending_count'] == 0:
-                    logger.warning(
-                        "Database has no trajectories but all migrations are applied. "
-                        "The database is properly set up but contains no data."
-                    )
-                elif migration_status['pending_count'] > 0:
-                    logger.warning(
-                        f"There are {migration_status['pending_count']} pending migrations. "
-                        "Run migrations to ensure database is properly set up."
-                    )
-            except Exception as count_error:
-                logger.error(f"Error checking trajectory count: {str(count_error)}")
+        if not trajectories and after_id is None:
+            await run_db(trajectory_repo, _log_empty_trajectory_diagnostics)
         
         return trajectories
     except peewee.DatabaseError as e:
@@ -285,4 +356,68 @@ async def get_session_trajectories(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database error: {str(e)}",
-        )
\ No newline at end of file
+        )
+
+
+@router.get(
+    "/{session_id}/trajectory/stream",
+    response_class=StreamingResponse,
+    summary="Stream session trajectories",
+    description=(
+        "Stream trajectory records for a session as newline-delimited JSON, "
+        "one record per line, in ID order"
+    ),
+)
+async def stream_session_trajectories(
+    session_id: int,
+    after_id: Optional[int] = Query(None, ge=0, description="Only return records with an ID greater than this"),
+    fields: Literal["full", "summary"] = Query(
+        "full", description="Use summary to leave out tool_result and step_data"
+    ),
+    session_repo: SessionRepository = Depends(get_repository),
+    trajectory_repo: TrajectoryRepository = Depends(get_trajectory_repository),
+) -> StreamingResponse:
+    """
+    Stream trajectory records for a specific session as NDJSON.
+
+    Records are read in keyset-paginated batches on the threadpool, so neither the
+    whole result nor a database cursor is held while the client reads.
+
+    Args:
+        session_id: The ID of the session to stream trajectories for
+        after_id: Only return records with an ID greater than this
+        fields: "full" for complete records, "summary" to skip tool_result and step_data
+        session_repo: SessionRepository dependency injection
+        trajectory_repo: TrajectoryRepository dependency injection
+
+    Returns:
+        StreamingResponse: application/x-ndjson body with one TrajectoryModel per line
+
+    Raises:
+        HTTPException: With a 404 status code if the session is not found
+        HTTPException: With a 500 status code if there's a database error
+    """
+    try:
+        await _require_session(session_repo, session_id)
+    except peewee.DatabaseError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}",
+        )
+
+    def ndjson_lines() -> Iterator[str]:
+        # StreamingResponse runs this generator on the threadpool, one batch per step
+        batches = trajectory_repo.iter_trajectories_by_session(
+            session_id, after_id=after_id, include_payload=fields == "full"
+        )
+        try:
+            for batch in batches:
+                release_connection(getattr(trajectory_repo, "db", None))
+                yield "".join(f"{trajectory.model_dump_json()}\n" for trajectory in batch)
+        except peewee.DatabaseError as e:
+            # Headers are already sent, so the stream just ends early
+            logger.error(f"Database error streaming trajectories for session {session_id}: {str(e)}")
+        finally:
+            release_connection(getattr(trajectory_repo, "db", None))
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
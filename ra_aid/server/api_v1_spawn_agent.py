@@ -1,7 +1,7 @@
 '''API router for spawning an RA.Aid agent.'''
 
-import threading
 import logging
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
@@ -18,9 +18,12 @@ from ra_aid.database.repositories.trajectory_repository import TrajectoryReposit
 from ra_aid.database.repositories.work_log_repository import WorkLogRepositoryManager
 from ra_aid.database.repositories.config_repository import ConfigRepositoryManager, get_config_repository
 from ra_aid.database.pydantic_models import SessionModel # Added for broadcasting
-from ra_aid.env_inv_context import EnvInvManager
+from ra_aid.env_inv_context import EnvInvManager, get_env_inv
 from ra_aid.env_inv import EnvDiscovery
 from ra_aid.llm import initialize_llm, get_model_default_temperature
+from ra_aid.config import DEFAULT_SERVER_AGENT_MODE
+from ra_aid.server.agent_executor import AgentExecutor, get_agent_executor
+from ra_aid.server.agent_process import run_agent_process
 from ra_aid.server.broadcast_sender import send_broadcast
 
 # Create logger
@@ -53,6 +56,10 @@ class SpawnAgentRequest(BaseModel):
         default=False,
         description="Whether to use research-only mode"
     )
+    priority: int = Field(
+        default=0,
+        description="Admission priority; higher priorities leave the queue first"
+    )
 
 class SpawnAgentResponse(BaseModel):
     '''
@@ -62,10 +69,81 @@ class SpawnAgentResponse(BaseModel):
 
     Attributes:
         session_id: The ID of the created session
+        queue_position: 1-based position in the admission queue, or None once a worker runs the agent
     '''
     session_id: int = Field(
         description="The ID of the created session"
     )
+    queue_position: Optional[int] = Field(
+        default=None,
+        description="1-based position in the admission queue, or None once a worker runs the agent"
+    )
+
+class AgentJobStatus(BaseModel):
+    '''
+    Pydantic model for the state of one spawned agent in the worker pool.
+
+    Attributes:
+        session_id: The session the agent belongs to
+        state: One of queued, running, finished or cancelled
+        priority: Admission priority the agent was spawned with
+        queue_position: 1-based position in the admission queue while queued
+        queued_at: When the agent was spawned
+        started_at: When a worker started the agent
+        finished_at: When the agent finished or was cancelled
+    '''
+    session_id: int
+    state: str
+    priority: int
+    queue_position: Optional[int] = None
+    queued_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+class AgentQueueStatus(BaseModel):
+    '''
+    Pydantic model for agent worker pool utilization.
+
+    Attributes:
+        max_workers: Agents that may run at once
+        running: Agents running now
+        queued: Agents waiting for a worker
+        completed: Agents finished since the server started
+        utilization: running / max_workers
+        running_jobs: The running agents
+        queued_jobs: The waiting agents in admission order
+    '''
+    max_workers: int
+    running: int
+    queued: int
+    completed: int
+    utilization: float
+    running_jobs: List[AgentJobStatus]
+    queued_jobs: List[AgentJobStatus]
+
+def get_executor() -> AgentExecutor:
+    '''
+    Get the agent executor.
+
+    This function is used as a FastAPI dependency and can be overridden
+    in tests using dependency_overrides.
+    '''
+    return get_agent_executor()
+
+def mark_session_cancelled(repo: SessionRepository, session_id: int) -> None:
+    '''
+    Mark the session of a cancelled queued agent 'cancelled' and broadcast the update.
+
+    Args:
+        repo: SessionRepository holding the session
+        session_id: The session the agent was spawned for
+    '''
+    try:
+        session = repo.update_session_status(session_id, 'cancelled')
+        if session:
+            send_broadcast({'type': 'session_update', 'payload': session.model_dump(mode='json')})
+    except Exception as e:
+        logger.error(f"Failed to update/broadcast cancelled status for session {session_id}: {e}")
 
 def run_agent_thread(
     message: str,
@@ -82,6 +160,9 @@ def run_agent_thread(
         session_id: The ID of the session to associate with this agent (must be int)
         source_config_repo: The source ConfigRepository to copy for this thread
         research_only: Whether to use research-only mode
+        **kwargs: Optional ``thread_config`` overrides and the server's
+            ``env_data`` inventory; the inventory is discovered again
+            (using the configured project state dir) when not provided
 
     Note:
         Values for expert_enabled and web_research_enabled are retrieved from the
@@ -98,9 +179,14 @@ def run_agent_thread(
         # Initialize database connection
         db = DatabaseManager()
 
-        env_discovery = EnvDiscovery()
-        env_discovery.discover()
-        env_data = env_discovery.format_markdown()
+        # Reuse the inventory the server discovered at startup when available
+        env_data = kwargs.get("env_data")
+        if env_data is None:
+            env_discovery = EnvDiscovery(
+                cache_dir=source_config_repo.get("project_state_dir")
+            )
+            env_discovery.discover()
+            env_data = env_discovery.format_markdown()
 
         # Get the thread configuration from kwargs
         thread_config = kwargs.get("thread_config", {})
@@ -144,7 +230,7 @@ def run_agent_thread(
             # ---> Update status to running and broadcast <--- END
 
             # Import here to avoid circular imports
-            from ra_aid.__main__ import run_research_agent
+            from ra_aid.agents.research_agent import run_research_agent
 
             # Get configuration values from config repository
             provider = config_repo.get("provider", "anthropic")
@@ -275,13 +361,18 @@ def run_agent_thread(
 async def spawn_agent(
     request: SpawnAgentRequest,
     repo: SessionRepository = Depends(get_session_repository),
+    executor: AgentExecutor = Depends(get_executor),
 ) -> SpawnAgentResponse:
     '''
     Spawn a new RA.Aid agent to process a message or task.
 
+    The agent is queued on the bounded agent worker pool and starts once a
+    worker is free.
+
     Args:
         request: Request body with message and agent configuration.
         repo: SessionRepository dependency injection
+        executor: AgentExecutor dependency injection
 
     Returns:
         SpawnAgentResponse: Response with session ID
@@ -326,28 +417,133 @@ async def spawn_agent(
             "thread_id": str(session_id_int),
         }
 
-        # Start the agent thread
-        thread = threading.Thread(
-            target=run_agent_thread,
-            args=(
-                request.message,
-                session_id_int, # Pass the integer ID
-                config_repo,
-                request.research_only,
-            ),
-            kwargs={
-                "temperature": temperature,
-                "thread_config": thread_config,
-            }
+        # In process mode the worker runs the agent in a child process
+        agent_mode = config_repo.get("server_agent_mode", DEFAULT_SERVER_AGENT_MODE)
+        agent_fn = run_agent_process if agent_mode == "process" else run_agent_thread
+
+        # Hand the server's environment inventory to the agent so it is not rediscovered
+        try:
+            env_data = get_env_inv()
+        except RuntimeError:
+            env_data = None
+
+        # Queue the agent; the session stays 'pending' until a worker starts it
+        job = executor.submit(
+            session_id_int,
+            agent_fn,
+            request.message,
+            session_id_int, # Pass the integer ID
+            config_repo,
+            request.research_only,
+            priority=request.priority,
+            temperature=temperature,
+            thread_config=thread_config,
+            env_data=env_data,
         )
-        thread.daemon = True  # Thread will terminate when main process exits
-        thread.start()
+        queue_position = (executor.get_job(job.session_id) or {}).get("queue_position")
 
         # Return the session ID as int
-        return SpawnAgentResponse(session_id=session_id_int)
+        return SpawnAgentResponse(session_id=session_id_int, queue_position=queue_position)
     except Exception as e:
         logger.exception(f"Error spawning agent: {e}") # Use logger.exception for stacktrace
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error spawning agent: {str(e)}",
         )
+
+
+@router.get(
+    "/queue",
+    response_model=AgentQueueStatus,
+    summary="Agent queue status",
+    description="Get worker utilization and the agents waiting for a worker",
+)
+async def get_agent_queue(
+    executor: AgentExecutor = Depends(get_executor),
+) -> AgentQueueStatus:
+    '''
+    Report worker utilization and the admission queue.
+
+    Args:
+        executor: AgentExecutor dependency injection
+
+    Returns:
+        AgentQueueStatus: Running and queued agents
+    '''
+    return AgentQueueStatus(**executor.stats())
+
+
+@router.get(
+    "/{session_id}",
+    response_model=AgentJobStatus,
+    summary="Agent status",
+    description="Get the state and queue position of a spawned agent",
+)
+async def get_agent_status(
+    session_id: int,
+    executor: AgentExecutor = Depends(get_executor),
+) -> AgentJobStatus:
+    '''
+    Get the state and queue position of a spawned agent.
+
+    Args:
+        session_id: The session the agent was spawned for
+        executor: AgentExecutor dependency injection
+
+    Returns:
+        AgentJobStatus: The agent's state
+
+    Raises:
+        HTTPException: With a 404 status code if no agent was spawned for the session
+    '''
+    job = executor.get_job(session_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No agent spawned for session {session_id}",
+        )
+    return AgentJobStatus(**job)
+
+
+@router.delete(
+    "/{session_id}",
+    response_model=AgentJobStatus,
+    summary="Cancel agent",
+    description="Cancel a spawned agent that is still waiting for a worker",
+)
+async def cancel_agent(
+    session_id: int,
+    repo: SessionRepository = Depends(get_session_repository),
+    executor: AgentExecutor = Depends(get_executor),
+) -> AgentJobStatus:
+    '''
+    Cancel a queued agent and mark its session 'cancelled'.
+
+    Agents that a worker has already started cannot be cancelled.
+
+    Args:
+        session_id: The session the agent was spawned for
+        repo: SessionRepository dependency injection
+        executor: AgentExecutor dependency injection
+
+    Returns:
+        AgentJobStatus: The cancelled agent's state
+
+    Raises:
+        HTTPException: With a 404 status code if no agent was spawned for the session,
+            or a 409 status code if the agent already started
+    '''
+    if not executor.cancel(session_id):
+        job = executor.get_job(session_id)
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No agent spawned for session {session_id}",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Agent for session {session_id} is {job['state']} and can no longer be cancelled",
+        )
+
+    mark_session_cancelled(repo, session_id)
+    return AgentJobStatus(**executor.get_job(session_id))
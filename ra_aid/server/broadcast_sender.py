@@ -1,13 +1,45 @@
-import queue
+import asyncio
 import logging
 from typing import Any
 from ra_aid.database.pydantic_models import TrajectoryModel  # Import TrajectoryModel
 
 logger = logging.getLogger(__name__)
 
-_broadcast_queue: queue.Queue | None = None
 
-def set_broadcast_queue(queue_instance: queue.Queue):
+class BroadcastQueue:
+    """Event loop native queue that agent threads can put broadcast messages on.
+
+    put() is safe to call from any thread: the item is handed to the loop with
+    call_soon_threadsafe, so the consumer awaits items directly instead of
+    polling a thread queue from a worker thread.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def put(self, item: Any) -> None:
+        """Queue an item for the consumer. Items put after the loop has closed are dropped."""
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+        except RuntimeError:
+            logger.debug("Event loop closed, dropping broadcast message.")
+
+    async def get(self) -> Any:
+        """Wait for the next item."""
+        return await self._queue.get()
+
+    def get_nowait(self) -> Any:
+        """Return the next item without waiting. Raises asyncio.QueueEmpty if there is none."""
+        return self._queue.get_nowait()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+
+_broadcast_queue: BroadcastQueue | None = None
+
+def set_broadcast_queue(queue_instance: BroadcastQueue):
     """Sets the global broadcast queue instance for this module."""
     global _broadcast_queue
     _broadcast_queue = queue_instance
@@ -1,31 +1,222 @@
-\
+import asyncio
 import logging
-from typing import List
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, Iterable, List, Optional, Set, Tuple
 
 from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
 
+# Frames a client may have waiting before the oldest ones are dropped
+DEFAULT_CLIENT_QUEUE_SIZE = 1000
+
+
+class ClientConnection:
+    """A connected WebSocket client with its own bounded send queue.
+
+    Frames are sent by a dedicated task, so a slow client only backs up its own
+    queue. When the queue is full the oldest frame is dropped. A frame queued with
+    a coalesce key replaces a still-unsent frame with the same key instead of
+    queueing behind it.
+
+    A client receives frames for every session until it subscribes to specific
+    session ids. While missed trajectories of a session are being replayed, live
+    frames for that session are held back and delivered after the replay.
+    """
+
+    def __init__(self, websocket: WebSocket, max_queue_size: int = DEFAULT_CLIENT_QUEUE_SIZE):
+        self.websocket = websocket
+        self.max_queue_size = max_queue_size
+        # Entries are [coalesce_key, message] lists so coalescing can swap the message in place
+        self._queue: Deque[List[Any]] = deque()
+        self._pending_keys: Dict[Hashable, List[Any]] = {}
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.peak_queue_depth = 0
+        # None means the client has not subscribed and receives every session
+        self.session_ids: Optional[Set[int]] = None
+        # Live frames held back per session while its missed rows are replayed
+        self._replaying: Dict[int, List[Tuple[str, Optional[Hashable], Optional[int]]]] = {}
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._send_loop())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, message: str, coalesce_key: Optional[Hashable] = None) -> None:
+        """Queue a serialized frame without waiting for it to be sent."""
+        if coalesce_key is not None:
+            entry = self._pending_keys.get(coalesce_key)
+            if entry is not None:
+                entry[1] = message
+                self.coalesced += 1
+                return
+
+        if len(self._queue) >= self.max_queue_size:
+            oldest = self._queue.popleft()
+            self._forget(oldest)
+            self.dropped += 1
+
+        entry = [coalesce_key, message]
+        self._queue.append(entry)
+        if coalesce_key is not None:
+            self._pending_keys[coalesce_key] = entry
+        self.peak_queue_depth = max(self.peak_queue_depth, len(self._queue))
+        self._ready.set()
+
+    def wants(self, session_id: Optional[int]) -> bool:
+        """Whether frames for session_id go to this client. Frames without a session go to everyone."""
+        return self.session_ids is None or session_id is None or session_id in self.session_ids
+
+    def subscribe(self, session_ids: Iterable[int]) -> None:
+        if self.session_ids is None:
+            self.session_ids = set()
+        self.session_ids.update(session_ids)
+
+    def unsubscribe(self, session_ids: Iterable[int]) -> None:
+        if self.session_ids is not None:
+            self.session_ids.difference_update(session_ids)
+
+    def offer(
+        self,
+        message: str,
+        coalesce_key: Optional[Hashable] = None,
+        session_id: Optional[int] = None,
+        trajectory_id: Optional[int] = None,
+    ) -> None:
+        """Queue a live frame if the client wants its session, holding it back during a replay."""
+        if not self.wants(session_id):
+            return
+        held = self._replaying.get(session_id)
+        if held is not None:
+            held.append((message, coalesce_key, trajectory_id))
+            return
+        self.enqueue(message, coalesce_key)
+
+    def begin_replay(self, session_id: int) -> bool:
+        """Start holding back live frames for a session. Returns False if a replay is already running."""
+        if session_id in self._replaying:
+            return False
+        self._replaying[session_id] = []
+        return True
+
+    def finish_replay(
+        self, session_id: int, frames: List[str], replayed_through: Optional[int] = None
+    ) -> None:
+        """
+        Queue the replayed frames, then the live frames held back during the replay.
+
+        Held trajectories with an id at or below replayed_through were part of the
+        replay and are skipped.
+        """
+        held = self._replaying.pop(session_id, [])
+        for message in frames:
+            self.enqueue(message)
+        for message, coalesce_key, trajectory_id in held:
+            if replayed_through is not None and trajectory_id is not None and trajectory_id <= replayed_through:
+                continue
+            self.enqueue(message, coalesce_key)
+
+    def _forget(self, entry: List[Any]) -> None:
+        key = entry[0]
+        if key is not None and self._pending_keys.get(key) is entry:
+            del self._pending_keys[key]
+
+    async def _send_loop(self) -> None:
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                while self._queue:
+                    entry = self._queue.popleft()
+                    self._forget(entry)
+                    await self.websocket.send_text(entry[1])
+                    self.sent += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Failed to send message to client {self.websocket.client}: {e}")
+            # Disconnect logic in the endpoint handles cleanup
+            self.dropped += len(self._queue)
+            self._queue.clear()
+            self._pending_keys.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "client": str(self.websocket.client),
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "session_ids": sorted(self.session_ids) if self.session_ids is not None else None,
+        }
+
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(self, max_queue_size: int = DEFAULT_CLIENT_QUEUE_SIZE):
+        self.max_queue_size = max_queue_size
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.clients)
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        client = ClientConnection(websocket, self.max_queue_size)
+        self.clients[websocket] = client
+        client.start()
 
     def disconnect(self, websocket: WebSocket):
-        try:
-            self.active_connections.remove(websocket)
-        except ValueError:
-            # WebSocket might already be removed, ignore
-            pass
+        # WebSocket might already be removed, ignore
+        client = self.clients.pop(websocket, None)
+        if client is not None:
+            client.stop()
+
+    def get(self, websocket: WebSocket) -> Optional[ClientConnection]:
+        return self.clients.get(websocket)
+
+    def broadcast(
+        self,
+        message: str,
+        coalesce_key: Optional[Hashable] = None,
+        session_id: Optional[int] = None,
+        trajectory_id: Optional[int] = None,
+    ):
+        """Queue a serialized message for every client subscribed to its session.
+
+        Returns immediately; each client's send task delivers the frame, so a
+        slow client never holds up the others.
+        """
+        for client in list(self.clients.values()):
+            client.offer(message, coalesce_key, session_id, trajectory_id)
+
+    def close(self) -> None:
+        """Stop every client's send task."""
+        for client in self.clients.values():
+            client.stop()
+        self.clients.clear()
 
-    async def broadcast(self, message: str):
-        # Iterate over a copy in case disconnect happens during broadcast
-        for connection in self.active_connections[:]:
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.error(f"Failed to send message to client {connection.client}: {e}")
-                # Disconnect logic should handle cleanup, don't remove here
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and delivery counters per client and in total."""
+        clients = [client.stats() for client in self.clients.values()]
+        return {
+            "connections": len(clients),
+            "max_queue_size": self.max_queue_size,
+            "queue_depth": sum(c["queue_depth"] for c in clients),
+            "sent": sum(c["sent"] for c in clients),
+            "dropped": sum(c["dropped"] for c in clients),
+            "coalesced": sum(c["coalesced"] for c in clients),
+            "clients": clients,
+        }
@@ -5,8 +5,7 @@ import logging
 import os
 import sys
 from pathlib import Path
-from typing import AsyncGenerator, Callable, Any
-import queue
+from typing import AsyncGenerator, Callable, Any, Dict, List, Optional, Tuple
 import json
 
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, Response
@@ -29,42 +28,80 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from ra_aid.server.api_v1_sessions import router as sessions_router
-from ra_aid.server.api_v1_spawn_agent import router as spawn_agent_router
-from ra_aid.server.connection_manager import ConnectionManager
-from ra_aid.server.broadcast_sender import set_broadcast_queue
+from ra_aid.server.api_v1_sessions import router as sessions_router, run_db
+from ra_aid.server.api_v1_spawn_agent import mark_session_cancelled, router as spawn_agent_router
+from ra_aid.server.agent_executor import shutdown_agent_executor
+from ra_aid.server.connection_manager import ClientConnection, ConnectionManager
+from ra_aid.database.repositories.session_repository import get_session_repository
+from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
+from ra_aid.server.broadcast_sender import BroadcastQueue, set_broadcast_queue
 
 _app_instance: FastAPI = None
 
-async def broadcast_consumer(q: queue.Queue[Any], manager: ConnectionManager):
+# Upper bound on messages serialized and fanned out in one consumer tick
+BROADCAST_BATCH_SIZE = 500
+
+def serialize_broadcast(wrapper: Any) -> str | None:
+    """Serialize a queued {'type': ..., 'payload': ...} wrapper once for all clients."""
+    if not isinstance(wrapper, dict) or 'type' not in wrapper or 'payload' not in wrapper:
+        logger.warning(f"Received unexpected item format from broadcast queue: {type(wrapper)}. Expected {{'type': ..., 'payload': ...}}. Item: {str(wrapper)[:200]}...")
+        return None
+
+    payload = wrapper['payload']
+    message_type = wrapper['type']
+
+    try:
+        if hasattr(payload, 'model_dump') and callable(payload.model_dump):
+            serializable_payload = payload.model_dump(mode='json')
+        else:
+            serializable_payload = payload
+        return json.dumps({**wrapper, 'payload': serializable_payload})
+    except TypeError:
+        logger.warning(f"Could not JSON serialize wrapped message with type '{message_type}'. Payload type: {type(payload)}, Original Payload Preview: {str(payload)[:100]}... Wrapper Preview: {str(wrapper)[:200]}...")
+    except Exception as e:
+        logger.error(f"Error during serialization of wrapper in broadcast_consumer: {e}. Wrapper Preview: {str(wrapper)[:200]}...")
+    return None
+
+def broadcast_coalesce_key(wrapper: Any) -> Any:
+    """Key under which an unsent message may be replaced by a newer one, or None.
+
+    Only the latest state of a session matters, so queued session updates for
+    the same session coalesce. Trajectories are never coalesced.
+    """
+    if wrapper.get('type') != 'session_update':
+        return None
+    payload = wrapper.get('payload')
+    session_id = payload.get('id') if isinstance(payload, dict) else getattr(payload, 'id', None)
+    return ('session_update', session_id) if session_id is not None else None
+
+def broadcast_target(wrapper: Any) -> Tuple[Optional[int], Optional[int]]:
+    """Return the (session_id, trajectory_id) a queued message belongs to, each possibly None."""
+    payload = wrapper.get('payload')
+
+    def field(name: str) -> Any:
+        return payload.get(name) if isinstance(payload, dict) else getattr(payload, name, None)
+
+    if wrapper.get('type') == 'trajectory':
+        return field('session_id'), field('id')
+    if wrapper.get('type') == 'session_update':
+        return field('id'), None
+    return None, None
+
+async def broadcast_consumer(q: BroadcastQueue, manager: ConnectionManager):
     while True:
         try:
-            wrapper = await asyncio.to_thread(q.get, timeout=1.0)
-            if not isinstance(wrapper, dict) or 'type' not in wrapper or 'payload' not in wrapper:
-                logger.warning(f"Received unexpected item format from broadcast queue: {type(wrapper)}. Expected {{'type': ..., 'payload': ...}}. Item: {str(wrapper)[:200]}...")
-                continue
-
-            payload = wrapper['payload']
-            message_type = wrapper['type']
-            serializable_payload = None
-
-            try:
-                if hasattr(payload, 'model_dump') and callable(payload.model_dump):
-                    serializable_payload = payload.model_dump(mode='json')
-                else:
-                    serializable_payload = payload
-                wrapper['payload'] = serializable_payload
-                message_str = json.dumps(wrapper)
-            except TypeError:
-                logger.warning(f"Could not JSON serialize wrapped message with type '{message_type}'. Payload type: {type(payload)}, Original Payload Preview: {str(payload)[:100]}... Wrapper Preview: {str(wrapper)[:200]}...")
-                continue
-            except Exception as e:
-                logger.error(f"Error during serialization of wrapper in broadcast_consumer: {e}. Wrapper Preview: {str(wrapper)[:200]}...")
-                continue
-
-            await manager.broadcast(message_str)
-        except queue.Empty:
-            continue
+            batch = [await q.get()]
+            while len(batch) < BROADCAST_BATCH_SIZE:
+                try:
+                    batch.append(q.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            for wrapper in batch:
+                message_str = serialize_broadcast(wrapper)
+                if message_str is not None:
+                    session_id, trajectory_id = broadcast_target(wrapper)
+                    manager.broadcast(message_str, broadcast_coalesce_key(wrapper), session_id, trajectory_id)
         except asyncio.CancelledError:
             logger.info("Broadcast consumer task cancelled.")
             break
@@ -79,7 +116,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Application startup: Initializing resources.")
     app.state.loop = asyncio.get_running_loop()
 
-    app.state.broadcast_queue = queue.Queue()
+    app.state.broadcast_queue = BroadcastQueue(app.state.loop)
     set_broadcast_queue(app.state.broadcast_queue)
 
     app.state.connection_manager = ConnectionManager()
@@ -90,6 +127,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     yield
 
     logger.info("Application shutdown: Cleaning up resources.")
+    # Queued agents will never run; close their sessions while updates can still be broadcast
+    cancelled_sessions = shutdown_agent_executor()
+    if cancelled_sessions:
+        try:
+            session_repo = get_session_repository()
+        except RuntimeError as e:
+            logger.error(f"Cannot mark {len(cancelled_sessions)} queued sessions cancelled: {e}")
+        else:
+            for session_id in cancelled_sessions:
+                mark_session_cancelled(session_repo, session_id)
     if hasattr(app.state, 'broadcast_task') and app.state.broadcast_task:
         app.state.broadcast_task.cancel()
         try:
@@ -101,6 +148,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             logger.info("Broadcast consumer task already cancelled.")
         except Exception:
             logger.exception("Error during broadcast consumer task cancellation.")
+    if hasattr(app.state, 'connection_manager'):
+        app.state.connection_manager.close()
 
     _app_instance = None
     logger.info("Application shutdown complete.")
@@ -133,6 +182,86 @@ if ASSETS_DIR.exists() and ASSETS_DIR.is_dir():
 else:
     logger.warning(f"Assets directory not found or not a directory, skipping mount: {ASSETS_DIR}")
 
+# Most missed trajectories replayed on resume; beyond this the client is told to refetch
+MAX_REPLAY_ROWS = 500
+
+def _ws_frame(message_type: str, payload: Any) -> str:
+    return json.dumps({'type': message_type, 'payload': payload})
+
+def _parse_session_ids(value: Any) -> List[int]:
+    if not isinstance(value, list) or not all(isinstance(v, int) and not isinstance(v, bool) for v in value):
+        raise ValueError("session_ids must be a list of integers")
+    return value
+
+async def replay_session(client: ClientConnection, session_id: int, after_id: int) -> None:
+    """Queue the trajectories of a session recorded after after_id, ahead of live frames."""
+    if not client.begin_replay(session_id):
+        return
+
+    frames: List[str] = []
+    replayed_through: Optional[int] = None
+    try:
+        repo = get_trajectory_repository()
+        limit = min(MAX_REPLAY_ROWS, client.max_queue_size)
+        trajectories = await run_db(
+            repo, repo.get_trajectories_by_session, session_id, after_id=after_id, limit=limit + 1
+        )
+        if len(trajectories) > limit:
+            frames.append(_ws_frame('resync_required', {'session_id': session_id, 'after_id': after_id}))
+        else:
+            for trajectory in trajectories:
+                message_str = serialize_broadcast({'type': 'trajectory', 'payload': trajectory})
+                if message_str is not None:
+                    frames.append(message_str)
+                replayed_through = trajectory.id
+            frames.append(_ws_frame('replay_complete', {
+                'session_id': session_id,
+                'replayed': len(trajectories),
+                'last_trajectory_id': replayed_through if replayed_through is not None else after_id,
+            }))
+    except Exception as e:
+        logger.error(f"Failed to replay trajectories of session {session_id} for client {client.websocket.client}: {e}")
+        frames.append(_ws_frame('resync_required', {'session_id': session_id, 'after_id': after_id}))
+    finally:
+        client.finish_replay(session_id, frames, replayed_through)
+
+async def handle_client_message(client: ClientConnection, data: str) -> None:
+    """
+    Apply a control message sent by a WebSocket client.
+
+    {"type": "subscribe", "session_ids": [1, 2], "resume": {"1": 40}} limits the
+    client to those sessions and replays trajectories of session 1 with an id
+    above 40. {"type": "unsubscribe", "session_ids": [2]} stops a session.
+    Clients that never subscribe receive every session.
+    """
+    try:
+        message = json.loads(data)
+    except ValueError:
+        # Plain text such as heartbeat pings carries no control message
+        return
+    if not isinstance(message, dict):
+        return
+
+    message_type = message.get('type')
+    try:
+        if message_type == 'subscribe':
+            session_ids = _parse_session_ids(message.get('session_ids'))
+            resume = message.get('resume') or {}
+            if not isinstance(resume, dict):
+                raise ValueError("resume must map session ids to the last trajectory id received")
+            resume_from: Dict[int, int] = {int(k): int(v) for k, v in resume.items()}
+            client.subscribe(session_ids)
+            client.enqueue(_ws_frame('subscribed', {'session_ids': sorted(client.session_ids)}))
+            for session_id in session_ids:
+                if session_id in resume_from:
+                    await replay_session(client, session_id, resume_from[session_id])
+        elif message_type == 'unsubscribe':
+            client.unsubscribe(_parse_session_ids(message.get('session_ids')))
+            subscribed = sorted(client.session_ids) if client.session_ids is not None else None
+            client.enqueue(_ws_frame('subscribed', {'session_ids': subscribed}))
+    except (TypeError, ValueError) as e:
+        client.enqueue(_ws_frame('error', {'message': f"Invalid {message_type} message: {e}"}))
+
 @app.websocket("/v1/ws")
 async def websocket_endpoint(websocket: WebSocket):
     manager: ConnectionManager = websocket.app.state.connection_manager
@@ -141,6 +270,9 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         while True:
             data = await websocket.receive_text()
+            client = manager.get(websocket)
+            if client is not None:
+                await handle_client_message(client, data)
     except WebSocketDisconnect:
         logger.info(f"WebSocket client disconnected: {websocket.client}")
     except Exception as e:
@@ -149,6 +281,11 @@ async def websocket_endpoint(websocket: WebSocket):
         manager.disconnect(websocket)
         logger.info(f"WebSocket connection closed for client: {websocket.client}")
 
+@app.get("/v1/ws/stats")
+async def websocket_stats(request: Request):
+    """Report per-client send queue depth and sent, dropped and coalesced frame counts."""
+    return request.app.state.connection_manager.stats()
+
 @app.get("/", response_class=Response)
 async def get_root(request: Request) -> Response:
     if INDEX_HTML_PATH.exists() and INDEX_HTML_PATH.is_file():
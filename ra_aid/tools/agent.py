@@ -24,9 +24,6 @@ from ra_aid.database.repositories.trajectory_repository import get_trajectory_re
 from ra_aid.database.repositories.related_files_repository import get_related_files_repository
 from ra_aid.database.repositories.research_note_repository import get_research_note_repository
 from ra_aid.exceptions import AgentInterrupt
-from ra_aid.model_formatters import format_key_facts_dict
-from ra_aid.model_formatters.key_snippets_formatter import format_key_snippets_dict
-from ra_aid.model_formatters.research_notes_formatter import format_research_notes_dict
 
 from ra_aid.llm import initialize_llm
 from .human import ask_human
@@ -80,13 +77,13 @@ def request_research(query: str) -> ResearchResult:
         
         print_error(error_message)
         try:
-            key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
+            key_facts = get_key_fact_repository().get_formatted_facts()
         except RuntimeError as e:
             logger.error(f"Failed to access key fact repository: {str(e)}")
             key_facts = ""
 
         try:
-            key_snippets = format_key_snippets_dict(get_key_snippet_repository().get_snippets_dict())
+            key_snippets = get_key_snippet_repository().get_formatted_snippets()
         except RuntimeError as e:
             logger.error(f"Failed to access key snippet repository: {str(e)}")
             key_snippets = ""
@@ -155,21 +152,19 @@ def request_research(query: str) -> ResearchResult:
         reset_completion_flags()
 
     try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
+        key_facts = get_key_fact_repository().get_formatted_facts()
     except RuntimeError as e:
         logger.error(f"Failed to access key fact repository: {str(e)}")
         key_facts = ""
         
     try:
-        key_snippets = format_key_snippets_dict(get_key_snippet_repository().get_snippets_dict())
+        key_snippets = get_key_snippet_repository().get_formatted_snippets()
     except RuntimeError as e:
         logger.error(f"Failed to access key snippet repository: {str(e)}")
         key_snippets = ""
 
     try:
-        repository = get_research_note_repository()
-        notes_dict = repository.get_notes_dict()
-        formatted_research_notes = format_research_notes_dict(notes_dict)
+        formatted_research_notes = get_research_note_repository().get_formatted_notes()
     except RuntimeError as e:
         logger.error(f"Failed to access research note repository: {str(e)}")
         formatted_research_notes = ""
@@ -255,15 +250,13 @@ def request_web_research(query: str) -> ResearchResult:
         reset_completion_flags()
 
     try:
-        key_snippets = format_key_snippets_dict(get_key_snippet_repository().get_snippets_dict())
+        key_snippets = get_key_snippet_repository().get_formatted_snippets()
     except RuntimeError as e:
         logger.error(f"Failed to access key snippet repository: {str(e)}")
         key_snippets = ""
 
     try:
-        repository = get_research_note_repository()
-        notes_dict = repository.get_notes_dict()
-        formatted_research_notes = format_research_notes_dict(notes_dict)
+        formatted_research_notes = get_research_note_repository().get_formatted_notes()
     except RuntimeError as e:
         logger.error(f"Failed to access research note repository: {str(e)}")
         formatted_research_notes = ""
@@ -335,21 +328,19 @@ def request_research_and_implementation(query: str) -> Dict[str, Any]:
     reset_completion_flags()
 
     try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
+        key_facts = get_key_fact_repository().get_formatted_facts()
     except RuntimeError as e:
         logger.error(f"Failed to access key fact repository: {str(e)}")
         key_facts = ""
         
     try:
-        key_snippets = format_key_snippets_dict(get_key_snippet_repository().get_snippets_dict())
+        key_snippets = get_key_snippet_repository().get_formatted_snippets()
     except RuntimeError as e:
         logger.error(f"Failed to access key snippet repository: {str(e)}")
         key_snippets = ""
 
     try:
-        repository = get_research_note_repository()
-        notes_dict = repository.get_notes_dict()
-        formatted_research_notes = format_research_notes_dict(notes_dict)
+        formatted_research_notes = get_research_note_repository().get_formatted_notes()
     except RuntimeError as e:
         logger.error(f"Failed to access research note repository: {str(e)}")
         formatted_research_notes = ""
@@ -463,13 +454,13 @@ def request_task_implementation(task_spec: str) -> str:
     crash_message = get_crash_message() if agent_crashed else None
 
     try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
+        key_facts = get_key_fact_repository().get_formatted_facts()
     except RuntimeError as e:
         logger.error(f"Failed to access key fact repository: {str(e)}")
         key_facts = ""
         
     try:
-        key_snippets = format_key_snippets_dict(get_key_snippet_repository().get_snippets_dict())
+        key_snippets = get_key_snippet_repository().get_formatted_snippets()
     except RuntimeError as e:
         logger.error(f"Failed to access key snippet repository: {str(e)}")
         key_snippets = ""
@@ -609,13 +600,13 @@ def request_implementation(task_spec: str) -> str:
     crash_message = get_crash_message() if agent_crashed else None
 
     try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
+        key_facts = get_key_fact_repository().get_formatted_facts()
     except RuntimeError as e:
         logger.error(f"Failed to access key fact repository: {str(e)}")
         key_facts = ""
         
     try:
-        key_snippets = format_key_snippets_dict(get_key_snippet_repository().get_snippets_dict())
+        key_snippets = get_key_snippet_repository().get_formatted_snippets()
     except RuntimeError as e:
         logger.error(f"Failed to access key snippet repository: {str(e)}")
         key_snippets = ""
@@ -16,9 +16,6 @@ from ..database.repositories.related_files_repository import get_related_files_r
 from ..database.repositories.research_note_repository import get_research_note_repository
 from ..database.repositories.config_repository import get_config_repository
 from ..llm import initialize_expert_llm
-from ..model_formatters import format_key_facts_dict
-from ..model_formatters.key_snippets_formatter import format_key_snippets_dict
-from ..model_formatters.research_notes_formatter import format_research_notes_dict
 from ..models_params import models_params
 from ..text.processing import process_thinking_content
 
@@ -179,22 +176,19 @@ def ask_expert(question: str) -> str:
     related_contents = read_related_files(file_paths)
     # Get key snippets directly from repository and format using the formatter
     try:
-        key_snippets = format_key_snippets_dict(get_key_snippet_repository().get_snippets_dict())
+        key_snippets = get_key_snippet_repository().get_formatted_snippets()
     except RuntimeError as e:
         logger.error(f"Failed to access key snippet repository: {str(e)}")
         key_snippets = ""
     # Get key facts directly from repository and format using the formatter
     try:
-        facts_dict = get_key_fact_repository().get_facts_dict()
-        key_facts = format_key_facts_dict(facts_dict)
+        key_facts = get_key_fact_repository().get_formatted_facts()
     except RuntimeError as e:
         logger.error(f"Failed to access key fact repository: {str(e)}")
         key_facts = ""
     # Get research notes directly from repository and format using the formatter
     try:
-        repository = get_research_note_repository()
-        notes_dict = repository.get_notes_dict()
-        formatted_research_notes = format_research_notes_dict(notes_dict)
+        formatted_research_notes = get_research_note_repository().get_formatted_notes()
     except RuntimeError as e:
         logger.error(f"Failed to access research note repository: {str(e)}")
         formatted_research_notes = ""
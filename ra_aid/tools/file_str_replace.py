@@ -6,6 +6,7 @@ from langchain_core.tools import tool
 from ra_aid.console import console
 from ra_aid.console.formatting import print_error
 from ra_aid.console.formatting import console_panel
+from ra_aid.file_index import get_file_index
 from ra_aid.tools.memory import emit_related_files
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.database.repositories.human_input_repository import get_human_input_repository
@@ -151,6 +152,7 @@ def file_str_replace(filepath: str, old_str: str, new_str: str, *, replace_all:
 
         new_content = content.replace(old_str, new_str)
         path.write_text(new_content)
+        get_file_index().record_file_written(filepath)
 
         replacement_msg = f"Replaced in {filepath}:"
         if count > 1 and replace_all:
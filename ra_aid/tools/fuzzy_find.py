@@ -2,7 +2,6 @@ import fnmatch
 import logging
 from typing import List, Tuple, Dict, Optional, Any
 
-from fuzzywuzzy import process
 from git import Repo, exc
 from langchain_core.tools import tool
 from rich.console import Console
@@ -11,6 +10,7 @@ from rich.panel import Panel
 
 from ra_aid.console.formatting import console_panel, cpm
 from ra_aid.file_listing import get_all_project_files, FileListerError
+from ra_aid.fuzzy_match import get_fuzzy_matcher
 
 console = Console()
 
@@ -169,11 +169,10 @@ def fuzzy_find_project_files(
              total_files_scanned = len(all_files) # Total scanned is all project files
 
 
-        # Perform fuzzy matching
-        matches = process.extract(search_term, all_files, limit=max_results)
-
-        # Filter by threshold
-        filtered_matches = [(path, score) for path, score in matches if score >= threshold]
+        # Perform fuzzy matching, keeping only matches at or above the threshold
+        filtered_matches = get_fuzzy_matcher(all_files).extract(
+            search_term, limit=max_results, threshold=threshold
+        )
 
         # Build info panel content (for CLI output, unchanged)
         info_sections = []
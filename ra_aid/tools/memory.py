@@ -20,6 +20,7 @@ from ra_aid.database.repositories.human_input_repository import get_human_input_
 from ra_aid.database.repositories.research_note_repository import get_research_note_repository
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.database.repositories.work_log_repository import get_work_log_repository
+from ra_aid.database.utils import get_current_session_id
 from ra_aid.model_formatters import key_snippets_formatter
 from ra_aid.logging_config import get_logger
 
@@ -64,7 +65,9 @@ def emit_research_notes(notes: str) -> str:
     
     try:
         # Create note in database using repository
-        created_note = get_research_note_repository().create(notes, human_input_id=human_input_id)
+        created_note = get_research_note_repository().create(
+            notes, human_input_id=human_input_id, session_id=get_current_session_id()
+        )
         note_id = created_note.id
         
         # Format the note using the formatter
@@ -94,8 +97,7 @@ def emit_research_notes(notes: str) -> str:
         
         # Check if we need to clean up notes (more than 30)
         try:
-            all_notes = get_research_note_repository().get_all()
-            if len(all_notes) > 30:
+            if get_research_note_repository().count() > 30:
                 # Trigger the research notes cleaner agent
                 try:
                     from ra_aid.agents.research_notes_gc_agent import run_research_notes_gc_agent
@@ -134,7 +136,9 @@ def emit_key_facts(facts: List[str]) -> str:
     for fact in facts:
         try:
             # Create fact in database using repository
-            created_fact = get_key_fact_repository().create(fact, human_input_id=human_input_id)
+            created_fact = get_key_fact_repository().create(
+                fact, human_input_id=human_input_id, session_id=get_current_session_id()
+            )
             fact_id = created_fact.id
         except RuntimeError as e:
             logger.error(f"Failed to access key fact repository: {str(e)}")
@@ -172,8 +176,7 @@ def emit_key_facts(facts: List[str]) -> str:
     
     # Check if we need to clean up facts (more than 30)
     try:
-        all_facts = get_key_fact_repository().get_all()
-        if len(all_facts) > 50:
+        if get_key_fact_repository().count() > 50:
             # Trigger the key facts cleaner agent
             try:
                 from ra_aid.agents.key_facts_gc_agent import run_key_facts_gc_agent
@@ -228,6 +231,7 @@ def emit_key_snippet(snippet_info: SnippetInfo) -> str:
         snippet=snippet_info["snippet"],
         description=snippet_info["description"],
         human_input_id=human_input_id,
+        session_id=get_current_session_id(),
     )
     
     # Get the snippet ID from the database record
@@ -283,8 +287,7 @@ def emit_key_snippet(snippet_info: SnippetInfo) -> str:
     log_work_event(f"Stored code snippet #{snippet_id}.")
     
     # Check if we need to clean up snippets (more than 20)
-    all_snippets = get_key_snippet_repository().get_all()
-    if len(all_snippets) > 35:
+    if get_key_snippet_repository().count() > 35:
         # Trigger the key snippets cleaner agent
         try:
             from ra_aid.agents.key_snippets_gc_agent import run_key_snippets_gc_agent
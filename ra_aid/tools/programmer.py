@@ -9,6 +9,7 @@ from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.text import Text
 
+from ra_aid.file_index import get_file_index
 from ra_aid.logging_config import get_logger
 from ra_aid.models_params import DEFAULT_BASE_LATENCY, models_params
 from ra_aid.proc.interactive import run_interactive_command
@@ -131,6 +132,8 @@ def run_programming_task(
         )
 
         result = run_interactive_command(command, expected_runtime_seconds=latency)
+        # The programmer may have created or deleted files
+        get_file_index().invalidate()
         print()
 
         # Log the programming task
@@ -1,5 +1,10 @@
 
-from typing import Dict, List, Union, Optional
+import base64
+import json
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Generator, List, Union, Optional
 
 from langchain_core.tools import tool
 from rich.console import Console
@@ -7,13 +12,25 @@ from rich.markdown import Markdown
 from rich.panel import Panel
 
 from ra_aid.console.formatting import console_panel, cpm
+from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.database.repositories.human_input_repository import get_human_input_repository
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
-from ra_aid.proc.interactive import run_interactive_command
 from ra_aid.text.processing import truncate_output
 
 console = Console()
 
+# Default search budgets; override with the ripgrep_max_matches, ripgrep_max_files
+# and ripgrep_max_bytes config values. The search process is stopped once any is hit.
+DEFAULT_MAX_MATCHES = 1000
+DEFAULT_MAX_FILES = 200
+DEFAULT_MAX_BYTES = 512 * 1024
+
+# Longer lines are cut, so a single minified file cannot use up the byte budget
+MAX_LINE_LENGTH = 500
+
+# Number of output lines shown in the console panel
+DISPLAY_MAX_LINES = 100
+
 DEFAULT_EXCLUDE_DIRS = [
     ".git",
     "node_modules",
@@ -72,6 +89,199 @@ FILE_TYPE_MAP = {
 }
 
 
+def _decode_rg_data(data: Optional[Dict[str, str]]) -> str:
+    """Decode a ripgrep JSON text-or-bytes object into a string."""
+    if not data:
+        return ""
+    if "text" in data:
+        return data["text"]
+    return base64.b64decode(data.get("bytes", "")).decode("utf-8", errors="replace")
+
+
+def iter_ripgrep_json(cmd: List[str]) -> Generator[Dict[str, Any], None, int]:
+    """Run ripgrep with --json and yield its events as they are produced.
+
+    Closing the generator early terminates the ripgrep process, so callers can
+    stop reading as soon as they have enough results.
+
+    Args:
+        cmd: Full ripgrep command, including --json
+
+    Yields:
+        Decoded JSON event objects (begin, match, context, end, summary)
+
+    Returns:
+        The ripgrep exit code (via StopIteration.value)
+
+    Raises:
+        RuntimeError: If ripgrep exits with an error (exit code 2 or higher)
+    """
+    process = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    # Drain stderr in the background so a chatty stderr cannot block stdout
+    stderr_chunks: List[bytes] = []
+
+    def drain_stderr():
+        for chunk in iter(lambda: process.stderr.read(4096), b""):
+            if sum(len(c) for c in stderr_chunks) < 64 * 1024:
+                stderr_chunks.append(chunk)
+
+    stderr_thread = threading.Thread(target=drain_stderr, daemon=True)
+    stderr_thread.start()
+
+    finished = False
+    try:
+        for line in process.stdout:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+        finished = True
+    finally:
+        if not finished and process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        return_code = process.wait()
+        stderr_thread.join(timeout=1)
+
+    if return_code >= 2:
+        error = b"".join(stderr_chunks).decode("utf-8", errors="replace").strip()
+        raise RuntimeError(error or f"ripgrep exited with code {return_code}")
+    return return_code
+
+
+@dataclass
+class RipgrepResults:
+    """Structured results of a streamed ripgrep search."""
+
+    files: List[Dict[str, Any]] = field(default_factory=list)
+    match_count: int = 0
+    bytes_read: int = 0
+    truncated: bool = False
+    truncation_reason: Optional[str] = None
+    return_code: int = 1
+
+    def to_text(self) -> str:
+        """Render results in ripgrep's heading format (path, then numbered lines)."""
+        sections = []
+        for file_result in self.files:
+            lines = [file_result["path"]]
+            previous_line_number = None
+            for line in file_result["lines"]:
+                line_number = line["line_number"]
+                if (
+                    previous_line_number is not None
+                    and line_number is not None
+                    and line_number > previous_line_number + 1
+                ):
+                    lines.append("--")
+                separator = ":" if line["type"] == "match" else "-"
+                lines.append(f"{line_number}{separator}{line['text']}")
+                previous_line_number = line_number
+            sections.append("\n".join(lines))
+
+        text = "\n\n".join(sections)
+        if self.truncated:
+            text += (
+                f"\n\n[Search stopped early: {self.truncation_reason}. "
+                f"Showing {self.match_count} matching lines in {len(self.files)} files; "
+                "narrow the pattern or use include_paths to see more.]"
+            )
+        return text
+
+
+def stream_ripgrep_search(
+    cmd: List[str],
+    max_matches: Optional[int] = DEFAULT_MAX_MATCHES,
+    max_files: Optional[int] = DEFAULT_MAX_FILES,
+    max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+) -> RipgrepResults:
+    """Run a ripgrep --json command, collecting per-file results within a budget.
+
+    Args:
+        cmd: Full ripgrep command, including --json
+        max_matches: Stop after this many matching lines (None for no limit)
+        max_files: Stop after this many files with matches (None for no limit)
+        max_bytes: Stop after this many UTF-8 bytes of collected line text (None for no limit)
+
+    Returns:
+        RipgrepResults with the collected files and counters
+    """
+    results = RipgrepResults()
+    current_file: Optional[Dict[str, Any]] = None
+    events = iter_ripgrep_json(cmd)
+
+    try:
+        while True:
+            try:
+                event = next(events)
+            except StopIteration as stop:
+                results.return_code = stop.value
+                break
+
+            event_type = event.get("type")
+            data = event.get("data", {})
+
+            if event_type == "begin":
+                if max_files is not None and len(results.files) >= max_files:
+                    results.truncated = True
+                    results.truncation_reason = f"reached the limit of {max_files} files"
+                    break
+                current_file = {"path": _decode_rg_data(data.get("path")), "lines": []}
+                results.files.append(current_file)
+
+            elif event_type in ("match", "context") and current_file is not None:
+                text = _decode_rg_data(data.get("lines")).rstrip("\r\n")
+                line_bytes = text.encode("utf-8")
+                if len(text) > MAX_LINE_LENGTH:
+                    text = text[:MAX_LINE_LENGTH] + " [line truncated]"
+
+                submatches = []
+                for submatch in data.get("submatches", []):
+                    # ripgrep reports byte offsets; convert them to character offsets
+                    start = len(line_bytes[: submatch["start"]].decode("utf-8", errors="replace"))
+                    end = len(line_bytes[: submatch["end"]].decode("utf-8", errors="replace"))
+                    submatches.append([start, end])
+
+                current_file["lines"].append(
+                    {
+                        "type": event_type,
+                        "line_number": data.get("line_number"),
+                        "text": text,
+                        "submatches": submatches,
+                    }
+                )
+                results.bytes_read += len(text.encode("utf-8"))
+                if event_type == "match":
+                    results.match_count += 1
+
+                if max_matches is not None and results.match_count >= max_matches:
+                    results.truncated = True
+                    results.truncation_reason = f"reached the limit of {max_matches} matching lines"
+                    break
+                if max_bytes is not None and results.bytes_read >= max_bytes:
+                    results.truncated = True
+                    results.truncation_reason = f"reached the limit of {max_bytes} bytes of output"
+                    break
+
+            elif event_type == "end":
+                current_file = None
+    finally:
+        events.close()
+
+    if results.truncated:
+        # The search was stopped while matches were still being found
+        results.return_code = 0
+    return results
+
+
 @tool
 def ripgrep_search(
     pattern: str,
@@ -103,8 +313,8 @@ def ripgrep_search(
                        If provided, rg will only search these paths.
         fixed_string: Whether to treat pattern as a literal string instead of regex (default: False)
     """
-    # Build rg command with options
-    cmd = ["rg", "--color", "always"] # Use '--color always' to capture colors
+    # Build rg command with options; --json gives structured, color-free events
+    cmd = ["rg", "--json"]
 
     if before_context_lines is not None:
         cmd.extend(["-B", str(before_context_lines)])
@@ -184,34 +394,55 @@ def ripgrep_search(
         border_style="bright_blue"
     )
     try:
-        print()
-        output, return_code = run_interactive_command(cmd)
-        print()
-        decoded_output = output.decode('utf-8', errors='replace') if output else "" # Ensure decoding
+        config = get_config_repository()
+        results = stream_ripgrep_search(
+            cmd,
+            max_matches=config.get("ripgrep_max_matches", DEFAULT_MAX_MATCHES),
+            max_files=config.get("ripgrep_max_files", DEFAULT_MAX_FILES),
+            max_bytes=config.get("ripgrep_max_bytes", DEFAULT_MAX_BYTES),
+        )
+        decoded_output = results.to_text()
 
         final_output = decoded_output # Store full output for trajectory
-        final_return_code = return_code
-        final_success = (return_code == 0)
+        final_return_code = results.return_code
+        final_success = (results.return_code == 0)
+
+        step_data.update(
+            {
+                "results": results.files,
+                "match_count": results.match_count,
+                "file_count": len(results.files),
+                "truncated": results.truncated,
+                "truncation_reason": results.truncation_reason,
+            }
+        )
 
         # Prepare return value for agent (potentially truncated)
         truncated_output_for_agent = truncate_output(decoded_output)
 
-        if return_code != 0:
-            # Show error panel only if there's actual output content
-            if decoded_output and decoded_output.strip():
-                 console_panel(truncated_output_for_agent, title="🚨 Search Error", border_style="red")
-            agent_return_value = {"output": truncated_output_for_agent, "return_code": return_code, "success": False}
+        if decoded_output.strip():
+            display_lines = decoded_output.splitlines()
+            display_output = "\n".join(display_lines[:DISPLAY_MAX_LINES])
+            if len(display_lines) > DISPLAY_MAX_LINES:
+                display_output += f"\n... ({len(display_lines) - DISPLAY_MAX_LINES} more lines)"
+            console_panel(
+                display_output,
+                title=f"✅ {results.match_count} matching lines in {len(results.files)} files",
+                border_style="green",
+            )
         else:
-            # Even if successful, output might be empty (no matches)
-            if not (decoded_output and decoded_output.strip()):
-                 console_panel("[grey50](No matches found)[/]", title="✅ Search Complete", border_style="green", style="italic")
-            agent_return_value = {"output": truncated_output_for_agent, "return_code": return_code, "success": True}
+            console_panel("[grey50](No matches found)[/]", title="✅ Search Complete", border_style="green")
+        agent_return_value = {
+            "output": truncated_output_for_agent,
+            "return_code": results.return_code,
+            "success": final_success,
+        }
 
     except Exception as e:
-        # Handle exceptions during command execution (e.g., command not found)
+        # Handle exceptions during command execution (e.g., command not found, invalid pattern)
         error_msg = str(e)
         # Try to get return code from exception if available
-        final_return_code = getattr(e, 'returncode', 1)
+        final_return_code = getattr(e, 'returncode', 2 if isinstance(e, RuntimeError) else 1)
         final_output = error_msg # Store error message for trajectory
         final_success = False
 
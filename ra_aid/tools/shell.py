@@ -9,6 +9,7 @@ from rich.prompt import Prompt
 
 from ra_aid.console.cowboy_messages import get_cowboy_message
 from ra_aid.console.formatting import console_panel, cpm
+from ra_aid.file_index import get_file_index
 from ra_aid.proc.interactive import run_interactive_command
 from ra_aid.text.processing import truncate_output
 from ra_aid.tools.memory import log_work_event
@@ -116,6 +117,8 @@ def run_shell_command(
             shell_cmd + [command],
             expected_runtime_seconds=timeout,
         )
+        # Shell commands can create files git does not track yet
+        get_file_index().invalidate()
         print()
         result = {
             "output": truncate_output(output.decode()) if output else "",
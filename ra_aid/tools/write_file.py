@@ -8,6 +8,7 @@ from rich.console import Console
 from rich.panel import Panel
 from ra_aid.console.formatting import console_panel
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository  # Added import
+from ra_aid.file_index import get_file_index
 from ra_aid.tools.memory import emit_related_files
 
 console = Console()
@@ -82,6 +83,9 @@ def put_complete_file_contents(
             border_style="bright_green",
         )
 
+        # Keep the project file index current without relisting the repository
+        get_file_index().record_file_written(filepath)
+
         # Add file to related files
         emit_related_files.invoke({"files": [filepath]})
 
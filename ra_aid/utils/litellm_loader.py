@@ -0,0 +1,54 @@
+"""Deferred import of litellm.
+
+Importing litellm takes seconds, and ra-aid only needs it to count tokens and
+look up model limits and costs, so it is imported the first time one of those
+happens rather than when the CLI starts.
+"""
+
+import logging
+import os
+import sys
+import threading
+
+_litellm = None
+_lock = threading.Lock()
+
+
+class _LiteLLMNotImported(Exception):
+    """Stands in for litellm exception types before litellm has been imported."""
+
+
+def get_litellm():
+    """Import litellm on first use, with its debug output silenced, and return the module."""
+    global _litellm
+    if _litellm is None:
+        with _lock:
+            if _litellm is None:
+                os.environ["LITELLM_LOG"] = "ERROR"
+                import litellm
+
+                litellm.suppress_debug_info = True
+                litellm.set_verbose = False
+
+                # Explicitly configure LiteLLM's loggers
+                for logger_name in ["litellm", "LiteLLM"]:
+                    litellm_logger = logging.getLogger(logger_name)
+                    litellm_logger.setLevel(logging.WARNING)
+                    litellm_logger.propagate = True
+
+                # Use litellm's internal method to disable debugging
+                if hasattr(litellm, "_logging") and hasattr(litellm._logging, "_disable_debugging"):
+                    litellm._logging._disable_debugging()
+                _litellm = litellm
+    return _litellm
+
+
+def litellm_rate_limit_error() -> type:
+    """litellm's RateLimitError for except clauses, without importing litellm.
+
+    If litellm has not been imported nothing can have raised its errors, so an
+    exception type that is never raised is returned instead.
+    """
+    litellm = sys.modules.get("litellm")
+    exceptions = getattr(litellm, "exceptions", None)
+    return getattr(exceptions, "RateLimitError", _LiteLLMNotImported)
@@ -0,0 +1,107 @@
+"""Bounded cache of per-message token counts shared by the history trimmers."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from langchain_core.messages import BaseMessage
+
+# Tokenizer name used for the utf-8 byte length estimate in CiaynAgent._estimate_tokens
+BYTE_ESTIMATE_TOKENIZER = "utf8-bytes/2"
+
+DEFAULT_TOKEN_CACHE_SIZE = 8192
+
+
+class TokenCountCache:
+    """LRU cache of token counts keyed by message identity and tokenizer.
+
+    Entries hold a reference to the counted object and to its content, so a
+    lookup only hits when it is the same object with the same content object.
+    Reassigning a message's content therefore invalidates its entry.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _content_of(item: Any) -> Any:
+        return item.content if isinstance(item, BaseMessage) else item
+
+    def get_or_count(
+        self, item: Any, tokenizer: str, counter: Callable[[Any], int]
+    ) -> int:
+        """Return the cached token count for item, counting it on a miss.
+
+        Args:
+            item: Message or string to count
+            tokenizer: Name of the tokenizer or model the count is valid for
+            counter: Function that counts tokens in item
+
+        Returns:
+            Token count for item
+        """
+        key = (tokenizer, id(item))
+        content = self._content_of(item)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is item and entry[1] is content:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        count = counter(item)
+
+        with self._lock:
+            self._entries[key] = (item, content, count)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit rate counters.
+
+        Returns:
+            Dict with size, max_size, hits, misses, evictions and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+_token_count_cache: Optional[TokenCountCache] = None
+_token_count_cache_lock = threading.Lock()
+
+
+def get_token_count_cache() -> TokenCountCache:
+    """Get the process-wide token count cache, creating it on first use."""
+    global _token_count_cache
+    if _token_count_cache is None:
+        with _token_count_cache_lock:
+            if _token_count_cache is None:
+                _token_count_cache = TokenCountCache()
+    return _token_count_cache
@@ -1,6 +1,14 @@
 """Version check module for RA.Aid."""
 
+import json
 import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
 import requests
 from packaging import version
 
@@ -9,52 +17,173 @@ from ra_aid.__version__ import __version__ as current_version
 # URL for the latest version information
 VERSION_URL = "https://docs.ra-aid.ai/version.json"
 
+# The latest version is fetched at most once per VERSION_CHECK_TTL seconds and
+# remembered in this file in the project state directory (.ra-aid). Failed
+# fetches are remembered too, so offline runs do not retry on every start.
+VERSION_CACHE_FILE = "version_check.json"
+VERSION_CHECK_TTL = 24 * 60 * 60
+
 # Set up logger
 logger = logging.getLogger(__name__)
 
-def check_for_newer_version() -> str:
-    """
-    Check if a newer version of RA.Aid is available.
-    
-    Makes an HTTP request to the docs site to retrieve the latest version information,
-    then compares it to the current version. If a newer version is available, returns
-    a message suggesting to upgrade.
-    
-    Returns:
-        str: Update message if a newer version is available, otherwise an empty string
-    """
+
+def _fetch_latest_version() -> Optional[str]:
     try:
         # Get the latest version from the docs site
         logger.debug(f"Checking for newer version at {VERSION_URL}")
         response = requests.get(VERSION_URL, timeout=5)
         response.raise_for_status()  # Raise an exception for HTTP errors
-        
+
         # Parse the response JSON
         version_info = response.json()
         latest_version = version_info.get("version")
-        
+
         if not latest_version:
             logger.warning("No version found in the version.json file")
-            return ""
-        
+            return None
+        return latest_version
+
+    except requests.RequestException as e:
+        logger.error(f"Error connecting to version check URL: {e}")
+    except ValueError as e:
+        logger.error(f"Error parsing version.json: {e}")
+    except Exception as e:
+        logger.error(f"Unexpected error during version check: {e}")
+    return None
+
+
+def _read_cache(cache_dir: Path) -> Optional[dict]:
+    """Return the cached check if it is younger than VERSION_CHECK_TTL, otherwise None."""
+    try:
+        with open(cache_dir / VERSION_CACHE_FILE) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    age = time.time() - data.get("checked_at", 0)
+    if age < 0 or age > VERSION_CHECK_TTL:
+        return None
+    return data
+
+
+def _write_cache(cache_dir: Path, latest_version: Optional[str]) -> None:
+    # The state directory is created by DatabaseManager; never create it here.
+    if not cache_dir.is_dir():
+        return
+    data = {"checked_at": time.time(), "latest_version": latest_version}
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".version_check.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, cache_dir / VERSION_CACHE_FILE)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.debug(f"Could not write version check cache: {e}")
+
+
+def _upgrade_message(latest_version: Optional[str]) -> str:
+    if not latest_version:
+        return ""
+    try:
         logger.debug(f"Current version: {current_version}, Latest version: {latest_version}")
-        
+
         # Compare versions
         if version.parse(latest_version) > version.parse(current_version):
             logger.info(f"New version available: {latest_version}")
             return (f"A new version of RA.Aid is available! Consider upgrading to {latest_version} "
                    "to have access to the latest features and functionality.")
-        
-        # Current version is up-to-date
-        logger.debug("Current version is up-to-date")
-        return ""
-        
-    except requests.RequestException as e:
-        logger.error(f"Error connecting to version check URL: {e}")
-        return ""
-    except ValueError as e:
+    except version.InvalidVersion as e:
         logger.error(f"Error parsing version.json: {e}")
         return ""
-    except Exception as e:
-        logger.error(f"Unexpected error during version check: {e}")
-        return ""
\ No newline at end of file
+
+    # Current version is up-to-date
+    logger.debug("Current version is up-to-date")
+    return ""
+
+
+def check_for_newer_version(cache_dir: Optional[Union[str, Path]] = None) -> str:
+    """
+    Check if a newer version of RA.Aid is available.
+
+    Makes an HTTP request to the docs site to retrieve the latest version information,
+    then compares it to the current version. If a newer version is available, returns
+    a message suggesting to upgrade.
+
+    Args:
+        cache_dir: Directory holding the cached result. A result younger than
+            VERSION_CHECK_TTL is used instead of the HTTP request, and a new one
+            is stored there. None disables the cache.
+
+    Returns:
+        str: Update message if a newer version is available, otherwise an empty string
+    """
+    if cache_dir is not None:
+        cache_dir = Path(cache_dir)
+        cached = _read_cache(cache_dir)
+        if cached is not None:
+            return _upgrade_message(cached.get("latest_version"))
+
+    latest_version = _fetch_latest_version()
+    if cache_dir is not None:
+        _write_cache(cache_dir, latest_version)
+    return _upgrade_message(latest_version)
+
+
+class VersionCheck:
+    """A version check that runs on a daemon thread so it never delays startup."""
+
+    def __init__(self, cache_dir: Path):
+        self._message = ""
+        self._done = threading.Event()
+        cached = _read_cache(cache_dir)
+        if cached is not None:
+            # A fresh cached result needs no thread
+            self._message = _upgrade_message(cached.get("latest_version"))
+            self._done.set()
+            return
+        threading.Thread(
+            target=self._run, args=(cache_dir,), name="ra-aid-version-check", daemon=True
+        ).start()
+
+    def _run(self, cache_dir: Path) -> None:
+        try:
+            self._message = check_for_newer_version(cache_dir)
+        finally:
+            self._done.set()
+
+    def message(self, timeout: float = 0) -> str:
+        """The update message, or an empty string if the check is not finished within timeout."""
+        if not self._done.wait(timeout):
+            return ""
+        return self._message
+
+
+_version_check: Optional[VersionCheck] = None
+
+
+def start_version_check(cache_dir: Optional[Union[str, Path]] = None, offline: bool = False) -> None:
+    """
+    Start checking for a newer version in the background.
+
+    Args:
+        cache_dir: Project state directory holding the cached result; defaults
+            to .ra-aid in the current working directory
+        offline: Skip the check entirely
+    """
+    global _version_check
+    if offline:
+        logger.debug("Offline mode, skipping version check")
+        _version_check = None
+        return
+    _version_check = VersionCheck(Path(cache_dir) if cache_dir else Path.cwd() / ".ra-aid")
+
+
+def get_version_message() -> str:
+    """The update message of the started check if it has finished, otherwise an empty string."""
+    if _version_check is None:
+        return ""
+    return _version_check.message()
@@ -6,6 +6,7 @@ ensuring consistent test environments and proper isolation.
 """
 
 import os
+import sys
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -106,6 +107,16 @@ def mock_repository_access(
                 yield
 
 
+@pytest.fixture(autouse=True)
+def clear_llm_client_pool():
+    """Empty the LLM client pool so that clients built from one test's mocks are not reused."""
+    yield
+    # Only if a test imported ra_aid.llm; importing it here would load every provider SDK
+    llm = sys.modules.get("ra_aid.llm")
+    if llm is not None:
+        llm.get_llm_client_pool().clear()
+
+
 @pytest.fixture(autouse=True)
 def isolated_db_environment(tmp_path, monkeypatch):
     """
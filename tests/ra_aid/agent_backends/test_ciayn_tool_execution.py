@@ -27,8 +27,9 @@ def test_fuzzy_find_project_files_none_args_execution():
     # Mock the response from the LLM
     mock_response = AIMessage(content=function_call)
     
-    # Patch process.extract to return empty results for any search
-    with patch('ra_aid.tools.fuzzy_find.process.extract', return_value=[]):
+    # Patch the fuzzy matcher to return empty results for any search
+    with patch('ra_aid.tools.fuzzy_find.get_fuzzy_matcher') as mock_get_matcher:
+        mock_get_matcher.return_value.extract.return_value = []
         result = agent._execute_tool(mock_response)
         assert result == []
 
@@ -11,6 +11,7 @@ these tests may still sometimes create files in the real .ra-aid directory durin
 """
 
 import os
+import threading
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
@@ -18,10 +19,15 @@ import peewee
 import pytest
 
 from ra_aid.database.connection import (
+    DB_PROFILES,
     DatabaseManager,
+    PooledSqliteDatabase,
     close_db,
+    close_pools,
     db_var,
     get_db,
+    get_db_pragmas,
+    get_pool_stats,
     init_db,
 )
 
@@ -230,4 +236,56 @@ class TestDatabaseManager:
             # The exception should be propagated
             pass
         # Verify the connection is closed even if an exception occurred
-        assert db.is_closed()
\ No newline at end of file
+        assert db.is_closed()
+
+class TestProfilesAndPooling:
+    """Tests for performance profiles and the per-thread connection pool."""
+
+    def test_get_db_pragmas(self):
+        """Test that profiles resolve to pragma dicts and unknown names are rejected."""
+        assert get_db_pragmas() == DB_PROFILES["balanced"]
+        assert get_db_pragmas("safe")["synchronous"] == "full"
+        with pytest.raises(ValueError):
+            get_db_pragmas("reckless")
+
+    def test_profile_pragmas_applied(self, cleanup_db, tmp_path):
+        """Test that the chosen profile's pragmas are set on the connection."""
+        try:
+            db = init_db(base_dir=str(tmp_path), profile="fast")
+            assert isinstance(db, PooledSqliteDatabase)
+            assert db.execute_sql("PRAGMA synchronous").fetchone()[0] == 0
+            assert db.execute_sql("PRAGMA busy_timeout").fetchone()[0] == 10000
+            assert db.execute_sql("PRAGMA journal_mode").fetchone()[0] == "wal"
+        finally:
+            close_db()
+            close_pools()
+
+    def test_threads_share_pool_with_own_connections(self, cleanup_db, tmp_path):
+        """Test that threads opening the same file get one pool but separate connections."""
+        try:
+            main_db = init_db(base_dir=str(tmp_path))
+            main_conn = main_db.connection()
+            seen = {}
+
+            def worker():
+                thread_db = init_db(base_dir=str(tmp_path))
+                seen["db"] = thread_db
+                seen["conn"] = thread_db.connection()
+                close_db()
+
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+            assert seen["db"] is main_db
+            assert seen["conn"] is not main_conn
+
+            stats = get_pool_stats()[os.path.join(str(tmp_path), "pk.db")]
+            assert stats["checkouts"] == 2
+            assert stats["connections_created"] == 2
+            assert stats["in_use"] == 1
+            assert stats["available"] == 1
+            assert stats["peak_in_use"] == 2
+        finally:
+            close_db()
+            close_pools()
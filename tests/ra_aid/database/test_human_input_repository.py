@@ -195,4 +195,25 @@ class TestHumanInputRepository(unittest.TestCase):
         most_recent_id = self.repository.get_most_recent_id()
         
         # Verify the correct ID was retrieved
-        self.assertEqual(most_recent_id, input2.id)
\ No newline at end of file
+        self.assertEqual(most_recent_id, input2.id)
+    def test_get_most_recent_id_is_cached(self):
+        """Test that the most recent ID is served from memory after the first lookup."""
+        input1 = self.repository.create(content="Input 1", source="cli")
+
+        # Records created outside this repository are not seen once the ID is known
+        HumanInput.create(content="Other thread", source="server")
+        self.assertEqual(self.repository.get_most_recent_id(), input1.id)
+
+        input3 = self.repository.create(content="Input 3", source="chat")
+        self.assertEqual(self.repository.get_most_recent_id(), input3.id)
+
+    def test_get_most_recent_id_loads_from_database(self):
+        """Test that a fresh repository reads the most recent ID from the database."""
+        self.assertIsNone(self.repository.get_most_recent_id())
+
+        other_repository = HumanInputRepository(self.db)
+        created = other_repository.create(content="Input", source="cli")
+
+        fresh_repository = HumanInputRepository(self.db)
+        self.assertEqual(fresh_repository.get_most_recent_id(), created.id)
+
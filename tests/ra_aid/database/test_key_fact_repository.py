@@ -2,13 +2,15 @@
 Tests for the KeyFactRepository class.
 """
 
+import datetime
+
 import pytest
 from unittest.mock import patch
 
 import peewee
 
 from ra_aid.database.connection import DatabaseManager, db_var
-from ra_aid.database.models import KeyFact, BaseModel
+from ra_aid.database.models import KeyFact, BaseModel, HumanInput, Session, Trajectory
 from ra_aid.database.repositories.key_fact_repository import (
     KeyFactRepository, 
     KeyFactRepositoryManager,
@@ -16,6 +18,8 @@ from ra_aid.database.repositories.key_fact_repository import (
     key_fact_repo_var
 )
 from ra_aid.database.pydantic_models import KeyFactModel
+from ra_aid.database.repositories.trajectory_repository import TrajectoryRepository
+from ra_aid.database.trajectory_writer import get_trajectory_writer
 
 
 @pytest.fixture
@@ -222,6 +226,86 @@ def test_get_facts_dict(setup_db):
         assert facts_dict[fact.id] == fact.content
 
 
+def test_get_formatted_facts_is_cached_until_a_write(setup_db):
+    """Formatted facts are served from cache until a key fact is created, updated or deleted."""
+    repo = KeyFactRepository(db=setup_db)
+    fact = repo.create("Fact 1")
+
+    with patch.object(repo, "get_all", wraps=repo.get_all) as get_all:
+        formatted = repo.get_formatted_facts()
+        assert "Fact 1" in formatted
+        assert repo.get_formatted_facts() == formatted
+        assert repo.get_facts_dict() == {fact.id: "Fact 1"}
+        assert get_all.call_count == 1
+
+        repo.update(fact.id, "Fact 1 updated")
+        assert "Fact 1 updated" in repo.get_formatted_facts()
+
+        second = repo.create("Fact 2")
+        assert "Fact 2" in repo.get_formatted_facts()
+
+        repo.delete(second.id)
+        assert "Fact 2" not in repo.get_formatted_facts()
+        assert get_all.call_count == 4
+
+    # Another repository instance in the process sees the write too
+    other = KeyFactRepository(db=setup_db)
+    assert other.get_formatted_facts() == repo.get_formatted_facts()
+    other.create("Fact 3")
+    assert "Fact 3" in repo.get_formatted_facts()
+
+
+def test_formatted_facts_cache_survives_other_table_writes_on_a_file_db(tmp_path):
+    """Trajectory writes from the writer thread do not invalidate the cache; key fact writes from another connection do."""
+    db = peewee.SqliteDatabase(str(tmp_path / "pk.db"), pragmas={"journal_mode": "wal"})
+    db._is_in_memory = False
+    models = [Session, HumanInput, Trajectory, KeyFact]
+    with db.bind_ctx(models):
+        db.create_tables(models)
+        repo = KeyFactRepository(db=db)
+        trajectory_repo = TrajectoryRepository(db, write_behind=True)
+        repo.create("Fact 1")
+
+        with patch.object(repo, "get_all", wraps=repo.get_all) as get_all:
+            formatted = repo.get_formatted_facts()
+            for i in range(3):
+                trajectory_repo.create(tool_name=f"tool_{i}")
+                assert trajectory_repo.flush(timeout=10)
+                assert repo.get_formatted_facts() == formatted
+            assert get_all.call_count == 1
+
+            # A key fact written by another connection, e.g. another ra-aid process
+            other = peewee.SqliteDatabase(str(tmp_path / "pk.db"))
+            other.execute_sql(
+                "INSERT INTO key_fact (content, created_at, updated_at) VALUES ('Fact 2', '2025-01-01', '2025-01-01')"
+            )
+            other.close()
+            assert "Fact 2" in repo.get_formatted_facts()
+            assert get_all.call_count == 2
+
+        get_trajectory_writer(db).close()
+    db.close()
+
+
+def test_session_scoped_queries(setup_db):
+    """get_all and count filter by session, and get_all keeps the most recent or oldest window."""
+    setup_db.create_tables([Session], safe=True)
+    first = Session.create(start_time=datetime.datetime.now())
+    second = Session.create(start_time=datetime.datetime.now())
+    repo = KeyFactRepository(db=setup_db)
+
+    old = repo.create("Old fact", session_id=first.id)
+    facts = [repo.create(f"Fact {i}", session_id=second.id) for i in range(3)]
+
+    assert repo.count() == 4
+    assert repo.count(session_id=first.id) == 1
+    assert [fact.id for fact in repo.get_all(session_id=second.id)] == [fact.id for fact in facts]
+    assert all(fact.session_id == second.id for fact in facts)
+    assert [fact.content for fact in repo.get_all(limit=2)] == ["Fact 1", "Fact 2"]
+    assert [fact.id for fact in repo.get_all(limit=2, oldest=True)] == [old.id, facts[0].id]
+    assert [fact.content for fact in repo.get_all(session_id=second.id, limit=1, oldest=True)] == ["Fact 0"]
+
+
 def test_repository_init_without_db():
     """Test that KeyFactRepository raises an error when initialized without a db parameter."""
     # Attempt to create a repository without a database connection
@@ -0,0 +1,135 @@
+"""
+Query plan checks for hot trajectory and session-scoped memory queries.
+
+Each test runs a repository method against a fully migrated database, captures
+the SQL it executes and asserts that SQLite answers it from an index rather than
+scanning the table or sorting its rows.
+"""
+
+import datetime
+from unittest.mock import patch
+
+import peewee
+import pytest
+
+from ra_aid.database.connection import DatabaseManager, db_var
+from ra_aid.database.migrations import MigrationManager
+from ra_aid.database.models import (
+    HumanInput,
+    KeyFact,
+    KeySnippet,
+    ResearchNote,
+    Session,
+    Trajectory,
+)
+from ra_aid.database.repositories.key_fact_repository import KeyFactRepository
+from ra_aid.database.repositories.key_snippet_repository import KeySnippetRepository
+from ra_aid.database.repositories.research_note_repository import ResearchNoteRepository
+from ra_aid.database.repositories.trajectory_repository import TrajectoryRepository
+
+MODELS = [Session, HumanInput, KeyFact, KeySnippet, ResearchNote, Trajectory]
+
+
+@pytest.fixture
+def migrated_db():
+    """Provide an in-memory database with the application schema and every migration applied."""
+    db_var.set(None)
+    with DatabaseManager(in_memory=True) as db:
+        with db.bind_ctx(MODELS):
+            db.create_tables(MODELS, safe=True)
+            assert MigrationManager(db_path=":memory:").apply_migrations()
+            session = Session.create(start_time=datetime.datetime.now())
+            human_input = HumanInput.create(content="hello", source="cli", session=session)
+            for _ in range(3):
+                Trajectory.create(
+                    session=session,
+                    human_input=human_input,
+                    record_type="model_usage",
+                    current_cost=0.01,
+                    input_tokens=10,
+                    output_tokens=5,
+                )
+            yield db
+    db_var.set(None)
+
+
+def table_plans(db, fn, table="trajectory"):
+    """Run fn and return the query plan of each SELECT from table it executes."""
+    executed = []
+
+    def capture(self, sql, params=None, *args, **kwargs):
+        executed.append((sql, params))
+        return original(self, sql, params, *args, **kwargs)
+
+    original = peewee.SqliteDatabase.execute_sql
+    with patch.object(peewee.SqliteDatabase, "execute_sql", autospec=True, side_effect=capture):
+        fn()
+
+    plans = []
+    for sql, params in executed:
+        if sql.startswith("SELECT") and f'"{table}"' in sql:
+            rows = db.execute_sql(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            plans.append((sql, [row[-1] for row in rows]))
+    assert plans, f"no {table} query was executed"
+    return plans
+
+
+def assert_indexed(plans, table="trajectory"):
+    for sql, details in plans:
+        for detail in details:
+            assert not (detail.startswith(f"SCAN {table}") and "INDEX" not in detail), (
+                f"full table scan of {table} for {sql}: {details}"
+            )
+            assert "TEMP B-TREE" not in detail, f"sort without index for {sql}: {details}"
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda repo: repo.get_trajectories_by_session(1),
+        lambda repo: repo.get_trajectories_by_session(1, after_id=1, limit=2),
+        lambda repo: repo.get_trajectories_by_session(1, limit=2, include_payload=False),
+        lambda repo: repo.get_trajectories_by_human_input(1),
+        lambda repo: repo.get_session_usage_totals(1),
+        lambda repo: repo.get_usage_totals_by_session(),
+        lambda repo: repo.get_usage_totals_by_session(since=datetime.datetime(2025, 1, 1)),
+    ],
+    ids=[
+        "by_session",
+        "by_session_keyset",
+        "by_session_summary",
+        "by_human_input",
+        "session_usage_totals",
+        "usage_totals_by_session",
+        "usage_totals_by_session_since",
+    ],
+)
+def test_hot_trajectory_queries_use_indexes(migrated_db, call):
+    """Hot trajectory queries must not scan or sort the trajectory table."""
+    repo = TrajectoryRepository(db=migrated_db)
+
+    assert_indexed(table_plans(migrated_db, lambda: call(repo)))
+
+
+@pytest.mark.parametrize(
+    "repo_class, table",
+    [
+        (KeyFactRepository, "key_fact"),
+        (KeySnippetRepository, "key_snippet"),
+        (ResearchNoteRepository, "research_note"),
+    ],
+)
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda repo: repo.get_all(session_id=1),
+        lambda repo: repo.get_all(session_id=1, limit=2),
+        lambda repo: repo.count(session_id=1),
+    ],
+    ids=["session", "session_window", "session_count"],
+)
+def test_session_scoped_memory_queries_use_indexes(migrated_db, repo_class, table, call):
+    """Session-scoped key fact, snippet and note reads are served by the session index."""
+    repo = repo_class(db=migrated_db)
+
+    assert_indexed(table_plans(migrated_db, lambda: call(repo), table), table)
@@ -10,7 +10,7 @@ from unittest.mock import patch
 import peewee
 
 from ra_aid.database.connection import DatabaseManager, db_var
-from ra_aid.database.models import Session, BaseModel, HumanInput
+from ra_aid.database.models import Session, BaseModel, HumanInput, Trajectory
 from ra_aid.database.repositories.session_repository import (
     SessionRepository,
     SessionRepositoryManager,
@@ -669,3 +669,57 @@ def test_display_name_in_get_recent(setup_db):
     session2_result = next((s for s in sessions if s.id == session2.id), None)
     assert session2_result is not None
     assert session2_result.display_name == "This is a human input for session 2"
+
+
+def test_get_all_uses_single_query(setup_db):
+    """Test that listing sessions does not issue a query per session."""
+    for i in range(5):
+        session = Session.create(command_line=f"ra-aid command{i}")
+        HumanInput.create(session=session, content=f"input {i}", source="cli")
+
+    repo = SessionRepository(setup_db)
+    with patch.object(
+        peewee.SqliteDatabase,
+        "execute_sql",
+        autospec=True,
+        side_effect=peewee.SqliteDatabase.execute_sql,
+    ) as execute_sql:
+        sessions, count = repo.get_all(limit=5)
+
+    assert count == 5
+    assert sorted(s.display_name for s in sessions) == [f"input {i}" for i in range(5)]
+    # One COUNT for the total plus one query for the page
+    assert execute_sql.call_count == 2
+
+
+def test_get_all_with_usage(setup_db):
+    """Test that per-session usage totals are filled in when requested."""
+    setup_db.create_tables([Trajectory], safe=True)
+    try:
+        used = Session.create(command_line="ra-aid used")
+        unused = Session.create(command_line="ra-aid unused")
+        for cost, input_tokens, output_tokens in [(0.5, 100, 10), (0.25, 50, 5)]:
+            Trajectory.create(
+                session=used,
+                record_type="model_usage",
+                current_cost=cost,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+            )
+        Trajectory.create(session=used, record_type="tool_execution", input_tokens=999)
+
+        repo = SessionRepository(setup_db)
+        sessions, _ = repo.get_all(include_usage=True)
+        by_id = {session.id: session for session in sessions}
+
+        assert by_id[used.id].total_cost == pytest.approx(0.75)
+        assert by_id[used.id].total_input_tokens == 150
+        assert by_id[used.id].total_output_tokens == 15
+        assert by_id[used.id].total_tokens == 165
+        assert by_id[unused.id].total_cost == 0.0
+        assert by_id[unused.id].total_tokens == 0
+
+        sessions, _ = repo.get_all()
+        assert all(session.total_cost is None for session in sessions)
+    finally:
+        Trajectory.drop_table(safe=True)
@@ -2,6 +2,7 @@
 Tests for the TrajectoryRepository class.
 """
 
+import datetime
 import pytest
 import json
 import logging
@@ -599,6 +600,47 @@ def test_get_session_usage_totals_with_nulls(setup_db):
     assert totals["total_tokens"] == 250  # 200 + 50
 
 
+def test_get_usage_totals_by_session(setup_db):
+    """Test aggregating usage totals for all sessions in one query."""
+    repo = TrajectoryRepository(db=setup_db)
+    Session.create(id=2, name="Test Session 2")
+    Session.create(id=3, name="Test Session 3")
+
+    old = datetime.datetime(2025, 1, 1)
+    Trajectory.create(
+        session=1, record_type="model_usage", current_cost=0.001,
+        input_tokens=100, output_tokens=50, created_at=old,
+    )
+    Trajectory.create(
+        session=1, record_type="model_usage", current_cost=0.002,
+        input_tokens=None, output_tokens=100,
+    )
+    Trajectory.create(
+        session=1, record_type="tool_execution", current_cost=0.999,
+        input_tokens=999, output_tokens=999,
+    )
+    Trajectory.create(
+        session=2, record_type="model_usage", current_cost=0.004,
+        input_tokens=400, output_tokens=200, created_at=old,
+    )
+
+    totals = repo.get_usage_totals_by_session()
+
+    assert set(totals) == {1, 2}
+    assert totals[1]["total_cost"] == pytest.approx(0.003)
+    assert totals[1]["total_input_tokens"] == 100
+    assert totals[1]["total_output_tokens"] == 150
+    assert totals[1]["total_tokens"] == 250
+    assert totals[2] == repo.get_session_usage_totals(2)
+
+    # Only records created on or after since are counted
+    recent = repo.get_usage_totals_by_session(since=datetime.datetime(2025, 6, 1))
+
+    assert set(recent) == {1}
+    assert recent[1]["total_cost"] == pytest.approx(0.002)
+    assert recent[1]["total_tokens"] == 100
+
+
 def test_get_trajectories_by_session(setup_db, mock_session_repository, cleanup_repo): # Use cleanup_repo fixture
     """Test retrieving trajectories by session ID."""
     # Set up repository
@@ -636,6 +678,35 @@ def test_get_trajectories_by_session(setup_db, mock_session_repository, cleanup_
         assert trajectory.tool_name.startswith("tool_s2")
 
 
+def test_get_trajectories_by_session_pages(setup_db, mock_session_repository, cleanup_repo):
+    """Test keyset pagination, projection and batched iteration by session."""
+    repo = TrajectoryRepository(db=setup_db)
+    for i in range(5):
+        repo.create(
+            tool_name=f"tool_{i}",
+            tool_result={"n": i},
+            step_data={"display_title": "Step"},
+            session_id=1,
+        )
+
+    first_page = repo.get_trajectories_by_session(1, limit=2)
+    assert [t.tool_name for t in first_page] == ["tool_0", "tool_1"]
+
+    next_page = repo.get_trajectories_by_session(1, after_id=first_page[-1].id, limit=2)
+    assert [t.tool_name for t in next_page] == ["tool_2", "tool_3"]
+
+    summary = repo.get_trajectories_by_session(1, limit=1, include_payload=False)
+    assert summary[0].tool_name == "tool_0"
+    assert summary[0].tool_result is None
+    assert summary[0].step_data is None
+
+    batches = list(repo.iter_trajectories_by_session(1, after_id=first_page[0].id, batch_size=2))
+    assert [[t.tool_name for t in batch] for batch in batches] == [
+        ["tool_1", "tool_2"],
+        ["tool_3", "tool_4"],
+    ]
+
+
 def test_trajectory_repository_manager(setup_db, cleanup_repo, mock_session_repository):
     """Test the TrajectoryRepositoryManager context manager."""
     # Use the context manager to create a repository
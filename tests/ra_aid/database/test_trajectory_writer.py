@@ -0,0 +1,137 @@
+"""
+Tests for the write-behind trajectory writer.
+"""
+
+import threading
+
+import peewee
+import pytest
+
+from ra_aid.database.models import HumanInput, Session, Trajectory
+from ra_aid.database.repositories.trajectory_repository import (
+    TrajectoryRepository,
+    TrajectoryRepositoryManager,
+)
+from ra_aid.database.trajectory_writer import TrajectoryWriter, get_trajectory_writer
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """A file-based database bound to the trajectory models, as the writer thread needs."""
+    db = peewee.SqliteDatabase(
+        str(tmp_path / "pk.db"),
+        pragmas={"journal_mode": "wal", "foreign_keys": 1},
+    )
+    db._is_in_memory = False
+    models = [Session, HumanInput, Trajectory]
+    with db.bind_ctx(models):
+        db.create_tables(models)
+        Session.create(id=1, name="Test Session")
+        yield db
+        get_trajectory_writer(db).close()
+    db.close()
+
+
+def test_write_behind_enabled_only_for_file_databases(file_db):
+    in_memory_db = peewee.SqliteDatabase(":memory:")
+    in_memory_db._is_in_memory = True
+
+    assert TrajectoryRepository(file_db).write_behind is True
+    assert TrajectoryRepository(in_memory_db).write_behind is False
+
+
+def test_create_is_queued_and_written_in_batches(file_db):
+    repo = TrajectoryRepository(file_db)
+
+    models = [
+        repo.create(
+            tool_name=f"tool_{i}",
+            tool_parameters={"i": i},
+            step_data={"display_title": "Step"},
+            session_id=1,
+        )
+        for i in range(250)
+    ]
+
+    assert all(model.id is None for model in models)
+    assert models[0].tool_parameters == {"i": 0}
+    assert repo.flush(timeout=10)
+
+    rows = list(Trajectory.select().order_by(Trajectory.id))
+    assert [row.tool_name for row in rows] == [f"tool_{i}" for i in range(250)]
+    assert rows[0].session_id == 1
+    writer = get_trajectory_writer(file_db)
+    assert writer.stats()["records_written"] == 250
+    assert writer.stats()["batches_written"] <= 250
+
+
+def test_hooks_receive_committed_records(file_db):
+    repo = TrajectoryRepository(file_db)
+    received = []
+    hook_threads = set()
+
+    def hook(model):
+        received.append(model)
+        hook_threads.add(threading.current_thread().name)
+
+    repo.register_create_hook(hook)
+    for i in range(5):
+        repo.create(tool_name="tool", tool_result={"n": i}, session_id=1)
+    repo.flush(timeout=10)
+
+    ids = [row.id for row in Trajectory.select().order_by(Trajectory.id)]
+    assert [model.id for model in received] == ids
+    assert [model.tool_result for model in received] == [{"n": i} for i in range(5)]
+    assert hook_threads == {"trajectory-writer"}
+
+
+def test_reads_see_queued_records(file_db):
+    repo = TrajectoryRepository(file_db)
+    repo.create(tool_name="tool", session_id=1)
+
+    assert [model.tool_name for model in repo.get_trajectories_by_session(1)] == ["tool"]
+
+
+def test_unknown_human_input_is_dropped(file_db):
+    repo = TrajectoryRepository(file_db)
+    human_input = HumanInput.create(content="hi", source="test")
+
+    repo.create(tool_name="known", human_input_id=human_input.id, session_id=1)
+    repo.create(tool_name="unknown", human_input_id=9999, session_id=1)
+    repo.flush(timeout=10)
+
+    rows = {row.tool_name: row.human_input_id for row in Trajectory.select()}
+    assert rows == {"known": human_input.id, "unknown": None}
+
+
+def test_manager_exit_writes_queued_records(file_db):
+    with TrajectoryRepositoryManager(file_db) as repo:
+        writer = get_trajectory_writer(file_db)
+        for _ in range(20):
+            repo.create(tool_name="tool", session_id=1)
+
+    assert writer.closed
+    assert writer.pending() == 0
+    assert Trajectory.select().count() == 20
+
+
+def test_closed_writer_rejects_records(file_db):
+    writer = TrajectoryWriter()
+    writer.close()
+
+    with pytest.raises(RuntimeError):
+        writer.submit({"tool_name": "tool"})
+
+
+def test_writer_shared_by_managers_stays_open_until_last_exit(file_db):
+    with TrajectoryRepositoryManager(file_db) as outer_repo:
+        writer = get_trajectory_writer(file_db)
+        with TrajectoryRepositoryManager(file_db) as inner_repo:
+            inner_repo.create(tool_name="inner", session_id=1)
+
+        assert not writer.closed
+        assert Trajectory.select().count() == 1
+        outer_repo.create(tool_name="outer", session_id=1)
+
+    assert writer.closed
+    assert Trajectory.select().count() == 2
@@ -1,11 +1,18 @@
 """Tests for the interactive subprocess module."""
 
 import os
+import re
 import tempfile
 
 import pytest
 
-from ra_aid.proc.interactive import run_interactive_command
+from ra_aid.proc.interactive import (
+    HeadTailBuffer,
+    clean_pipe_output,
+    keep_head_and_tail,
+    run_interactive_command,
+    should_use_pty,
+)
 
 
 def test_basic_command():
@@ -198,3 +205,146 @@ def test_tty_available():
         b"/dev/pts/" in output_cleaned or b"/dev/ttys" in output_cleaned
     ), f"Unexpected TTY output: {output_cleaned}"
     assert retcode == 0
+
+
+def test_pipe_mode_basic_command():
+    """Test running a command over pipes instead of a pty."""
+    output, retcode = run_interactive_command(
+        ["/bin/bash", "-c", "echo stdout; echo stderr >&2; exit 3"], use_pty=False
+    )
+    assert b"stdout" in output
+    assert b"stderr" in output
+    assert retcode == 3
+
+
+def test_pipe_mode_has_no_tty():
+    """Test that pipe mode does not allocate a terminal."""
+    output, retcode = run_interactive_command(["/bin/bash", "-c", "tty"], use_pty=False)
+    assert b"/dev/pts/" not in output
+    assert retcode != 0
+
+
+def test_pipe_mode_strips_ansi_and_carriage_returns():
+    """Test that pipe mode output matches what a terminal would display."""
+    cmd = r'printf "\033[31mred\033[0m text   \n10%%\r50%%\r100%%\n\n"'
+    output, retcode = run_interactive_command(["/bin/bash", "-c", cmd], use_pty=False)
+    assert output == b"red text\n100%"
+    assert retcode == 0
+
+
+def test_pipe_mode_keeps_head_and_tail_of_large_output():
+    """Test that pipe mode keeps the start and end of huge outputs."""
+    cmd = 'for i in $(seq 1 200000); do echo "Line $i of test output"; done'
+    output, retcode = run_interactive_command(["/bin/bash", "-c", cmd], use_pty=False)
+    assert len(output) <= 8000
+    assert b"Line 1 of test output" in output
+    assert b"Line 200000 of test output" in output
+    assert re.search(rb"\[\.\.\. \d+ lines \(\d+ bytes\) of output omitted \.\.\.\]", output)
+    assert retcode == 0
+
+
+def test_pipe_mode_timeout():
+    """Test that pipe mode terminates commands that exceed the timeout."""
+    output, retcode = run_interactive_command(
+        ["/bin/bash", "-c", "echo started; sleep 30"],
+        expected_runtime_seconds=1,
+        use_pty=False,
+    )
+    assert b"started" in output
+    assert b"Process exceeded timeout" in output
+    assert retcode != 0
+
+
+def test_head_tail_buffer_is_bounded():
+    """Test that the head/tail buffer keeps a fixed number of lines and counts the rest."""
+    buffer = HeadTailBuffer(head_lines=2, tail_lines=2)
+    for chunk in (b"one\ntw", b"o\nthree\nfour\n", b"five\nsix\n"):
+        buffer.write(chunk)
+    assert buffer.head == [b"one\n", b"two\n"]
+    assert list(buffer.tail) == [b"five\n", b"six\n"]
+    assert buffer.dropped_lines == 2
+    assert buffer.dropped_bytes == len(b"three\nfour\n")
+    assert buffer.getvalue() == (
+        b"one\ntwo\n[... 2 lines (11 bytes) of output omitted ...]\nfive\nsix\n"
+    )
+
+
+def test_head_tail_buffer_small_output():
+    buffer = HeadTailBuffer(head_lines=2, tail_lines=2)
+    buffer.write(b"a\nb\nc")
+    assert buffer.getvalue() == b"a\nb\nc"
+    assert buffer.dropped_lines == 0
+
+
+def test_head_tail_buffer_long_line_keeps_end():
+    buffer = HeadTailBuffer(head_lines=1, tail_lines=1, max_line_bytes=4)
+    buffer.write(b"10%\r50%\r")
+    buffer.write(b"100%")
+    assert bytes(buffer.partial) == b"100%"
+    assert buffer.dropped_bytes == 8
+
+
+def test_keep_head_and_tail_short_text_unchanged():
+    assert keep_head_and_tail("a\nb", max_bytes=100, head_bytes=10) == "a\nb"
+
+
+def test_keep_head_and_tail_reports_omitted_lines():
+    text = "\n".join(f"line {i:03d}" for i in range(100))
+    result = keep_head_and_tail(text, max_bytes=200, head_bytes=20)
+    lines = result.split("\n")
+    assert len(result.encode()) <= 200
+    assert lines[:2] == ["line 000", "line 001"]
+    assert lines[-1] == "line 099"
+    omitted = 100 - 2 - (len(lines) - 3)
+    assert lines[2] == f"[... {omitted} lines ({omitted * 9} bytes) of output omitted ...]"
+
+
+def test_keep_head_and_tail_merges_capture_marker():
+    text = "\n".join(
+        ["head"] + ["x" * 50] * 3 + ["[... 10 lines (500 bytes) of output omitted ...]"] + ["tail"]
+    )
+    result = keep_head_and_tail(text, max_bytes=100, head_bytes=5)
+    assert result == "head\n[... 13 lines (653 bytes) of output omitted ...]\ntail"
+
+
+def test_keep_head_and_tail_head_fills_budget():
+    result = keep_head_and_tail("a" * 50 + "\n" + "b" * 5000, max_bytes=100, head_bytes=60)
+    assert result == "a" * 50 + "\n[... 0 lines (5000 bytes) of output omitted ...]\n"
+
+
+def test_large_output_reports_omitted_lines():
+    """Test that pty mode keeps the head and tail of output larger than the capture buffer."""
+    cmd = 'for i in $(seq 1 20000); do echo "Line $i of test output"; done'
+    output, retcode = run_interactive_command(["/bin/bash", "-c", cmd], use_pty=True)
+    assert len(output) <= 8000
+    assert b"Line 1 of test output" in output
+    assert b"Line 20000 of test output" in output
+    assert b"of output omitted" in output
+    assert retcode == 0
+
+
+def test_clean_pipe_output():
+    assert clean_pipe_output("\x1b[1mbold\x1b[0m\r\n\n  \nlast  ") == ["bold", "last"]
+
+
+@pytest.mark.parametrize(
+    "cmd,expected",
+    [
+        (["rg", "pattern"], False),
+        (["git", "diff", "HEAD"], False),
+        (["git", "commit"], True),
+        (["/bin/bash", "-c", "rg foo | head -20"], False),
+        (["/bin/bash", "-c", "cd src && python -m pytest -x 2>&1"], False),
+        (["/bin/bash", "-c", "npm test"], False),
+        (["/bin/bash", "-c", "git --no-pager log -5"], False),
+        (["/bin/bash", "-c", "FOO=1 pytest tests"], False),
+        (["/bin/bash", "-c", "npm install"], True),
+        (["/bin/bash", "-c", "ls && vim file.txt"], True),
+        (["/bin/bash", "-c", "echo $(read x)"], True),
+        (["/bin/bash", "-c", "tty"], True),
+        (["aider", "--message", "hi"], True),
+        ([], True),
+    ],
+)
+def test_should_use_pty(cmd, expected):
+    assert should_use_pty(cmd) is expected
@@ -0,0 +1,151 @@
+"""
+Tests for the bounded agent executor and the spawn-agent queue endpoints.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ra_aid.database.repositories.session_repository import get_session_repository
+from ra_aid.server import server
+from ra_aid.server.agent_executor import AgentExecutor, set_agent_executor
+from ra_aid.server.api_v1_spawn_agent import get_executor, router
+
+
+class Gate:
+    """Agent stand-in that blocks until released and records the order it ran in."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = []
+        self.started_event = threading.Condition()
+
+    def run(self, name):
+        with self.started_event:
+            self.started.append(name)
+            self.started_event.notify_all()
+        self.release.wait(timeout=5)
+
+    def wait_started(self, count):
+        with self.started_event:
+            assert self.started_event.wait_for(lambda: len(self.started) >= count, timeout=5)
+
+
+@pytest.fixture
+def executor():
+    executor = AgentExecutor(max_workers=1)
+    yield executor
+    executor.shutdown()
+
+
+def test_executor_bounds_concurrency_and_orders_by_priority(executor):
+    """Only max_workers agents run; the rest leave the queue by priority, then FIFO."""
+    gate = Gate()
+    executor.submit(1, gate.run, "first")
+    gate.wait_started(1)
+    executor.submit(2, gate.run, "low")
+    executor.submit(3, gate.run, "high", priority=5)
+    executor.submit(4, gate.run, "low-later")
+
+    stats = executor.stats()
+    assert stats["running"] == 1
+    assert stats["utilization"] == 1.0
+    assert [job["session_id"] for job in stats["queued_jobs"]] == [3, 2, 4]
+    assert executor.get_job(2)["queue_position"] == 2
+    assert executor.get_job(1)["state"] == "running"
+
+    gate.release.set()
+    gate.wait_started(4)
+    assert gate.started == ["first", "high", "low", "low-later"]
+
+
+def test_executor_cancels_only_queued_jobs(executor):
+    gate = Gate()
+    executor.submit(1, gate.run, "running")
+    gate.wait_started(1)
+    executor.submit(2, gate.run, "queued")
+
+    assert executor.cancel(1) is False
+    assert executor.cancel(2) is True
+    assert executor.cancel(2) is False
+    assert executor.get_job(2)["state"] == "cancelled"
+    assert executor.stats()["queued"] == 0
+
+    gate.release.set()
+
+
+def test_shutdown_cancels_queued_jobs(executor):
+    gate = Gate()
+    executor.submit(1, gate.run, "running")
+    gate.wait_started(1)
+    executor.submit(2, gate.run, "queued")
+    executor.submit(3, gate.run, "queued-first", priority=5)
+
+    assert executor.shutdown() == [3, 2]
+    assert executor.get_job(2)["state"] == "cancelled"
+    assert executor.get_job(3)["finished_at"] is not None
+    assert executor.get_job(1)["state"] == "running"
+    with pytest.raises(RuntimeError):
+        executor.submit(4, gate.run, "late")
+
+    gate.release.set()
+
+
+def test_server_shutdown_marks_queued_sessions_cancelled(executor):
+    """Sessions of agents still queued when the server stops do not stay 'pending'."""
+    gate = Gate()
+    set_agent_executor(executor)
+    repo = MagicMock()
+    repo.update_session_status.return_value = None
+    try:
+        with patch.object(server, "get_session_repository", return_value=repo), TestClient(server.app):
+            executor.submit(1, gate.run, "running")
+            gate.wait_started(1)
+            executor.submit(2, gate.run, "queued")
+    finally:
+        set_agent_executor(None)
+        gate.release.set()
+
+    repo.update_session_status.assert_called_once_with(2, "cancelled")
+    assert executor.get_job(2)["state"] == "cancelled"
+
+
+@pytest.fixture
+def client(executor):
+    app = FastAPI()
+    app.include_router(router)
+    repo = MagicMock()
+    repo.update_session_status.return_value = None
+    app.dependency_overrides[get_session_repository] = lambda: repo
+    app.dependency_overrides[get_executor] = lambda: executor
+    client = TestClient(app)
+    client.repo = repo
+    yield client
+    app.dependency_overrides.clear()
+
+
+def test_queue_and_cancel_endpoints(client, executor):
+    """The queue endpoint reports utilization and DELETE cancels queued agents only."""
+    gate = Gate()
+    executor.submit(1, gate.run, "running")
+    gate.wait_started(1)
+    executor.submit(2, gate.run, "queued")
+
+    queue = client.get("/v1/spawn-agent/queue").json()
+    assert queue["max_workers"] == 1
+    assert queue["running"] == 1
+    assert [job["session_id"] for job in queue["queued_jobs"]] == [2]
+
+    assert client.get("/v1/spawn-agent/2").json()["queue_position"] == 1
+    assert client.get("/v1/spawn-agent/99").status_code == 404
+    assert client.delete("/v1/spawn-agent/1").status_code == 409
+
+    response = client.delete("/v1/spawn-agent/2")
+    assert response.status_code == 200
+    assert response.json()["state"] == "cancelled"
+    client.repo.update_session_status.assert_called_once_with(2, "cancelled")
+
+    gate.release.set()
@@ -0,0 +1,54 @@
+"""
+Tests for running spawned agents in worker processes.
+"""
+
+import os
+from unittest.mock import patch
+
+from ra_aid.database.repositories.config_repository import ConfigRepository
+from ra_aid.server.agent_process import run_agent_process
+
+
+def broadcasting_agent(conn, message, session_id, config, research_only, kwargs):
+    """Child target that reports what it received as broadcasts and exits cleanly."""
+    conn.send({"type": "trajectory", "payload": {"session_id": session_id, "message": message}})
+    conn.send({"type": "config", "payload": {"config": config, "research_only": research_only, **kwargs}})
+    conn.close()
+
+
+def crashing_agent(conn, message, session_id, config, research_only, kwargs):
+    """Child target that sends one broadcast and dies without cleaning up."""
+    conn.send({"type": "trajectory", "payload": {"session_id": session_id}})
+    os._exit(3)
+
+
+def run(target, **kwargs):
+    config_repo = ConfigRepository()
+    config_repo.set("provider", "anthropic")
+    with patch("ra_aid.server.agent_process.send_broadcast") as send_broadcast, patch(
+        "ra_aid.server.agent_process._mark_session_failed"
+    ) as mark_failed:
+        exit_code = run_agent_process("task", 7, config_repo, process_target=target, **kwargs)
+    return exit_code, [c.args[0] for c in send_broadcast.call_args_list], mark_failed
+
+
+def test_child_broadcasts_are_relayed():
+    """Everything the child sends reaches send_broadcast in order, along with its arguments."""
+    exit_code, messages, mark_failed = run(broadcasting_agent, research_only=True, temperature=0.5)
+
+    assert exit_code == 0
+    assert messages[0] == {"type": "trajectory", "payload": {"session_id": 7, "message": "task"}}
+    payload = messages[1]["payload"]
+    assert payload["config"]["provider"] == "anthropic"
+    assert payload["research_only"] is True
+    assert payload["temperature"] == 0.5
+    mark_failed.assert_not_called()
+
+
+def test_crashed_child_marks_session_failed():
+    """A child that dies still has its earlier broadcasts relayed and its session marked 'error'."""
+    exit_code, messages, mark_failed = run(crashing_agent)
+
+    assert exit_code == 3
+    assert messages == [{"type": "trajectory", "payload": {"session_id": 7}}]
+    mark_failed.assert_called_once_with(7)
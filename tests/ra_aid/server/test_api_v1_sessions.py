@@ -10,6 +10,7 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
 import datetime
+import json
 
 from ra_aid.server.api_v1_sessions import router, get_repository
 from ra_aid.database.pydantic_models import SessionModel, TrajectoryModel
@@ -187,7 +188,15 @@ def test_list_sessions(client, mock_repo, mock_sessions):
     assert len(data["items"]) == len(mock_sessions)
     assert data["limit"] == 10
     assert data["offset"] == 0
-    mock_repo.get_all.assert_called_once_with(offset=0, limit=10)
+    mock_repo.get_all.assert_called_once_with(offset=0, limit=10, include_usage=False)
+
+
+def test_list_sessions_with_usage(client, mock_repo):
+    """Test requesting per-session usage totals when listing sessions."""
+    response = client.get("/v1/session?limit=5&include_usage=true")
+
+    assert response.status_code == 200
+    mock_repo.get_all.assert_called_once_with(offset=0, limit=5, include_usage=True)
 
 
 def test_create_session(client, mock_repo, mock_session):
@@ -237,7 +246,10 @@ def test_get_session_trajectories(client, mock_repo, mock_trajectory_repo, mock_
     
     # Verify correct method calls
     mock_repo.get.assert_called_once_with(1)
-    mock_trajectory_repo.get_trajectories_by_session.assert_called_once_with(1)
+    mock_trajectory_repo.get_trajectories_by_session.assert_called_once_with(
+        1, after_id=None, limit=None, include_payload=True
+    )
+    assert "X-Next-After-Id" not in response.headers
 
 
 def test_get_session_trajectories_not_found(client, mock_repo, mock_trajectory_repo):
@@ -252,3 +264,52 @@ def test_get_session_trajectories_not_found(client, mock_repo, mock_trajectory_r
     mock_repo.get.assert_called_once_with(999)
     # Ensure the trajectory repository is not called
     mock_trajectory_repo.get_trajectories_by_session.assert_not_called()
+
+
+def test_get_session_trajectories_page(client, mock_repo, mock_trajectory_repo, mock_trajectories):
+    """Test keyset pagination and field projection for session trajectories."""
+    response = client.get("/v1/session/1/trajectory?after_id=5&limit=2&fields=summary")
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["X-Next-After-Id"] == str(mock_trajectories[-1].id)
+    mock_trajectory_repo.get_trajectories_by_session.assert_called_once_with(
+        1, after_id=5, limit=2, include_payload=False
+    )
+
+
+def test_get_session_trajectories_invalid_fields(client, mock_trajectory_repo):
+    """Test that unknown field projections are rejected."""
+    response = client.get("/v1/session/1/trajectory?fields=everything")
+
+    assert response.status_code == 422
+    mock_trajectory_repo.get_trajectories_by_session.assert_not_called()
+
+
+def test_stream_session_trajectories(client, mock_repo, mock_trajectory_repo, mock_trajectories):
+    """Test streaming session trajectories as NDJSON."""
+    mock_trajectory_repo.iter_trajectories_by_session.return_value = iter(
+        [mock_trajectories[:1], mock_trajectories[1:]]
+    )
+
+    response = client.get("/v1/session/1/trajectory/stream?after_id=0")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [1, 2]
+    # Records are serialized the same way as by the non-streaming endpoint
+    assert lines == client.get("/v1/session/1/trajectory").json()
+    mock_trajectory_repo.iter_trajectories_by_session.assert_called_once_with(
+        1, after_id=0, include_payload=True
+    )
+
+
+def test_stream_session_trajectories_not_found(client, mock_repo, mock_trajectory_repo):
+    """Test streaming trajectories for a session that doesn't exist."""
+    mock_repo.get.return_value = None
+
+    response = client.get("/v1/session/999/trajectory/stream")
+
+    assert response.status_code == 404
+    mock_trajectory_repo.iter_trajectories_by_session.assert_not_called()
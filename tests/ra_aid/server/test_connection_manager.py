@@ -0,0 +1,230 @@
+"""
+Tests for the WebSocket broadcast pipeline.
+
+Covers per-client send queues in ConnectionManager, the loop-native
+BroadcastQueue, the batching broadcast_consumer in server.py and the
+session subscription and resume handshake of /v1/ws.
+"""
+
+import asyncio
+import datetime
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+from ra_aid.database.pydantic_models import TrajectoryModel
+from ra_aid.server.broadcast_sender import BroadcastQueue
+from ra_aid.server.connection_manager import ConnectionManager
+from ra_aid.server.server import broadcast_consumer, handle_client_message
+
+
+class FakeWebSocket:
+    """WebSocket stand-in that records frames and can be held to act as a slow client."""
+
+    def __init__(self, name, blocked=False):
+        self.client = name
+        self.frames = []
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        await self.unblocked.wait()
+        self.frames.append(message)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_slow_client_does_not_block_others():
+    """A client that never finishes sending only backs up its own queue."""
+
+    async def scenario():
+        manager = ConnectionManager(max_queue_size=3)
+        fast = FakeWebSocket("fast")
+        slow = FakeWebSocket("slow", blocked=True)
+        await manager.connect(fast)
+        await manager.connect(slow)
+
+        for i in range(5):
+            manager.broadcast(f"m{i}")
+            await settle()
+
+        assert fast.frames == ["m0", "m1", "m2", "m3", "m4"]
+        slow_stats = manager.clients[slow].stats()
+        # m0 is in flight, m1 was dropped to keep the queue at its bound
+        assert slow_stats["queue_depth"] == 3
+        assert slow_stats["dropped"] == 1
+
+        slow.unblocked.set()
+        await settle()
+        assert slow.frames == ["m0", "m2", "m3", "m4"]
+
+        stats = manager.stats()
+        assert stats["connections"] == 2
+        assert stats["dropped"] == 1
+        assert stats["queue_depth"] == 0
+        manager.close()
+
+    asyncio.run(scenario())
+
+
+def test_coalesce_key_replaces_unsent_frame():
+    """A newer frame with the same coalesce key replaces the queued one in place."""
+
+    async def scenario():
+        manager = ConnectionManager()
+        ws = FakeWebSocket("client", blocked=True)
+        await manager.connect(ws)
+
+        manager.broadcast("first")
+        await settle()
+        manager.broadcast("session 1 pending", ("session_update", 1))
+        manager.broadcast("trajectory")
+        manager.broadcast("session 1 running", ("session_update", 1))
+
+        ws.unblocked.set()
+        await settle()
+
+        assert ws.frames == ["first", "session 1 running", "trajectory"]
+        assert manager.clients[ws].coalesced == 1
+        manager.close()
+
+    asyncio.run(scenario())
+
+
+def test_broadcast_consumer_batches_thread_puts():
+    """Messages put from other threads are serialized once and reach every client in order."""
+
+    async def scenario():
+        q = BroadcastQueue(asyncio.get_running_loop())
+        manager = ConnectionManager()
+        clients = [FakeWebSocket("a"), FakeWebSocket("b")]
+        for ws in clients:
+            await manager.connect(ws)
+        consumer = asyncio.create_task(broadcast_consumer(q, manager))
+
+        def produce():
+            for i in range(20):
+                q.put({"type": "trajectory", "payload": {"id": i}})
+            q.put("not a wrapper")
+            q.put({"type": "session_update", "payload": {"id": 7, "status": "completed"}})
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        thread.join()
+        await settle()
+
+        for ws in clients:
+            messages = [json.loads(frame) for frame in ws.frames]
+            assert [m["payload"]["id"] for m in messages] == list(range(20)) + [7]
+        assert q.qsize() == 0
+
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+        manager.close()
+
+    asyncio.run(scenario())
+
+
+def make_trajectory(trajectory_id, session_id):
+    now = datetime.datetime.now()
+    return TrajectoryModel(id=trajectory_id, session_id=session_id, created_at=now, updated_at=now)
+
+
+def trajectory_frame(session_id, trajectory_id):
+    return json.dumps({"type": "trajectory", "payload": {"id": trajectory_id, "session_id": session_id}})
+
+
+def test_subscribed_client_only_receives_its_sessions():
+    """After subscribing, a client gets its sessions plus frames without a session."""
+
+    async def scenario():
+        manager = ConnectionManager()
+        everything = FakeWebSocket("everything")
+        scoped = FakeWebSocket("scoped")
+        await manager.connect(everything)
+        await manager.connect(scoped)
+
+        await handle_client_message(manager.get(scoped), json.dumps({"type": "subscribe", "session_ids": [2]}))
+        await handle_client_message(manager.get(scoped), "ping")
+        await handle_client_message(manager.get(scoped), json.dumps({"type": "subscribe", "session_ids": "2"}))
+        manager.broadcast(trajectory_frame(1, 10), session_id=1, trajectory_id=10)
+        manager.broadcast(trajectory_frame(2, 11), session_id=2, trajectory_id=11)
+        manager.broadcast('{"type": "notice", "payload": null}')
+        await settle()
+
+        assert len(everything.frames) == 3
+        types = [json.loads(frame)["type"] for frame in scoped.frames]
+        assert types == ["subscribed", "error", "trajectory", "notice"]
+        assert json.loads(scoped.frames[2])["payload"]["session_id"] == 2
+        manager.close()
+
+    asyncio.run(scenario())
+
+
+def test_resume_replays_missed_trajectories_before_live_frames():
+    """Missed rows are replayed from the DB and live frames already replayed are skipped."""
+
+    async def scenario():
+        manager = ConnectionManager()
+        ws = FakeWebSocket("client")
+        await manager.connect(ws)
+        client = manager.get(ws)
+
+        repo = MagicMock()
+
+        def get_trajectories_by_session(session_id, after_id=None, limit=None):
+            # A live frame for a replayed row and one for a newer row arrive mid-replay
+            client.offer(trajectory_frame(5, 42), session_id=5, trajectory_id=42)
+            client.offer(trajectory_frame(5, 43), session_id=5, trajectory_id=43)
+            return [make_trajectory(41, 5), make_trajectory(42, 5)]
+
+        repo.get_trajectories_by_session.side_effect = get_trajectories_by_session
+        with patch("ra_aid.server.server.get_trajectory_repository", return_value=repo):
+            await handle_client_message(
+                client, json.dumps({"type": "subscribe", "session_ids": [5], "resume": {"5": 40}})
+            )
+        await settle()
+
+        repo.get_trajectories_by_session.assert_called_once_with(5, after_id=40, limit=501)
+        messages = [json.loads(frame) for frame in ws.frames]
+        assert [m["type"] for m in messages] == [
+            "subscribed", "trajectory", "trajectory", "replay_complete", "trajectory"
+        ]
+        assert [m["payload"]["id"] for m in messages if m["type"] == "trajectory"] == [41, 42, 43]
+        assert messages[3]["payload"]["last_trajectory_id"] == 42
+        manager.close()
+
+    asyncio.run(scenario())
+
+
+def test_resume_with_too_many_missed_rows_requests_resync():
+    """A gap larger than the replay limit tells the client to refetch over REST."""
+
+    async def scenario():
+        manager = ConnectionManager(max_queue_size=2)
+        ws = FakeWebSocket("client")
+        await manager.connect(ws)
+
+        repo = MagicMock()
+        repo.get_trajectories_by_session.return_value = [
+            make_trajectory(i, 5) for i in range(1, 4)
+        ]
+        with patch("ra_aid.server.server.get_trajectory_repository", return_value=repo):
+            await handle_client_message(
+                manager.get(ws), json.dumps({"type": "subscribe", "session_ids": [5], "resume": {"5": 0}})
+            )
+        await settle()
+
+        messages = [json.loads(frame) for frame in ws.frames]
+        assert [m["type"] for m in messages] == ["subscribed", "resync_required"]
+        assert messages[1]["payload"] == {"session_id": 5, "after_id": 0}
+        manager.close()
+
+    asyncio.run(scenario())
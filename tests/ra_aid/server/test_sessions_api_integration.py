@@ -63,7 +63,7 @@ def mock_repo(mock_session, mock_sessions):
                 return session
         return mock_session
 
-    def get_all_with_pagination(offset=0, limit=10):
+    def get_all_with_pagination(offset=0, limit=10, include_usage=False):
         total = len(mock_sessions)
         sorted_sessions = sorted(mock_sessions, key=lambda s: s.id, reverse=True)
         return sorted_sessions[offset:offset + limit], total
@@ -7,8 +7,10 @@ from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, Tool
 from langgraph.prebuilt.chat_agent_executor import AgentState
 
 from ra_aid.anthropic_token_limiter import (
+    create_message_token_counter,
     create_token_counter_wrapper,
     estimate_messages_tokens,
+    get_list_overhead_tokens,
     get_model_token_limit,
     state_modifier,
     base_state_modifier,
@@ -702,6 +704,106 @@ class TestAnthropicTokenLimiter(unittest.TestCase):
                     f"AI message with tool use at index {i} not followed by ToolMessage",
                 )
 
+    def test_anthropic_trim_messages_counts_each_message_once(self):
+        """Test that each message is passed to the per-message counter exactly once."""
+        from ra_aid.anthropic_message_utils import anthropic_trim_messages
+
+        messages = [SystemMessage(content="System prompt")]
+        for i in range(20):
+            messages.append(
+                AIMessage(
+                    content=f"AI message {i}",
+                    additional_kwargs={"tool_calls": [{"name": "tool"}]},
+                )
+            )
+            messages.append(
+                ToolMessage(content=f"Tool result {i}", tool_call_id=f"call_{i}")
+            )
+
+        counted = []
+
+        def message_token_counter(msg):
+            counted.append(msg)
+            return 100
+
+        token_counter = MagicMock(side_effect=lambda msgs: len(msgs) * 100)
+
+        result = anthropic_trim_messages(
+            messages,
+            token_counter=token_counter,
+            message_token_counter=message_token_counter,
+            max_tokens=1000,
+            num_messages_to_keep=1,
+        )
+
+        self.assertEqual(len(counted), len(messages))
+        token_counter.assert_not_called()
+        # The system message plus the four newest pairs fit within 1000 tokens
+        self.assertEqual(result, [messages[0]] + messages[-8:])
+
+    def test_anthropic_trim_messages_matches_list_counter(self):
+        """Test that the default per-message counting keeps the same messages."""
+        from ra_aid.anthropic_message_utils import anthropic_trim_messages
+
+        messages = [SystemMessage(content="System prompt")] + [
+            HumanMessage(content="x" * (i * 10)) for i in range(1, 30)
+        ]
+
+        def token_counter(msgs):
+            return sum(len(msg.content) for msg in msgs)
+
+        for max_tokens in (50, 500, 2000, 10000):
+            # Expected result: the first message plus the longest suffix that fits
+            expected_start = len(messages)
+            while expected_start > 1 and token_counter(
+                messages[:1] + messages[expected_start - 1 :]
+            ) <= max_tokens:
+                expected_start -= 1
+
+            result = anthropic_trim_messages(
+                messages,
+                token_counter=token_counter,
+                max_tokens=max_tokens,
+                num_messages_to_keep=1,
+            )
+            self.assertEqual(result, messages[:1] + messages[expected_start:])
+
+    def test_message_token_counter_is_additive(self):
+        """Test that per-message counts plus list overhead match the list count."""
+        model = "gpt-4o"
+        messages = [
+            self.system_message,
+            self.human_message,
+            self.ai_message,
+            self.tool_message,
+        ]
+
+        wrapper = create_token_counter_wrapper(model)
+        message_counter = create_message_token_counter(model)
+
+        total = sum(message_counter(msg) for msg in messages)
+        self.assertEqual(total + get_list_overhead_tokens(model), wrapper(messages))
+
+    @patch("ra_aid.anthropic_token_limiter.token_counter")
+    def test_message_token_counter_caches_counts(self, mock_token_counter):
+        """Test that repeated counts of the same message hit the shared cache."""
+        mock_token_counter.return_value = 10
+
+        message_counter = create_message_token_counter("cache-test-model")
+        message = HumanMessage(content="cached content")
+
+        first = message_counter(message)
+        calls_after_first = mock_token_counter.call_count
+        second = create_message_token_counter("cache-test-model")(message)
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_token_counter.call_count, calls_after_first)
+
+        # Reassigning the content invalidates the cached count
+        message.content = "new content"
+        message_counter(message)
+        self.assertGreater(mock_token_counter.call_count, calls_after_first)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,78 @@
+"""
+Tests for the cached environment inventory.
+"""
+
+import os
+import stat
+from unittest.mock import patch
+
+import pytest
+
+from ra_aid.env_inv import ENV_INVENTORY_CACHE_FILE, EnvDiscovery
+
+
+def write_tool(bin_dir, name, version):
+    path = bin_dir / name
+    path.write_text(f"#!/bin/sh\necho '{name} {version}'\n")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return path
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    """A PATH holding only a fake gcc, an empty include directory and a state directory."""
+    if os.name == "nt":
+        pytest.skip("Uses shell-script tools")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (tmp_path / "include").mkdir()
+    (tmp_path / ".ra-aid").mkdir(exist_ok=True)
+    write_tool(bin_dir, "gcc", "1.0")
+    monkeypatch.setenv("PATH", str(bin_dir))
+    return tmp_path
+
+
+def discover(tmp_path, **kwargs):
+    discovery = EnvDiscovery(cache_dir=tmp_path / ".ra-aid", **kwargs)
+    discovery._include_paths = [tmp_path / "include"]
+    return discovery.discover()
+
+
+def test_discovery_is_cached_until_a_tool_changes(env):
+    results = discover(env)
+    assert results["cli_tools"]["gcc"] == {"found": True, "version": "gcc 1.0"}
+    assert (env / ".ra-aid" / ENV_INVENTORY_CACHE_FILE).exists()
+
+    with patch("ra_aid.env_inv.subprocess.check_output", side_effect=AssertionError("probed")):
+        assert discover(env) == results
+
+    # Upgrading a tool in place changes its mtime
+    gcc = write_tool(env / "bin", "gcc", "2.0")
+    os.utime(gcc, ns=(gcc.stat().st_atime_ns, gcc.stat().st_mtime_ns + 10**9))
+    assert discover(env)["cli_tools"]["gcc"]["version"] == "gcc 2.0"
+
+    # Installing a tool changes its PATH directory
+    write_tool(env / "bin", "git", "3.0")
+    os.utime(env / "bin", ns=(0, (env / "bin").stat().st_mtime_ns + 10**9))
+    assert discover(env)["cli_tools"]["git"] == {"found": True, "version": "git 3.0"}
+
+
+def test_expired_or_disabled_cache_is_not_used(env):
+    discover(env)
+
+    with patch("ra_aid.env_inv.subprocess.check_output", return_value="gcc 9.9\n") as check_output:
+        assert discover(env)["cli_tools"]["gcc"]["version"] == "gcc 1.0"
+        check_output.assert_not_called()
+
+        assert discover(env, cache_ttl=-1)["cli_tools"]["gcc"]["version"] == "gcc 9.9"
+
+        discovery = EnvDiscovery(cache_dir=env / ".ra-aid")
+        discovery._include_paths = [env / "include"]
+        check_output.return_value = "gcc 9.10\n"
+        assert discovery.discover(use_cache=False)["cli_tools"]["gcc"]["version"] == "gcc 9.10"
+
+
+def test_missing_state_directory_is_not_created(env):
+    (env / ".ra-aid").rmdir()
+    discover(env)
+    assert not (env / ".ra-aid").exists()
@@ -0,0 +1,70 @@
+"""Tests for the fuzzy path matching engine."""
+
+import random
+
+import pytest
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
+
+from ra_aid import fuzzy_match
+from ra_aid.fuzzy_match import FuzzyMatcher, get_fuzzy_matcher
+
+
+@pytest.fixture
+def paths():
+    rng = random.Random(42)
+    words = ["src", "lib", "tests", "utils", "agent", "server", "fuzzy", "index", "config"]
+    result = set()
+    while len(result) < 3000:
+        parts = [rng.choice(words) for _ in range(rng.randint(1, 4))]
+        result.add("/".join(parts) + f"_{rng.randint(0, 99)}" + rng.choice([".py", ".md"]))
+    return sorted(result)
+
+
+def brute_force(query, choices, limit, threshold):
+    matches = process.extract(
+        query, choices, scorer=fuzz.WRatio, processor=default_process, limit=None
+    )
+    rounded = [(choice, int(round(score)), idx) for choice, score, idx in matches]
+    rounded = [item for item in rounded if item[1] >= threshold]
+    rounded.sort(key=lambda item: (-item[1], item[2]))
+    return [(choice, score) for choice, score, _ in rounded[:limit]]
+
+
+@pytest.mark.parametrize("query", ["agent", "fuzzy_index.py", "srv config", "tst"])
+def test_matches_full_scoring(paths, query):
+    matcher = FuzzyMatcher(paths)
+    assert matcher.extract(query, limit=10, threshold=60) == brute_force(
+        query, paths, 10, 60
+    )
+
+
+def test_prefilter_keeps_best_matches(paths, monkeypatch):
+    monkeypatch.setattr(fuzzy_match, "PREFILTER_MIN_CHOICES", 100)
+    monkeypatch.setattr(fuzzy_match, "PREFILTER_MIN_CANDIDATES", 50)
+    monkeypatch.setattr(fuzzy_match, "PREFILTER_CANDIDATES_PER_RESULT", 5)
+
+    matcher = FuzzyMatcher(paths)
+    query = paths[1234]
+    results = matcher.extract(query, limit=5, threshold=60)
+
+    assert results[0] == (query, 100)
+    assert results == brute_force(query, paths, 5, 60)
+
+
+def test_threshold_filters_results(paths):
+    matcher = FuzzyMatcher(paths)
+    results = matcher.extract("zzzzqqqq", limit=10, threshold=90)
+    assert results == []
+
+
+def test_empty_processed_query():
+    matcher = FuzzyMatcher(["a.py", "b.py"])
+    assert matcher.extract("///", limit=10, threshold=0) == [("a.py", 0), ("b.py", 0)]
+    assert matcher.extract("///", limit=10, threshold=60) == []
+
+
+def test_matcher_reused_for_same_choices(paths):
+    first = get_fuzzy_matcher(paths)
+    assert get_fuzzy_matcher(list(paths)) is first
+    assert get_fuzzy_matcher(paths[:-1]) is not first
@@ -15,6 +15,7 @@ from ra_aid.llm import (
     create_llm_client,
     get_available_openai_models,
     get_env_var,
+    get_llm_client_pool,
     get_provider_config,
     initialize_expert_llm,
     initialize_llm,
@@ -597,6 +598,44 @@ def test_environment_variable_precedence(clean_env, mock_openai, monkeypatch):
     assert web_missing
 
 
+def test_initialize_llm_reuses_pooled_clients(clean_env, mock_openai, monkeypatch):
+    """Identical settings share one client; any differing setting gets its own."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    mock_openai.side_effect = lambda **kwargs: Mock(spec=ChatOpenAI)
+
+    model = initialize_llm("openai", "gpt-4", temperature=0.5)
+    assert initialize_llm("openai", "gpt-4", temperature=0.5) is model
+    assert mock_openai.call_count == 1
+
+    assert initialize_llm("openai", "gpt-4", temperature=0.2) is not model
+    assert initialize_expert_llm("openai", "gpt-4") is not model
+    monkeypatch.setenv("OPENAI_API_KEY", "new-key")
+    assert initialize_llm("openai", "gpt-4", temperature=0.5) is not model
+    assert mock_openai.call_count == 4
+
+    stats = get_llm_client_pool().stats()
+    assert stats["clients"] == 4
+    assert stats["hits"] == 1
+    assert stats["misses"] == 4
+
+    get_llm_client_pool().clear()
+    assert get_llm_client_pool().stats()["clients"] == 0
+    assert initialize_llm("openai", "gpt-4", temperature=0.2) is not model
+    assert mock_openai.call_count == 5
+
+
+def test_pooled_clients_key_on_num_ctx(mock_config_repository):
+    """Ollama clients are rebuilt when the configured context window changes."""
+    with patch("ra_aid.llm.create_ollama_client") as mock_ollama:
+        mock_ollama.side_effect = lambda **kwargs: Mock()
+        model = initialize_llm("ollama", "qwen", temperature=0.5)
+        assert initialize_llm("ollama", "qwen", temperature=0.5) is model
+
+        mock_config_repository.set("num_ctx", 8192)
+        assert initialize_llm("ollama", "qwen", temperature=0.5) is not model
+        assert mock_ollama.call_args.kwargs["num_ctx"] == 8192
+
+
 @pytest.fixture
 def mock_anthropic():
     """
@@ -78,11 +78,11 @@ def mock_config_repository():
 def mock_dependencies(monkeypatch):
     """Mock all dependencies needed for main()."""
     # Mock dependencies that interact with external systems
-    monkeypatch.setattr("ra_aid.__main__.check_dependencies", lambda: None)
-    monkeypatch.setattr("ra_aid.__main__.validate_environment", lambda args: (True, [], True, []))
-    monkeypatch.setattr("ra_aid.__main__.create_agent", lambda *args, **kwargs: None)
-    monkeypatch.setattr("ra_aid.__main__.run_agent_with_retry", lambda *args, **kwargs: None)
-    monkeypatch.setattr("ra_aid.__main__.run_research_agent", lambda *args, **kwargs: None)
+    monkeypatch.setattr("ra_aid.dependencies.check_dependencies", lambda: None)
+    monkeypatch.setattr("ra_aid.env.validate_environment", lambda args: (True, [], True, []))
+    monkeypatch.setattr("ra_aid.agent_utils.create_agent", lambda *args, **kwargs: None)
+    monkeypatch.setattr("ra_aid.agent_utils.run_agent_with_retry", lambda *args, **kwargs: None)
+    monkeypatch.setattr("ra_aid.agents.research_agent.run_research_agent", lambda *args, **kwargs: None)
     monkeypatch.setattr("ra_aid.agents.planning_agent.run_planning_agent", lambda *args, **kwargs: None)
     
     # Mock LLM initialization
@@ -92,7 +92,7 @@ def mock_dependencies(monkeypatch):
             config_repo.set("temperature", kwargs["temperature"])
         return None
 
-    monkeypatch.setattr("ra_aid.__main__.initialize_llm", mock_config_update)
+    monkeypatch.setattr("ra_aid.llm.initialize_llm", mock_config_update)
 
 
 @pytest.fixture(autouse=True)
@@ -294,9 +294,9 @@ def test_temperature_validation(mock_dependencies, mock_config_repository):
     # For testing, we need to patch ConfigRepositoryManager.__enter__ to return our mock
     with patch('ra_aid.database.repositories.config_repository.ConfigRepositoryManager.__enter__', return_value=mock_config_repository):
         # Test valid temperature (0.7)
-        with patch("ra_aid.__main__.initialize_llm", return_value=None) as mock_init_llm:
+        with patch("ra_aid.llm.initialize_llm", return_value=None) as mock_init_llm:
             # Also patch any calls that would actually use the mocked initialize_llm function
-            with patch("ra_aid.__main__.run_research_agent", return_value=None):
+            with patch("ra_aid.agents.research_agent.run_research_agent", return_value=None):
                 with patch("ra_aid.agents.planning_agent.run_planning_agent", return_value=None):
                     with patch.object(
                         sys, "argv", ["ra-aid", "-m", "test", "--temperature", "0.7"]
@@ -483,3 +483,21 @@ def test_use_aider_flag(mock_dependencies, mock_config_repository):
 
     # Reset to default state for other tests
     set_modification_tools(False)
+
+
+def test_cli_import_does_not_load_agent_or_server_stack():
+    """--help and --version only need the CLI module, which must not pull in litellm, langgraph or the server."""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    heavy = ["litellm", "langgraph", "langchain_core", "uvicorn", "fastapi", "openai", "ra_aid.agent_utils"]
+    code = f"import sys, ra_aid.__main__; print(' '.join(m for m in {heavy!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[2],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == ""
@@ -73,16 +73,16 @@ def test_show_thoughts_config(mock_config_repository):
             with patch('ra_aid.database.repositories.config_repository.ConfigRepositoryManager.__enter__',
                        return_value=mock_config_repository):
                 # Mock the required dependencies to prevent actual execution
-                with patch("ra_aid.__main__.setup_logging"), \
-                     patch("ra_aid.__main__.DatabaseManager"), \
-                     patch("ra_aid.__main__.ensure_migrations_applied"), \
-                     patch("ra_aid.__main__.check_dependencies"), \
-                     patch("ra_aid.__main__.validate_environment", return_value=(True, [], True, [])), \
+                with patch("ra_aid.logging_config.setup_logging"), \
+                     patch("ra_aid.database.DatabaseManager"), \
+                     patch("ra_aid.database.ensure_migrations_applied"), \
+                     patch("ra_aid.dependencies.check_dependencies"), \
+                     patch("ra_aid.env.validate_environment", return_value=(True, [], True, [])), \
                      patch("ra_aid.__main__.build_status"), \
-                     patch("ra_aid.__main__.console.print"), \
-                     patch("ra_aid.__main__.initialize_llm"), \
+                     patch("ra_aid.console.common.console.print"), \
+                     patch("ra_aid.llm.initialize_llm"), \
                      patch("ra_aid.database.repositories.session_repository.get_session_repository", return_value=MagicMock(create_session=MagicMock())), \
-                     patch("ra_aid.__main__.run_research_agent"), \
+                     patch("ra_aid.agents.research_agent.run_research_agent"), \
                      patch("ra_aid.__main__.main", return_value=None):  # Prevent actual main execution
                     
                     # Set the show_thoughts flag directly in the config
@@ -101,16 +101,16 @@ def test_show_thoughts_config(mock_config_repository):
             with patch('ra_aid.database.repositories.config_repository.ConfigRepositoryManager.__enter__',
                        return_value=mock_config_repository):
                 # Mock the required dependencies to prevent actual execution
-                with patch("ra_aid.__main__.setup_logging"), \
-                     patch("ra_aid.__main__.DatabaseManager"), \
-                     patch("ra_aid.__main__.ensure_migrations_applied"), \
-                     patch("ra_aid.__main__.check_dependencies"), \
-                     patch("ra_aid.__main__.validate_environment", return_value=(True, [], True, [])), \
+                with patch("ra_aid.logging_config.setup_logging"), \
+                     patch("ra_aid.database.DatabaseManager"), \
+                     patch("ra_aid.database.ensure_migrations_applied"), \
+                     patch("ra_aid.dependencies.check_dependencies"), \
+                     patch("ra_aid.env.validate_environment", return_value=(True, [], True, [])), \
                      patch("ra_aid.__main__.build_status"), \
-                     patch("ra_aid.__main__.console.print"), \
-                     patch("ra_aid.__main__.initialize_llm"), \
+                     patch("ra_aid.console.common.console.print"), \
+                     patch("ra_aid.llm.initialize_llm"), \
                      patch("ra_aid.database.repositories.session_repository.get_session_repository", return_value=MagicMock(create_session=MagicMock())), \
-                     patch("ra_aid.__main__.run_research_agent"), \
+                     patch("ra_aid.agents.research_agent.run_research_agent"), \
                      patch("ra_aid.__main__.main", return_value=None):  # Prevent actual main execution
                     
                     # Set the show_thoughts flag directly in the config
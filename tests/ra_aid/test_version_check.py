@@ -119,4 +119,66 @@ def test_missing_version_key(monkeypatch):
     result = check_for_newer_version()
     
     # Check that no message is returned
-    assert result == ""
\ No newline at end of file
+    assert result == ""
+
+def test_result_is_cached_for_a_day(monkeypatch, tmp_path):
+    """Only the first check within VERSION_CHECK_TTL makes a request, failures included."""
+    monkeypatch.setattr('ra_aid.version_check.current_version', '0.15.2')
+    calls = []
+
+    def mock_get(*args, **kwargs):
+        calls.append(args)
+        raise requests.RequestException("Connection error")
+
+    monkeypatch.setattr('ra_aid.version_check.requests.get', mock_get)
+    assert check_for_newer_version(tmp_path) == ""
+    assert check_for_newer_version(tmp_path) == ""
+    assert len(calls) == 1
+
+    mock_response = Mock()
+    mock_response.json.return_value = {"version": "0.16.0"}
+    monkeypatch.setattr('ra_aid.version_check.requests.get', lambda *args, **kwargs: mock_response)
+    monkeypatch.setattr('ra_aid.version_check.VERSION_CHECK_TTL', -1)
+    assert "0.16.0" in check_for_newer_version(tmp_path)
+
+    monkeypatch.setattr('ra_aid.version_check.VERSION_CHECK_TTL', 24 * 60 * 60)
+    monkeypatch.setattr('ra_aid.version_check.requests.get', mock_get)
+    assert "0.16.0" in check_for_newer_version(tmp_path)
+    assert len(calls) == 1
+
+
+def test_background_check_does_not_block(monkeypatch, tmp_path):
+    """start_version_check returns at once; the message appears when the request completes."""
+    import threading
+
+    from ra_aid import version_check
+
+    monkeypatch.setattr('ra_aid.version_check.current_version', '0.15.2')
+    release = threading.Event()
+    mock_response = Mock()
+    mock_response.json.return_value = {"version": "0.16.0"}
+
+    def mock_get(*args, **kwargs):
+        release.wait(timeout=5)
+        return mock_response
+
+    monkeypatch.setattr('ra_aid.version_check.requests.get', mock_get)
+    version_check.start_version_check(tmp_path)
+    assert version_check.get_version_message() == ""
+
+    release.set()
+    assert "0.16.0" in version_check._version_check.message(timeout=5)
+
+    # The next start is answered from the cache without a thread
+    monkeypatch.setattr('ra_aid.version_check.requests.get', Mock(side_effect=AssertionError("fetched")))
+    version_check.start_version_check(tmp_path)
+    assert "0.16.0" in version_check.get_version_message()
+
+
+def test_offline_mode_skips_the_check(monkeypatch, tmp_path):
+    from ra_aid import version_check
+
+    monkeypatch.setattr('ra_aid.version_check.requests.get', Mock(side_effect=AssertionError("fetched")))
+    version_check.start_version_check(tmp_path, offline=True)
+    assert version_check.get_version_message() == ""
+    assert not (tmp_path / version_check.VERSION_CACHE_FILE).exists()
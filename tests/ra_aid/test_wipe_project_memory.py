@@ -67,19 +67,19 @@ def test_build_status_shows_reset_option():
     from ra_aid.__main__ import build_status
     
     # Mock repositories to return different numbers of items
-    with patch("ra_aid.__main__.get_key_fact_repository") as mock_fact_repo, \
-         patch("ra_aid.__main__.get_key_snippet_repository") as mock_snippet_repo, \
-         patch("ra_aid.__main__.get_research_note_repository") as mock_note_repo, \
-         patch("ra_aid.__main__.get_config_repository") as mock_config_repo:
+    with patch("ra_aid.database.repositories.key_fact_repository.get_key_fact_repository") as mock_fact_repo, \
+         patch("ra_aid.database.repositories.key_snippet_repository.get_key_snippet_repository") as mock_snippet_repo, \
+         patch("ra_aid.database.repositories.research_note_repository.get_research_note_repository") as mock_note_repo, \
+         patch("ra_aid.database.repositories.config_repository.get_config_repository") as mock_config_repo:
          
-        # Set up mock repositories to return specific results with get and get_all
+        # Set up mock repositories to return specific results with get and count
         # For key_fact_repository
         def mock_fact_get(fact_id):
             if 1 <= fact_id <= 3:
                 return MagicMock(id=fact_id, content=f"Fact {fact_id}")
             return None
         mock_fact_repo.return_value.get.side_effect = mock_fact_get
-        mock_fact_repo.return_value.get_all.return_value = [1, 2, 3]  # 3 facts
+        mock_fact_repo.return_value.count.return_value = 3  # 3 facts
         
         # For key_snippet_repository
         def mock_snippet_get(snippet_id):
@@ -87,7 +87,7 @@ def test_build_status_shows_reset_option():
                 return MagicMock(id=1, filepath="test.py", line_number=1, snippet="test")
             return None
         mock_snippet_repo.return_value.get.side_effect = mock_snippet_get
-        mock_snippet_repo.return_value.get_all.return_value = [1]  # 1 snippet
+        mock_snippet_repo.return_value.count.return_value = 1  # 1 snippet
         
         # For research_note_repository
         def mock_note_get(note_id):
@@ -95,7 +95,7 @@ def test_build_status_shows_reset_option():
                 return MagicMock(id=note_id, content=f"Note {note_id}")
             return None
         mock_note_repo.return_value.get.side_effect = mock_note_get
-        mock_note_repo.return_value.get_all.return_value = [1, 2]  # 2 notes
+        mock_note_repo.return_value.count.return_value = 2  # 2 notes
         mock_config_repo.return_value.get.return_value = None
         
         # Call build_status
@@ -109,15 +109,15 @@ def test_build_status_shows_reset_option():
         assert "use --wipe-project-memory to reset" in status_str
         
         # Test with empty memory - should not show reset option
-        # Update both get and get_all mocks
+        # Update both get and count mocks
         mock_fact_repo.return_value.get.side_effect = lambda fact_id: None
-        mock_fact_repo.return_value.get_all.return_value = []
+        mock_fact_repo.return_value.count.return_value = 0
         
         mock_snippet_repo.return_value.get.side_effect = lambda snippet_id: None
-        mock_snippet_repo.return_value.get_all.return_value = []
+        mock_snippet_repo.return_value.count.return_value = 0
         
         mock_note_repo.return_value.get.side_effect = lambda note_id: None
-        mock_note_repo.return_value.get_all.return_value = []
+        mock_note_repo.return_value.count.return_value = 0
         
         # Call build_status again
         status = build_status()
@@ -146,10 +146,10 @@ def test_main_with_wipe_project_memory_flag():
     # Mock all necessary dependencies to prevent actual operations
     with patch("ra_aid.__main__.wipe_project_memory", mock_wipe), \
          patch("ra_aid.__main__.parse_arguments", return_value=mock_args), \
-         patch("ra_aid.__main__.setup_logging"), \
-         patch("ra_aid.__main__.get_config_repository"), \
+         patch("ra_aid.logging_config.setup_logging"), \
+         patch("ra_aid.database.repositories.config_repository.get_config_repository"), \
          patch("ra_aid.__main__.launch_server"), \
-         patch("ra_aid.__main__.DatabaseManager"):
+         patch("ra_aid.database.DatabaseManager"):
         
         # Call main() and catch SystemExit since we're raising it
         try:
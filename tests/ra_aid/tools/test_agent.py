@@ -159,9 +159,7 @@ def mock_functions():
     mock_fact_repo = MagicMock()
     mock_snippet_repo = MagicMock()
     with patch('ra_aid.tools.agent.get_key_fact_repository', return_value=mock_fact_repo) as mock_get_fact_repo, \
-         patch('ra_aid.tools.agent.format_key_facts_dict') as mock_fact_formatter, \
          patch('ra_aid.tools.agent.get_key_snippet_repository', return_value=mock_snippet_repo) as mock_get_snippet_repo, \
-         patch('ra_aid.tools.agent.format_key_snippets_dict') as mock_snippet_formatter, \
          patch('ra_aid.tools.agent.initialize_llm') as mock_llm, \
          patch('ra_aid.tools.agent.get_related_files') as mock_get_files, \
          patch('ra_aid.tools.agent.get_work_log') as mock_get_work_log, \
@@ -171,10 +169,8 @@ def mock_functions():
          patch('ra_aid.tools.agent.get_human_input_repository') as mock_get_human_input_repo:
 
         # Setup mock return values
-        mock_fact_repo.get_facts_dict.return_value = {1: "Test fact 1", 2: "Test fact 2"}
-        mock_fact_formatter.return_value = "Formatted facts"
-        mock_snippet_repo.get_snippets_dict.return_value = {1: {"filepath": "test.py", "line_number": 10, "snippet": "def test():", "description": "Test function"}}
-        mock_snippet_formatter.return_value = "Formatted snippets"
+        mock_fact_repo.get_formatted_facts.return_value = "Formatted facts"
+        mock_snippet_repo.get_formatted_snippets.return_value = "Formatted snippets"
         mock_llm.return_value = MagicMock()
         mock_get_files.return_value = ["file1.py", "file2.py"]
         mock_get_work_log.return_value = "Test work log"
@@ -193,8 +189,6 @@ def mock_functions():
         yield {
             'get_key_fact_repository': mock_get_fact_repo,
             'get_key_snippet_repository': mock_get_snippet_repo,
-            'format_key_facts_dict': mock_fact_formatter,
-            'format_key_snippets_dict': mock_snippet_formatter,
             'initialize_llm': mock_llm,
             'get_related_files': mock_get_files,
             'get_work_log': mock_get_work_log,
@@ -206,7 +200,7 @@ def mock_functions():
 
 
 def test_request_research_uses_key_fact_repository(reset_memory, mock_functions):
-    """Test that request_research uses KeyFactRepository directly with formatting."""
+    """Test that request_research uses the formatted key facts from KeyFactRepository."""
     # Mock running the research agent
     with patch('ra_aid.agents.research_agent.run_research_agent'):
         # Call the function
@@ -214,12 +208,7 @@ def test_request_research_uses_key_fact_repository(reset_memory, mock_functions)
         
         # Verify repository was called
         mock_functions['get_key_fact_repository'].assert_called_once()
-        mock_functions['get_key_fact_repository'].return_value.get_facts_dict.assert_called_once()
-        
-        # Verify formatter was called with repository results
-        mock_functions['format_key_facts_dict'].assert_called_once_with(
-            mock_functions['get_key_fact_repository'].return_value.get_facts_dict.return_value
-        )
+        mock_functions['get_key_fact_repository'].return_value.get_formatted_facts.assert_called_once()
         
         # Verify formatted facts are used in response
         assert result["key_facts"] == "Formatted facts"
@@ -236,12 +225,7 @@ def test_request_research_max_depth(reset_memory, mock_functions):
     
     # Verify repository was called
     mock_functions['get_key_fact_repository'].assert_called_once()
-    mock_functions['get_key_fact_repository'].return_value.get_facts_dict.assert_called_once()
-    
-    # Verify formatter was called with repository results
-    mock_functions['format_key_facts_dict'].assert_called_once_with(
-        mock_functions['get_key_fact_repository'].return_value.get_facts_dict.return_value
-    )
+    mock_functions['get_key_fact_repository'].return_value.get_formatted_facts.assert_called_once()
     
     # Verify formatted facts are used in response
     assert result["key_facts"] == "Formatted facts"
@@ -256,12 +240,7 @@ def test_request_research_and_implementation_uses_key_fact_repository(reset_memo
         
         # Verify repository was called
         mock_functions['get_key_fact_repository'].assert_called_once()
-        mock_functions['get_key_fact_repository'].return_value.get_facts_dict.assert_called_once()
-        
-        # Verify formatter was called with repository results
-        mock_functions['format_key_facts_dict'].assert_called_once_with(
-            mock_functions['get_key_fact_repository'].return_value.get_facts_dict.return_value
-        )
+        mock_functions['get_key_fact_repository'].return_value.get_formatted_facts.assert_called_once()
         
         # Verify formatted facts are used in response
         assert result["key_facts"] == "Formatted facts"
@@ -276,12 +255,7 @@ def test_request_implementation_uses_key_fact_repository(reset_memory, mock_func
         
         # Verify repository was called
         mock_functions['get_key_fact_repository'].assert_called_once()
-        mock_functions['get_key_fact_repository'].return_value.get_facts_dict.assert_called_once()
-        
-        # Verify formatter was called with repository results
-        mock_functions['format_key_facts_dict'].assert_called_once_with(
-            mock_functions['get_key_fact_repository'].return_value.get_facts_dict.return_value
-        )
+        mock_functions['get_key_fact_repository'].return_value.get_formatted_facts.assert_called_once()
         
         # Check that the formatted key facts are included in the response
         assert "Formatted facts" in result
@@ -296,12 +270,7 @@ def test_request_task_implementation_uses_key_fact_repository(reset_memory, mock
         
         # Verify repository was called
         mock_functions['get_key_fact_repository'].assert_called_once()
-        mock_functions['get_key_fact_repository'].return_value.get_facts_dict.assert_called_once()
-        
-        # Verify formatter was called with repository results
-        mock_functions['format_key_facts_dict'].assert_called_once_with(
-            mock_functions['get_key_fact_repository'].return_value.get_facts_dict.return_value
-        )
+        mock_functions['get_key_fact_repository'].return_value.get_formatted_facts.assert_called_once()
         
         # Check that the formatted key facts are included in the response
         assert "Formatted facts" in result
\ No newline at end of file
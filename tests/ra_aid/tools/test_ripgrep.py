@@ -0,0 +1,163 @@
+import base64
+import shutil
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ra_aid.tools.ripgrep import (
+    RipgrepResults,
+    _decode_rg_data,
+    ripgrep_search,
+    stream_ripgrep_search,
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("rg") is None, reason="ripgrep not installed")
+
+
+@pytest.fixture
+def search_dir(tmp_path, monkeypatch):
+    (tmp_path / "a.py").write_text("import os\nneedle = 1\n\nprint(needle)\n")
+    (tmp_path / "b.txt").write_text("no match here\n")
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    for i in range(5):
+        (sub / f"f{i}.py").write_text("\n".join(f"needle {j}" for j in range(10)) + "\n")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def config():
+    return {}
+
+
+@pytest.fixture(autouse=True)
+def mock_repositories(config):
+    mock_config_repo = MagicMock()
+    mock_config_repo.get.side_effect = lambda key, default=None: config.get(key, default)
+    with patch("ra_aid.tools.ripgrep.get_trajectory_repository") as mock_trajectory, \
+         patch("ra_aid.tools.ripgrep.get_human_input_repository") as mock_human_input, \
+         patch("ra_aid.tools.ripgrep.get_config_repository", return_value=mock_config_repo):
+        mock_human_input.return_value.get_most_recent_id.return_value = 1
+        yield mock_trajectory.return_value
+
+
+def test_decode_rg_data_text_and_bytes():
+    assert _decode_rg_data({"text": "hello"}) == "hello"
+    encoded = base64.b64encode(b"caf\xc3\xa9 \xff").decode()
+    assert _decode_rg_data({"bytes": encoded}) == "café �"
+    assert _decode_rg_data(None) == ""
+
+
+def test_stream_collects_structured_results(search_dir):
+    results = stream_ripgrep_search(["rg", "--json", "-A", "1", "needle", "a.py"])
+
+    assert results.return_code == 0
+    assert not results.truncated
+    assert results.match_count == 2
+    assert [f["path"] for f in results.files] == ["a.py"]
+    lines = results.files[0]["lines"]
+    assert [(line["line_number"], line["type"]) for line in lines] == [
+        (2, "match"),
+        (3, "context"),
+        (4, "match"),
+    ]
+    assert lines[0]["submatches"] == [[0, 6]]
+    assert lines[2]["submatches"] == [[6, 12]]
+
+
+def test_stream_stops_at_match_budget(search_dir):
+    results = stream_ripgrep_search(["rg", "--json", "needle", "sub"], max_matches=3)
+
+    assert results.truncated
+    assert results.match_count == 3
+    assert results.return_code == 0
+    assert "3 matching lines" in results.truncation_reason
+
+
+def test_stream_stops_at_file_budget(search_dir):
+    results = stream_ripgrep_search(["rg", "--json", "needle", "sub"], max_files=2)
+
+    assert results.truncated
+    assert len(results.files) == 2
+    assert results.match_count == 20
+
+
+def test_stream_byte_budget_counts_utf8_bytes(search_dir):
+    (search_dir / "wide.txt").write_text("".join(f"needle {i} \u2713\u2713\u2713\n" for i in range(10)))
+
+    results = stream_ripgrep_search(["rg", "--json", "needle", "wide.txt"], max_bytes=50)
+
+    # Each line is 12 characters but 18 bytes, so the budget is hit on the third line
+    assert results.truncated
+    assert results.match_count == 3
+    assert results.bytes_read == 54
+    assert "50 bytes" in results.truncation_reason
+
+
+def test_stream_no_matches(search_dir):
+    results = stream_ripgrep_search(["rg", "--json", "haystack"])
+
+    assert results.return_code == 1
+    assert results.files == []
+    assert results.to_text() == ""
+
+
+def test_stream_raises_on_rg_error(search_dir):
+    with pytest.raises(RuntimeError):
+        stream_ripgrep_search(["rg", "--json", "("])
+
+
+def test_to_text_heading_format():
+    results = RipgrepResults(
+        files=[
+            {
+                "path": "a.py",
+                "lines": [
+                    {"type": "match", "line_number": 2, "text": "x", "submatches": []},
+                    {"type": "context", "line_number": 3, "text": "y", "submatches": []},
+                    {"type": "match", "line_number": 9, "text": "z", "submatches": []},
+                ],
+            },
+            {
+                "path": "b.py",
+                "lines": [{"type": "match", "line_number": 1, "text": "w", "submatches": []}],
+            },
+        ],
+        match_count=3,
+    )
+
+    assert results.to_text() == "a.py\n2:x\n3-y\n--\n9:z\n\nb.py\n1:w"
+
+
+def test_ripgrep_search_records_structured_trajectory(search_dir, mock_repositories):
+    result = ripgrep_search.invoke({"pattern": "needle", "include_paths": ["a.py"]})
+
+    assert result["success"] is True
+    assert result["return_code"] == 0
+    assert result["output"] == "a.py\n2:needle = 1\n--\n4:print(needle)"
+
+    kwargs = mock_repositories.create.call_args.kwargs
+    assert kwargs["record_type"] == "ripgrep_search"
+    assert kwargs["tool_result"]["output"] == result["output"]
+    step_data = kwargs["step_data"]
+    assert step_data["match_count"] == 2
+    assert step_data["file_count"] == 1
+    assert step_data["truncated"] is False
+    assert step_data["results"][0]["path"] == "a.py"
+
+
+def test_ripgrep_search_uses_configured_budget(search_dir, config, mock_repositories):
+    config["ripgrep_max_matches"] = 4
+
+    result = ripgrep_search.invoke({"pattern": "needle", "include_paths": ["sub"]})
+
+    assert result["success"] is True
+    assert "Search stopped early" in result["output"]
+    assert mock_repositories.create.call_args.kwargs["step_data"]["truncated"] is True
+
+
+def test_ripgrep_search_no_matches(search_dir):
+    result = ripgrep_search.invoke({"pattern": "haystack"})
+
+    assert result == {"output": "", "return_code": 1, "success": False}
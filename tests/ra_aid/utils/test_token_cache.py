@@ -0,0 +1,85 @@
+"""Tests for the shared token count cache."""
+
+from unittest.mock import MagicMock
+
+from langchain_core.messages import HumanMessage
+
+from ra_aid.utils.token_cache import TokenCountCache
+
+
+def test_hit_after_first_count():
+    cache = TokenCountCache()
+    counter = MagicMock(return_value=42)
+    message = HumanMessage(content="hello")
+
+    assert cache.get_or_count(message, "model-a", counter) == 42
+    assert cache.get_or_count(message, "model-a", counter) == 42
+
+    counter.assert_called_once_with(message)
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_keyed_by_tokenizer():
+    cache = TokenCountCache()
+    message = HumanMessage(content="hello")
+
+    assert cache.get_or_count(message, "model-a", lambda m: 1) == 1
+    assert cache.get_or_count(message, "model-b", lambda m: 2) == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_equal_content_different_message_is_a_miss():
+    cache = TokenCountCache()
+    counter = MagicMock(return_value=5)
+
+    cache.get_or_count(HumanMessage(content="same"), "model", counter)
+    cache.get_or_count(HumanMessage(content="same"), "model", counter)
+
+    assert counter.call_count == 2
+
+
+def test_content_reassignment_invalidates_entry():
+    cache = TokenCountCache()
+    message = HumanMessage(content="short")
+
+    assert cache.get_or_count(message, "model", lambda m: len(m.content)) == 5
+    message.content = "much longer content"
+    assert cache.get_or_count(message, "model", lambda m: len(m.content)) == 19
+
+
+def test_evicts_least_recently_used():
+    cache = TokenCountCache(max_size=2)
+    messages = [HumanMessage(content=str(i)) for i in range(3)]
+    counter = MagicMock(return_value=1)
+
+    cache.get_or_count(messages[0], "model", counter)
+    cache.get_or_count(messages[1], "model", counter)
+    cache.get_or_count(messages[0], "model", counter)
+    cache.get_or_count(messages[2], "model", counter)
+
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+
+    # messages[1] was evicted, messages[0] is still cached
+    cache.get_or_count(messages[0], "model", counter)
+    cache.get_or_count(messages[1], "model", counter)
+    assert counter.call_count == 4
+
+
+def test_clear_resets_counters():
+    cache = TokenCountCache()
+    cache.get_or_count("text", "model", lambda s: 1)
+    cache.clear()
+
+    assert cache.stats() == {
+        "size": 0,
+        "max_size": cache.max_size,
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+        "hit_rate": 0.0,
+    }
@@ -0,0 +1,126 @@
+"""Tests for the project file index."""
+
+import subprocess
+
+import pytest
+
+from ra_aid.file_index import FileIndex
+
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a git repository with a few committed files and a .gitignore."""
+    subprocess.run(["git", "init"], cwd=tmp_path, capture_output=True)
+    for file_path in ["README.md", "src/main.py", ".hidden/config"]:
+        full_path = tmp_path / file_path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(f"Content of {file_path}")
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    subprocess.run(["git", "add", "."], cwd=tmp_path, capture_output=True)
+    subprocess.run(
+        ["git", "commit", "-m", "Initial commit"],
+        cwd=tmp_path,
+        env=GIT_ENV,
+        capture_output=True,
+    )
+    return tmp_path
+
+
+def test_git_repo_listing_is_reused(git_repo):
+    index = FileIndex()
+
+    first = index.get_files(str(git_repo))
+    second = index.get_files(str(git_repo))
+
+    assert first == ["README.md", "src/main.py"]
+    assert second == first
+    assert index.stats()["builds"] == 1
+    assert index.stats()["hits"] == 1
+
+
+def test_filters_applied_per_query(git_repo):
+    index = FileIndex()
+
+    assert ".hidden/config" in index.get_files(str(git_repo), include_hidden=True)
+    assert index.get_files(str(git_repo), exclude_patterns=["src/*"]) == ["README.md"]
+    assert index.stats()["builds"] == 1
+
+
+def test_git_index_change_rebuilds(git_repo):
+    index = FileIndex()
+    index.get_files(str(git_repo))
+
+    (git_repo / "added.py").write_text("print('added')")
+    subprocess.run(["git", "add", "added.py"], cwd=git_repo, capture_output=True)
+
+    assert "added.py" in index.get_files(str(git_repo))
+    assert index.stats()["builds"] == 2
+
+
+def test_record_file_written_adds_untracked_file(git_repo):
+    index = FileIndex()
+    index.get_files(str(git_repo))
+
+    new_file = git_repo / "src" / "new_module.py"
+    new_file.write_text("x = 1")
+    index.record_file_written(str(new_file))
+
+    assert "src/new_module.py" in index.get_files(str(git_repo))
+    assert index.stats()["builds"] == 1
+
+
+def test_record_file_written_skips_ignored_file(git_repo):
+    index = FileIndex()
+    index.get_files(str(git_repo))
+
+    log_file = git_repo / "debug.log"
+    log_file.write_text("log")
+    index.record_file_written(str(log_file))
+
+    assert "debug.log" not in index.get_files(str(git_repo))
+
+
+def test_record_file_removed(git_repo):
+    index = FileIndex()
+    index.get_files(str(git_repo))
+
+    index.record_file_removed(str(git_repo / "README.md"))
+
+    assert index.get_files(str(git_repo)) == ["src/main.py"]
+
+
+def test_invalidate_forces_rebuild(git_repo):
+    index = FileIndex()
+    index.get_files(str(git_repo))
+
+    (git_repo / "untracked.txt").write_text("new")
+    assert "untracked.txt" not in index.get_files(str(git_repo))
+
+    index.invalidate()
+    assert "untracked.txt" in index.get_files(str(git_repo))
+
+
+def test_max_age_forces_rebuild(git_repo):
+    index = FileIndex(max_age=0)
+    index.get_files(str(git_repo))
+    index.get_files(str(git_repo))
+
+    assert index.stats()["builds"] == 2
+
+
+def test_non_git_directory_is_not_cached(tmp_path):
+    index = FileIndex()
+    (tmp_path / "a.txt").write_text("a")
+    assert index.get_files(str(tmp_path)) == ["a.txt"]
+
+    (tmp_path / "b.txt").write_text("b")
+    assert index.get_files(str(tmp_path)) == ["a.txt", "b.txt"]
+    assert index.stats()["snapshots"] == 0
@@ -104,3 +104,31 @@ def test_permission_error(tmp_path):
     finally:
         # Restore permissions to allow cleanup
         os.chmod(tmp_path, 0o755)
+
+
+def test_project_info_is_reused_until_the_listing_changes(sample_git_repo):
+    """Repeated calls reuse the snapshot; recorded writes and new top-level entries refresh it."""
+    from unittest.mock import patch
+
+    from ra_aid.file_index import get_file_index
+    from ra_aid.project_info import format_project_info
+
+    directory = str(sample_git_repo)
+    first = get_project_info(directory)
+    formatted = format_project_info(first)
+
+    with patch("ra_aid.project_info.get_file_listing") as listing:
+        again = get_project_info(directory)
+        assert again is first
+        assert format_project_info(again) is formatted
+        listing.assert_not_called()
+
+    new_file = sample_git_repo / "src" / "new_module.py"
+    new_file.write_text("x = 1")
+    get_file_index().record_file_written(str(new_file))
+    refreshed = get_project_info(directory)
+    assert "src/new_module.py" in refreshed.files
+    assert refreshed.total_files == 6
+
+    (sample_git_repo / "CHANGELOG.md").write_text("changes")
+    assert get_project_info(directory) is not refreshed